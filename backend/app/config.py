@@ -30,6 +30,102 @@ class Settings(BaseSettings):
     MAILTRAP_PASSWORD: Optional[str] = "your-mailtrap-password"
     MAILTRAP_HOST: Optional[str] = "live.smtp.mailtrap.io"
     MAILTRAP_PORT: Optional[int] = 587
+    # Number of precomputed neighbors kept per research item
+    RELATED_RESEARCH_LIMIT: int = 10
+    # Research items per compute_neighbor_lists task when rebuilding neighbor lists
+    RELATED_RESEARCH_BATCH_SIZE: int = 100
+    # Seconds shared caches may reuse responses for public research items
+    PUBLIC_CACHE_MAX_AGE: int = 60
+    # Where large prompt/report bodies are kept: "inline", "database" or "disk"
+    REPORT_STORAGE_MODE: str = "inline"
+    # Directory for the "disk" report store
+    REPORT_STORAGE_PATH: Optional[str] = os.path.join(FILE_PATH, "..", "data", "reports")
+    # Bodies whose combined size is below this many bytes stay inline
+    REPORT_STORAGE_THRESHOLD: int = 16384
+    REPORT_COMPRESSION_LEVEL: int = 9
+    # Seconds serialized research items stay in the Redis cache; 0 disables it
+    RESEARCH_CACHE_TTL: int = 300
+    # Eagerness of early cache refreshes; above 1 refreshes sooner
+    RESEARCH_CACHE_BETA: float = 1.0
+    # Seconds an authenticated user's id, role and memberships stay cached; 0 disables it
+    PRINCIPAL_CACHE_TTL: int = 60
+    # Seconds between background refreshes of the Auth0 signing keys
+    JWKS_REFRESH_INTERVAL: int = 3600
+    # Minimum seconds between refreshes triggered by tokens with an unknown kid
+    JWKS_MIN_REFRESH_INTERVAL: int = 30
+    # Verified tokens whose claims are kept until they expire
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+    # HMAC secret for stored API key hashes; falls back to JWT_SECRET_KEY
+    API_KEY_HASH_SECRET: Optional[str] = None
+    # Seconds valid and invalid API key lookups stay cached
+    API_KEY_CACHE_TTL: int = 60
+    API_KEY_NEGATIVE_CACHE_TTL: int = 30
+    # Seconds between flushes of API key usage counters from Redis to api_keys
+    API_KEY_USAGE_FLUSH_INTERVAL: int = 60
+    # Connection pool of each API process (async engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # Connection pool of each Celery worker process (sync engine)
+    DB_SYNC_POOL_SIZE: int = 5
+    DB_SYNC_MAX_OVERFLOW: int = 5
+    # Seconds to wait for a free connection before failing
+    DB_POOL_TIMEOUT: int = 30
+    # Seconds after which connections are replaced; -1 never recycles
+    DB_POOL_RECYCLE: int = 1800
+    # Test connections with a ping on checkout, dropping ones the server closed
+    DB_POOL_PRE_PING: bool = True
+    # Prometheus metrics (pool telemetry) are served on their own port, never the
+    # API's: each API process takes the first free one of METRICS_PORT ..
+    # METRICS_PORT + METRICS_PORTS - 1 (so set METRICS_PORTS to at least the worker
+    # count), the n-th Celery worker process CELERY_METRICS_PORT + n. 0 disables;
+    # keep METRICS_HOST on a private interface
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9100
+    METRICS_PORTS: int = 8
+    CELERY_METRICS_PORT: int = 9110
+    # Prepared statements asyncpg caches per connection; 0 disables the cache
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode:
+    # disables prepared statement caching, which doesn't survive server switches
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+    # Optional streaming replica that read-only endpoints query instead of the primary
+    DATABASE_REPLICA_URL: Optional[str] = None
+    # Reads go to the primary while the replica is further behind than this many seconds
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    # Seconds between replica lag checks
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+    # Research service HTTP clients; services override these in research_services.json
+    RESEARCH_SERVICE_TIMEOUT: float = 30.0
+    RESEARCH_SERVICE_CONNECT_TIMEOUT: float = 5.0
+    RESEARCH_SERVICE_MAX_CONNECTIONS: int = 50
+    RESEARCH_SERVICE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    RESEARCH_SERVICE_KEEPALIVE_EXPIRY: float = 30.0
+    # Needs the h2 package (pip install httpx[http2])
+    RESEARCH_SERVICE_HTTP2: bool = False
+    # Background polling of active research jobs (see app.services.job_poller)
+    RESEARCH_JOB_POLLER_ENABLED: bool = True
+    # Seconds between polls of a job, growing from min to max while its status doesn't change
+    RESEARCH_JOB_POLL_MIN_INTERVAL: float = 5.0
+    RESEARCH_JOB_POLL_MAX_INTERVAL: float = 60.0
+    # Seconds after which a job's polled status is too old and clients poll the service themselves
+    RESEARCH_JOB_STATUS_STALE_AFTER: float = 120.0
+    # Seconds a job may stay "finalizing" before the sweep hands it back to the poller,
+    # how often the sweep runs, and how many hand-backs a job gets before it is failed
+    RESEARCH_JOB_FINALIZE_TIMEOUT: int = 600
+    RESEARCH_JOB_FINALIZE_SWEEP_INTERVAL: int = 300
+    RESEARCH_JOB_FINALIZE_MAX_ATTEMPTS: int = 3
+    # Seconds between heartbeats on research job event streams, and before a stream is closed for the client to resume
+    SSE_HEARTBEAT_INTERVAL: float = 15.0
+    SSE_MAX_DURATION: float = 3600.0
+    # Seconds the research service catalog snapshot is kept without a change notification
+    SERVICE_CATALOG_TTL: int = 3600
+    # Shared secret research services sign status webhooks with; unset disables webhooks
+    RESEARCH_WEBHOOK_SECRET: Optional[str] = None
+    # Public base URL of this API for webhook callbacks; defaults to API_SCHEME://API_HOST:API_PORT
+    RESEARCH_WEBHOOK_BASE_URL: Optional[str] = None
+    # Seconds a webhook's timestamp may be off by, and how long delivery ids are remembered
+    RESEARCH_WEBHOOK_TOLERANCE: int = 300
+    RESEARCH_WEBHOOK_DEDUPE_TTL: int = 86400
     # JWT Configuration
     JWT_ALGORITHM: str = "RS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 3600
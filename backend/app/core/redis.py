@@ -0,0 +1,26 @@
+# backend/app/core/redis.py
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Shared asyncio Redis client for the API process, created on first use.
+    Returns raw bytes, since cached values are mostly serialized responses.
+    """
+    global _client
+    if _client is None:
+        _client = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            socket_timeout=1,
+            socket_connect_timeout=1
+        )
+    return _client
@@ -2,7 +2,10 @@
 
 from contextlib import contextmanager
 
-from app.db.database import AsyncSessionLocal, SessionLocal
+from fastapi import Request
+
+from app.db.database import AsyncSessionLocal, ReplicaSessionLocal, SessionLocal
+from app.db.replica import use_replica
 
 async def get_db():
     """Dependency that provides an async database session"""
@@ -12,6 +15,19 @@ async def get_db():
         finally:
             await session.close()
 
+async def get_read_db(request: Request):
+    """
+    Dependency that provides an async session for read-only endpoints: on the
+    replica when it's caught up and the client hasn't just written, otherwise
+    on the primary. Never write through it.
+    """
+    session_factory = ReplicaSessionLocal if await use_replica(request) else AsyncSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
 @contextmanager
 def get_db_sync():
     """Dependency that provides a sync database session"""
@@ -19,4 +35,4 @@ def get_db_sync():
         try:
             yield session
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
@@ -1,20 +1,78 @@
 # backend/app/db/database.py
+from uuid import uuid4
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy import create_engine
 from app.config import settings
+from app.db.pool_metrics import instrumented_pool_class
+
+
+def _asyncpg_url(url: str) -> str:
+    # Ensure the URL uses the asyncpg driver
+    if url.startswith('postgresql://'):
+        return url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    return url
+
+
+DATABASE_URL = _asyncpg_url(settings.DATABASE_URL)
+
+
+def _pool_options(label: str, is_async: bool, pool_size: int, max_overflow: int) -> dict:
+    return {
+        "poolclass": instrumented_pool_class(label, is_async),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _asyncpg_connect_args() -> dict:
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        # PgBouncer may run each transaction on a different server connection,
+        # so named prepared statements can't be cached or reused across them
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
-# Ensure the DATABASE_URL uses the asyncpg driver
-DATABASE_URL = settings.DATABASE_URL
-if DATABASE_URL.startswith('postgresql://'):
-    DATABASE_URL = DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1)
 
 # Create async engine instead of sync engine
-async_engine = create_async_engine(DATABASE_URL, echo=False)
-engine = create_engine(settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://', 1), echo=False)
+async_engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args=_asyncpg_connect_args(),
+    **_pool_options("async", True, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+)
+# psycopg2 doesn't use server-side prepared statements, so it needs no PgBouncer settings
+engine = create_engine(
+    settings.DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://', 1),
+    echo=False,
+    **_pool_options("sync", False, settings.DB_SYNC_POOL_SIZE, settings.DB_SYNC_MAX_OVERFLOW)
+)
+
+# Read-only endpoints use the replica when one is configured (see app.db.replica)
+replica_async_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_async_engine = create_async_engine(
+        _asyncpg_url(settings.DATABASE_REPLICA_URL),
+        echo=False,
+        connect_args=_asyncpg_connect_args(),
+        **_pool_options("replica", True, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+    )
 
 # Create async session maker
 AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=async_engine, expire_on_commit=False)
+ReplicaSessionLocal = None
+if replica_async_engine is not None:
+    ReplicaSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=replica_async_engine, expire_on_commit=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
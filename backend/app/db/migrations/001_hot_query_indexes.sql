@@ -0,0 +1,44 @@
+-- Indexes for the hot read paths, for databases created before they were
+-- added to schema.sql and the models. CONCURRENTLY keeps the tables writable
+-- while the indexes build, so run this outside a transaction:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/001_hot_query_indexes.sql
+--
+-- A build that fails leaves an INVALID index behind; drop it and rerun.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_chunks_deep_research_id_chunk_index
+  ON research_chunks (deep_research_id, chunk_index);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_summaries_deep_research_id
+  ON research_summaries (deep_research_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_sources_deep_research_id
+  ON research_sources (deep_research_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_comments_deep_research_id_created_at_id
+  ON research_comments (deep_research_id, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_auto_metadata_deep_research_id
+  ON research_auto_metadata (deep_research_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_user_id_created_at_id
+  ON deep_research (user_id, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_owner_org_id_visibility_created_at_id
+  ON deep_research (owner_org_id, visibility, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_tags_tag_id
+  ON deep_research_tags (tag_id, deep_research_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_jobs_user_id_created_at_id
+  ON research_jobs (user_id, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_jobs_user_id_status_created_at_id
+  ON research_jobs (user_id, status, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_jobs_service_status_created_at_id
+  ON research_jobs (service, status, created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_jobs_deep_research_id
+  ON research_jobs (deep_research_id);
+
@@ -0,0 +1,22 @@
+-- Trigram indexes for the substring filters of the user and research lists,
+-- for databases created before they were added to schema.sql and the models.
+-- CONCURRENTLY keeps the tables writable while the indexes build, so run this
+-- outside a transaction:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/002_trigram_search_indexes.sql
+--
+-- A build that fails leaves an INVALID index behind; drop it and rerun.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_trgm
+  ON users USING gin (username gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_display_name_trgm
+  ON users USING gin (display_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_trgm
+  ON users USING gin (email gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_model_name_trgm
+  ON deep_research USING gin (model_name gin_trgm_ops);
@@ -0,0 +1,25 @@
+-- Precomputed related-research neighbor lists (research_neighbors) and their
+-- indexes, for databases created before they were added to schema.sql and
+-- the models. The table is created first, so the indexes always have it to
+-- build on. CONCURRENTLY keeps an existing table writable while the indexes
+-- build, so run this outside a transaction:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/003_research_neighbors.sql
+--
+-- A build that fails leaves an INVALID index behind; drop it and rerun.
+-- Lists are filled by the research.rebuild_related_research task afterwards.
+
+CREATE TABLE IF NOT EXISTS research_neighbors (
+    deep_research_id    INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    neighbor_id         INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    distance            DOUBLE PRECISION NOT NULL,  -- cosine distance, lower is more similar
+    created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (deep_research_id, neighbor_id)
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_neighbors_research_distance
+  ON research_neighbors (deep_research_id, distance);
+
+-- Lists that include an item, refilled when it is deleted
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_neighbors_neighbor_id
+  ON research_neighbors (neighbor_id);
@@ -0,0 +1,21 @@
+-- Allows the "finalizing" research job status (a completed job whose results
+-- research.finalize_job is still storing), for databases whose research_jobs
+-- table was created before it was added to the models. Deploy this before
+-- the code that writes the status:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/004_research_job_finalizing_status.sql
+--
+-- The constraint is added NOT VALID so the swap only locks the table
+-- briefly; existing rows are then checked without blocking writes.
+
+BEGIN;
+
+ALTER TABLE research_jobs DROP CONSTRAINT IF EXISTS chk_research_job_status;
+
+ALTER TABLE research_jobs ADD CONSTRAINT chk_research_job_status
+  CHECK (status IN ('pending_answers', 'running', 'finalizing', 'completed', 'failed', 'cancelled'))
+  NOT VALID;
+
+COMMIT;
+
+ALTER TABLE research_jobs VALIDATE CONSTRAINT chk_research_job_status;
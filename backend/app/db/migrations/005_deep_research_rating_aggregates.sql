@@ -0,0 +1,45 @@
+-- Denormalized rating and comment counters on deep_research, and the index
+-- behind sorting by average rating, for databases created before they were
+-- added to schema.sql and the models. Run it before deploying the code that
+-- reads them, outside a transaction (CONCURRENTLY can't run inside one):
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/005_deep_research_rating_aggregates.sql
+--
+-- The backfill recomputes every counter from research_ratings and
+-- research_comments, so it is safe to rerun; do so once the new code is live
+-- to pick up anything the old code wrote in between. A build that fails
+-- leaves an INVALID index behind; drop it and rerun.
+
+-- A constant default makes these catalog-only changes, no table rewrite
+ALTER TABLE deep_research ADD COLUMN IF NOT EXISTS rating_count INT NOT NULL DEFAULT 0;
+ALTER TABLE deep_research ADD COLUMN IF NOT EXISTS rating_sum INT NOT NULL DEFAULT 0;
+ALTER TABLE deep_research ADD COLUMN IF NOT EXISTS comment_count INT NOT NULL DEFAULT 0;
+
+UPDATE deep_research dr
+   SET rating_count = agg.rating_count,
+       rating_sum = agg.rating_sum,
+       comment_count = agg.comment_count
+  FROM (
+        SELECT d.id,
+               coalesce(r.rating_count, 0) AS rating_count,
+               coalesce(r.rating_sum, 0) AS rating_sum,
+               coalesce(c.comment_count, 0) AS comment_count
+          FROM deep_research d
+          LEFT JOIN (
+                SELECT deep_research_id, count(*) AS rating_count, sum(rating_value) AS rating_sum
+                  FROM research_ratings
+                 GROUP BY deep_research_id
+               ) r ON r.deep_research_id = d.id
+          LEFT JOIN (
+                SELECT deep_research_id, count(*) AS comment_count
+                  FROM research_comments
+                 GROUP BY deep_research_id
+               ) c ON c.deep_research_id = d.id
+       ) agg
+ WHERE dr.id = agg.id
+   AND (dr.rating_count, dr.rating_sum, dr.comment_count)
+       IS DISTINCT FROM (agg.rating_count, agg.rating_sum, agg.comment_count);
+
+-- Must match the expression the API orders by for the planner to use it
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_avg_rating
+  ON deep_research ((coalesce(CAST(rating_sum AS FLOAT) / CAST(nullif(rating_count, 0) AS FLOAT), 0.0)), id);
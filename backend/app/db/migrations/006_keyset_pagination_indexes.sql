@@ -0,0 +1,18 @@
+-- (sort column, id) indexes that the keyset-paginated list endpoints seek on,
+-- for databases created before they were added to schema.sql and the models.
+-- The filtered variants come from 001_hot_query_indexes.sql. CONCURRENTLY
+-- keeps the tables writable while the indexes build, so run this outside a
+-- transaction:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/006_keyset_pagination_indexes.sql
+--
+-- A build that fails leaves an INVALID index behind; drop it and rerun.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deep_research_created_at_id
+  ON deep_research (created_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_username_id
+  ON users (username, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_research_jobs_created_at_id
+  ON research_jobs (created_at, id);
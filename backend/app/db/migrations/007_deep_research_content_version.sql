@@ -0,0 +1,11 @@
+-- deep_research.content_version, which research detail ETags include so that
+-- changes to child rows (ratings, comments, summaries...) invalidate them,
+-- for databases created before it was added to schema.sql and the models.
+-- Run it before deploying the code that reads it:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/007_deep_research_content_version.sql
+--
+-- A constant default makes this a catalog-only change, with no table rewrite.
+-- Existing rows start at 0; the writers bump it from there.
+
+ALTER TABLE deep_research ADD COLUMN IF NOT EXISTS content_version INT NOT NULL DEFAULT 0;
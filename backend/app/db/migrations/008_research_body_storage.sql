@@ -0,0 +1,21 @@
+-- Out-of-row storage for prompt/report bodies: deep_research.body_storage and
+-- the research_contents table behind the 'database' content store, for
+-- databases created before they were added to schema.sql and the models.
+-- Run it before deploying the code that reads them:
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/008_research_body_storage.sql
+--
+-- Existing rows keep their bodies inline (body_storage NULL); only items
+-- written afterwards, above REPORT_STORAGE_THRESHOLD, move out of row.
+
+ALTER TABLE deep_research ADD COLUMN IF NOT EXISTS body_storage VARCHAR(20);
+
+CREATE TABLE IF NOT EXISTS research_contents (
+    deep_research_id    INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    field               VARCHAR(50) NOT NULL,    -- 'prompt_text' or 'final_report'
+    codec               VARCHAR(20) NOT NULL DEFAULT 'zstd',
+    data                BYTEA NOT NULL,
+    original_size       INT NOT NULL,            -- uncompressed size in bytes
+    created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (deep_research_id, field)
+);
@@ -0,0 +1,27 @@
+-- Hashed DRKR API keys: token_prefix, token_hash and created_by on api_keys,
+-- with token (now only kept for third-party service keys) made nullable, and
+-- the usage columns the flush_api_key_usage task writes, for databases
+-- created before they were added to schema.sql and the models.
+-- Run it before deploying the code that reads them, outside a transaction
+-- (CONCURRENTLY can't run inside one):
+--
+--   psql "$DATABASE_URL" -f app/db/migrations/009_api_key_hashes.sql
+--
+-- Then, with the new code deployed, hash the keys issued before, which are
+-- still stored in plaintext and don't authenticate until this has run:
+--
+--   celery -A app.tasks.research_processing call maintenance.hash_legacy_api_keys
+--
+-- It can be rerun; keys already hashed are skipped. Organization keys issued
+-- before have no created_by to act as, so they stay rejected and have to be
+-- re-issued. A build that fails leaves an INVALID index behind; drop it and rerun.
+
+ALTER TABLE api_keys ALTER COLUMN token DROP NOT NULL;
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS token_prefix VARCHAR(16) UNIQUE;
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS token_hash VARCHAR(64);
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS created_by INT REFERENCES users (id) ON DELETE SET NULL;
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS last_used_at TIMESTAMP WITHOUT TIME ZONE;
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS request_count BIGINT NOT NULL DEFAULT 0;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_api_keys_legacy_token_hash
+  ON api_keys (token_hash) WHERE token_prefix IS NULL;
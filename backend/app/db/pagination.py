@@ -0,0 +1,95 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, asc, desc, or_, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(sort_key: str, order: str, sort_value: Any, row_id: int) -> str:
+    """
+    Builds an opaque cursor pointing just past the given row. The sort key and
+    direction are embedded so a cursor can't be replayed against another ordering.
+    """
+    payload = {
+        "k": sort_key,
+        "o": order,
+        "v": _encode_value(sort_value),
+        "id": row_id
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, order: str) -> List[Any]:
+    """
+    Returns [sort_value, id] from a cursor produced by encode_cursor. Raises 400
+    if the cursor is malformed or was issued for a different ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        sort_value = _decode_value(payload["v"])
+        row_id = int(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("k") != sort_key or payload.get("o") != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested ordering")
+    return [sort_value, row_id]
+
+
+def keyset_order_by(query, sort_col, id_col, descending: bool):
+    """Orders by the sort column with the primary key as a unique tiebreaker."""
+    direction = desc if descending else asc
+    return query.order_by(direction(sort_col), direction(id_col))
+
+
+def keyset_filter(sort_col, id_col, descending: bool, sort_value: Any, row_id: int):
+    """
+    Condition selecting the rows that come after (sort_value, row_id) in
+    keyset_order_by order. Non-null values compare as a row tuple so the
+    (sort column, id) index can seek straight to the page. NULLs sort first
+    descending and last ascending in Postgres, which the other branches mirror.
+    """
+    if sort_value is None:
+        if descending:
+            return or_(
+                and_(sort_col.is_(None), id_col < row_id),
+                sort_col.isnot(None)
+            )
+        return and_(sort_col.is_(None), id_col > row_id)
+
+    if descending:
+        return tuple_(sort_col, id_col) < tuple_(sort_value, row_id)
+    return or_(
+        tuple_(sort_col, id_col) > tuple_(sort_value, row_id),
+        sort_col.is_(None)
+    )
+
+
+def next_cursor(rows: list, limit: int, sort_key: str, order: str, sort_value_of, id_of) -> Optional[str]:
+    """
+    Given up to limit + 1 fetched rows, returns the cursor for the following page
+    or None if this is the last one. Callers trim the extra row themselves.
+    """
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(sort_key, order, sort_value_of(last), id_of(last))
@@ -0,0 +1,98 @@
+# backend/app/db/pool_metrics.py
+"""
+Connection pool telemetry for the SQLAlchemy engines, exported through
+prometheus_client. Each process serves its metrics on a port of its own (see
+start_metrics_server), so they're never reachable through the public API.
+
+The engines are created with the instrumented pool classes built below, which time
+every checkout (including the wait for a free connection), track how many
+connections are in use, and count checkouts that had to open an overflow
+connection or timed out waiting.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent getting a connection from the pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CONNECTIONS_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    ["engine"],
+)
+POOL_OVERFLOW_TOTAL = Counter(
+    "db_pool_overflow_total",
+    "Checkouts served by an overflow connection beyond pool_size",
+    ["engine"],
+)
+POOL_TIMEOUTS_TOTAL = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["engine"],
+)
+
+
+class _InstrumentedPoolMixin:
+    # Overridden per engine by instrumented_pool_class()
+    metrics_label = "default"
+
+    def _do_get(self):
+        overflow = self.overflow()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS_TOTAL.labels(self.metrics_label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.metrics_label).observe(time.perf_counter() - started)
+        # Only when this checkout opened a connection beyond pool_size; reusing an
+        # idle overflow connection doesn't count again
+        if self.overflow() > max(overflow, 0):
+            POOL_OVERFLOW_TOTAL.labels(self.metrics_label).inc()
+        POOL_CONNECTIONS_IN_USE.labels(self.metrics_label).set(self.checkedout())
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        POOL_CONNECTIONS_IN_USE.labels(self.metrics_label).set(self.checkedout())
+
+
+def start_metrics_server(port: int, ports: int = 1) -> Optional[int]:
+    """
+    Serves this process's metrics on METRICS_HOST in a background thread, on the
+    first free port of port .. port + ports - 1, so processes started from the
+    same settings (e.g. uvicorn workers) each get one. Returns the port, or None
+    if all were taken; port 0 disables.
+    """
+    if not port:
+        return None
+    for candidate in range(port, port + ports):
+        try:
+            start_http_server(candidate, addr=settings.METRICS_HOST)
+        except OSError as e:
+            error = e
+            continue
+        logger.info(f"Serving metrics on {settings.METRICS_HOST}:{candidate}")
+        return candidate
+    logger.warning(f"Metrics server not started on ports {port}-{port + ports - 1}: {error}")
+    return None
+
+
+def instrumented_pool_class(label: str, is_async: bool):
+    """Queue pool class for one engine, reporting under the given engine label"""
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics_label": label})
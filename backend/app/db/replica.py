@@ -0,0 +1,123 @@
+# backend/app/db/replica.py
+"""
+Routing of read-only queries to the streaming replica (DATABASE_REPLICA_URL).
+
+get_read_db hands out a replica session unless
+  * no replica is configured,
+  * the replica's replay lag, checked every REPLICA_LAG_CHECK_INTERVAL
+    seconds, is above REPLICA_MAX_LAG_SECONDS or can't be measured (which
+    includes the replica not streaming from the primary), or
+  * the client wrote something recently: successful writes are answered with
+    an X-DRKR-Last-Write header and a matching cookie, and requests echoing
+    either within the read-your-writes window read from the primary. The
+    window covers the worst lag we route at, so those writes are on the
+    replica by the time the client's reads go back to it.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.db.database import ReplicaSessionLocal
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_HEADER = "X-DRKR-Last-Write"
+LAST_WRITE_COOKIE = "drkr_last_write"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# NULL (unmeasurable, so infinite) unless a WAL receiver is streaming: a
+# disconnected replica has replayed all it received and would otherwise look
+# caught up. Its status is only visible to pg_read_all_stats members; others
+# see just the receiver's row. Zero while the replica has replayed everything
+# it received, so an idle primary doesn't look like lag.
+_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE coalesce(status, 'streaming') = 'streaming') "
+    "THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaLagMonitor:
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self._lag = math.inf
+        self._checked_at = -math.inf
+        self._lock = asyncio.Lock()
+
+    async def _check(self) -> None:
+        try:
+            async with self.session_factory() as session:
+                lag = await session.scalar(_LAG_QUERY)
+            self._lag = math.inf if lag is None else float(lag)
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"Replica lag check failed, reading from the primary: {e}")
+            self._lag = math.inf
+        self._checked_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        return time.monotonic() - self._checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+
+    async def lag(self) -> float:
+        """Replay lag in seconds as of the last check, re-checked when that's too old"""
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self._check()
+        return self._lag
+
+    async def is_usable(self) -> bool:
+        return await self.lag() <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+replica_monitor: Optional[ReplicaLagMonitor] = None
+if ReplicaSessionLocal is not None:
+    replica_monitor = ReplicaLagMonitor(ReplicaSessionLocal)
+
+
+def replica_enabled() -> bool:
+    return replica_monitor is not None
+
+
+def read_your_writes_window() -> float:
+    # Lag is measured at most one check interval ago
+    return settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL
+
+
+def wrote_recently(request: Request) -> bool:
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return False
+    try:
+        written_at = float(value)
+    except ValueError:
+        return False
+    return time.time() - written_at < read_your_writes_window()
+
+
+def mark_write(response: Response) -> None:
+    """Tells the client it wrote just now, so its next reads go to the primary"""
+    written_at = f"{time.time():.3f}"
+    response.headers[LAST_WRITE_HEADER] = written_at
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        written_at,
+        max_age=math.ceil(read_your_writes_window()),
+        httponly=True,
+        samesite="lax"
+    )
+
+
+async def use_replica(request: Request) -> bool:
+    if not replica_enabled() or wrote_recently(request):
+        return False
+    return await replica_monitor.is_usable()
@@ -34,7 +34,13 @@ CREATE TABLE api_keys (
     id                  SERIAL PRIMARY KEY,
     user_id             INT REFERENCES users (id) ON DELETE CASCADE,
     organization_id     INT REFERENCES organizations (id) ON DELETE CASCADE,
-    token               VARCHAR(255) NOT NULL UNIQUE,
+    -- Third-party service keys; DRKR keys are only stored as prefix + HMAC
+    token               VARCHAR(255) UNIQUE,
+    token_prefix        VARCHAR(16) UNIQUE,
+    token_hash          VARCHAR(64),
+    created_by          INT REFERENCES users (id) ON DELETE SET NULL,
+    last_used_at        TIMESTAMP WITHOUT TIME ZONE,
+    request_count       BIGINT NOT NULL DEFAULT 0,
     created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
     expires_at          TIMESTAMP WITHOUT TIME ZONE,
 
@@ -46,7 +52,13 @@ CREATE TABLE api_keys (
     )
 );
 
+-- Keys issued before prefixes are looked up by hash. Existing databases get
+-- the new api_keys columns and this index from migrations/009_api_key_hashes.sql.
+CREATE INDEX ix_api_keys_legacy_token_hash
+    ON api_keys (token_hash) WHERE token_prefix IS NULL;
+
 CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- The "main" table storing each deep-research record
 CREATE TABLE deep_research (
@@ -67,6 +79,14 @@ CREATE TABLE deep_research (
     model_name          VARCHAR(100),     -- e.g., GPT-4, LLaMA, etc.
     model_params        JSONB,            -- optional: store hyperparams or any additional LLM config
     source_count        INT DEFAULT 0,    -- number of sources/citations
+    -- Engagement aggregates, maintained by the ratings and comments endpoints
+    rating_count        INT NOT NULL DEFAULT 0,
+    rating_sum          INT NOT NULL DEFAULT 0,
+    comment_count       INT NOT NULL DEFAULT 0,
+    content_version     INT NOT NULL DEFAULT 0,  -- bumped on child row changes, used for ETags
+    -- NULL: prompt_text/final_report are inline. Otherwise the content store
+    -- ('database' or 'disk') holding them zstd-compressed; the columns are then ''.
+    body_storage        VARCHAR(20),
     created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
     updated_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
 );
@@ -209,6 +229,12 @@ CREATE TABLE research_comments (
     updated_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
 );
 
+-- Sorting by average rating. The expression must match the one the API
+-- orders by for the planner to use this index. Existing databases get it and
+-- the counters from migrations/005_deep_research_rating_aggregates.sql.
+CREATE INDEX ix_deep_research_avg_rating
+    ON deep_research ((coalesce(CAST(rating_sum AS FLOAT) / CAST(nullif(rating_count, 0) AS FLOAT), 0.0)), id);
+
 CREATE TABLE research_auto_metadata (
     id                  SERIAL PRIMARY KEY,
     deep_research_id    INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
@@ -218,6 +244,94 @@ CREATE TABLE research_auto_metadata (
     created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
 );
 
+-- Precomputed "related research": top-N nearest neighbors of each item by
+-- report_embedding, maintained by the research.compute_related_research task.
+-- Existing databases get the table and its indexes from
+-- migrations/003_research_neighbors.sql.
+CREATE TABLE research_neighbors (
+    deep_research_id    INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    neighbor_id         INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    distance            DOUBLE PRECISION NOT NULL,  -- cosine distance, lower is more similar
+    created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (deep_research_id, neighbor_id)
+);
+
+CREATE INDEX ix_research_neighbors_research_distance
+  ON research_neighbors (deep_research_id, distance);
+
+-- Lists that include an item, which are refilled when it is deleted
+CREATE INDEX ix_research_neighbors_neighbor_id
+  ON research_neighbors (neighbor_id);
+
+-- Out-of-row, zstd-compressed prompt/report bodies for items whose
+-- body_storage is 'database'. Existing databases get it and body_storage from
+-- migrations/008_research_body_storage.sql.
+CREATE TABLE research_contents (
+    deep_research_id    INT NOT NULL REFERENCES deep_research (id) ON DELETE CASCADE,
+    field               VARCHAR(50) NOT NULL,    -- 'prompt_text' or 'final_report'
+    codec               VARCHAR(20) NOT NULL DEFAULT 'zstd',
+    data                BYTEA NOT NULL,
+    original_size       INT NOT NULL,            -- uncompressed size in bytes
+    created_at          TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (deep_research_id, field)
+);
+
+-- Keyset pagination: list endpoints seek on (sort column, id) instead of OFFSET.
+-- research_jobs is created from the SQLAlchemy models, which also define
+-- ix_research_jobs_created_at_id on (created_at, id) and the filter indexes
+-- ix_research_jobs_user_id_created_at_id, ix_research_jobs_user_id_status_created_at_id
+-- and ix_research_jobs_service_status_created_at_id. Existing databases get
+-- the (sort column, id) indexes from migrations/006_keyset_pagination_indexes.sql.
+CREATE INDEX ix_deep_research_created_at_id
+  ON deep_research (created_at, id);
+
+CREATE INDEX ix_users_username_id
+  ON users (username, id);
+
+-- Child rows are loaded per item (selectin loads, comment lists), items per
+-- creator or organization, and research per tag; without these each of those
+-- is a sequential scan. Existing databases get them from
+-- migrations/001_hot_query_indexes.sql. research_jobs has its own in the models.
+CREATE INDEX ix_research_chunks_deep_research_id_chunk_index
+  ON research_chunks (deep_research_id, chunk_index);
+
+CREATE INDEX ix_research_summaries_deep_research_id
+  ON research_summaries (deep_research_id);
+
+CREATE INDEX ix_research_sources_deep_research_id
+  ON research_sources (deep_research_id);
+
+CREATE INDEX ix_research_comments_deep_research_id_created_at_id
+  ON research_comments (deep_research_id, created_at, id);
+
+CREATE INDEX ix_research_auto_metadata_deep_research_id
+  ON research_auto_metadata (deep_research_id);
+
+CREATE INDEX ix_deep_research_user_id_created_at_id
+  ON deep_research (user_id, created_at, id);
+
+CREATE INDEX ix_deep_research_owner_org_id_visibility_created_at_id
+  ON deep_research (owner_org_id, visibility, created_at, id);
+
+CREATE INDEX ix_deep_research_tags_tag_id
+  ON deep_research_tags (tag_id, deep_research_id);
+
+-- Substring filters (ILIKE '%term%') on the user list and the research list's
+-- creator_username and model_name can't use a B-tree; pg_trgm GIN indexes
+-- serve them for terms of three or more characters. Existing databases get
+-- them from migrations/002_trigram_search_indexes.sql.
+CREATE INDEX ix_users_username_trgm
+  ON users USING gin (username gin_trgm_ops);
+
+CREATE INDEX ix_users_display_name_trgm
+  ON users USING gin (display_name gin_trgm_ops);
+
+CREATE INDEX ix_users_email_trgm
+  ON users USING gin (email gin_trgm_ops);
+
+CREATE INDEX ix_deep_research_model_name_trgm
+  ON deep_research USING gin (model_name gin_trgm_ops);
+
 -- ALTER TABLE deep_research
 --     ADD COLUMN prompt_tsv tsvector,     -- for full-text indexing on the prompt 
 --     ADD COLUMN report_tsv tsvector;     -- for full-text indexing on the final report
@@ -0,0 +1,26 @@
+from typing import Iterable
+
+from sqlalchemy import func, or_
+
+# Substring filters are served by pg_trgm GIN indexes (gin_trgm_ops), since a
+# B-tree can't answer ILIKE '%term%'. Postgres uses them for any pattern with
+# at least one trigram, i.e. a search term of three or more characters.
+
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(term: str) -> str:
+    """ILIKE pattern matching term anywhere, with %, _ and \\ in term taken literally"""
+    escaped = term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"
+
+
+def contains(columns: Iterable, term: str):
+    """True when any of the columns contains term, ignoring case"""
+    pattern = contains_pattern(term)
+    return or_(*(column.ilike(pattern, escape=LIKE_ESCAPE) for column in columns))
+
+
+def similarity_rank(columns: Iterable, term: str):
+    """Trigram similarity (0 to 1) of the best-matching column to term"""
+    return func.greatest(*(func.similarity(column, term) for column in columns))
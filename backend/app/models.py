@@ -3,6 +3,7 @@
 from sqlalchemy import (
     Column,
     Integer,
+    Float,
     String,
     Text,
     Boolean,
@@ -13,11 +14,15 @@ from sqlalchemy import (
     Index,
     Enum,
     func,
-    text
+    text,
+    cast,
+    literal_column,
+    LargeBinary,
+    BigInteger
 )
 from pgvector.sqlalchemy import Vector as VECTOR
 from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy.orm import relationship, backref, column_property, deferred
 from app.db.database import Base
 from sqlalchemy.dialects.postgresql import ENUM as PGEnum
 
@@ -55,6 +60,12 @@ class User(Base):
         CheckConstraint("""
             auth_provider IN ('google-oauth2', 'github', 'facebook', 'linkedin', 'twitter')
         """, name="chk_user_auth_provider"),
+        # Keyset pagination for the user list
+        Index("ix_users_username_id", "username", "id"),
+        # Substring search (ILIKE '%term%') in the user list and pickers
+        Index("ix_users_username_trgm", "username", postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_display_name_trgm", "display_name", postgresql_using="gin", postgresql_ops={"display_name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
     )
     
     # Relationships - added explicit back_populates
@@ -103,7 +114,14 @@ class ApiKey(Base):
     name = Column(String(255), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"))
-    token = Column(String(255), unique=True, nullable=False)
+    # Third-party service keys; DRKR keys are only stored as prefix + hash
+    token = Column(String(255), unique=True)
+    token_prefix = Column(String(16), unique=True)
+    token_hash = Column(String(64))
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    # Written behind from Redis by the flush_api_key_usage beat task
+    last_used_at = Column(DateTime(timezone=False))
+    request_count = Column(BigInteger, nullable=False, default=0, server_default=text("0"))
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
     expires_at = Column(DateTime(timezone=False))
@@ -114,10 +132,12 @@ class ApiKey(Base):
             (user_id IS NOT NULL AND organization_id IS NULL)
             OR (user_id IS NULL AND organization_id IS NOT NULL)
         """, name="chk_api_key_owner"),
+        # Keys issued before prefixes are looked up by hash
+        Index("ix_api_keys_legacy_token_hash", "token_hash", postgresql_where=text("token_prefix IS NULL")),
     )
 
     # Changed backref to back_populates
-    user = relationship("User", back_populates="api_keys")
+    user = relationship("User", back_populates="api_keys", foreign_keys=[user_id])
     organization = relationship("Organization", back_populates="api_keys")
     api_service = relationship("ApiService", back_populates="api_keys")
 
@@ -135,9 +155,11 @@ class DeepResearch(Base):
     visibility = Column(VisibilityEnum, nullable=False, server_default="public")
 
     title = Column(String(255), nullable=False)
-    prompt_text = Column(Text, nullable=False)
-    questions_and_answers = Column(Text)
-    final_report = Column(Text, nullable=False)
+    # Large columns are deferred so that plain selects (permission checks, list
+    # rows) stay small. Load them with undefer_group("bodies") / ("search").
+    prompt_text = deferred(Column(Text, nullable=False), group="bodies")
+    questions_and_answers = deferred(Column(Text), group="bodies")
+    final_report = deferred(Column(Text, nullable=False), group="bodies")
     model_name = Column(String(100))
     model_params = Column(JSONB)
     source_count = Column(Integer, default=0)
@@ -145,12 +167,44 @@ class DeepResearch(Base):
     updated_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"), onupdate=text("(now() AT TIME ZONE 'utc')"))
 
     # Postgres full-text columns
-    prompt_tsv = Column(TSVECTOR)
-    report_tsv = Column(TSVECTOR)
+    prompt_tsv = deferred(Column(TSVECTOR), group="search")
+    report_tsv = deferred(Column(TSVECTOR), group="search")
 
     # Vector embeddings
-    prompt_embedding = Column(VECTOR(3072))
-    report_embedding = Column(VECTOR(3072))
+    prompt_embedding = deferred(Column(VECTOR(3072)), group="search")
+    report_embedding = deferred(Column(VECTOR(3072)), group="search")
+
+    __table_args__ = (
+        # Keyset pagination for the default list ordering
+        Index("ix_deep_research_created_at_id", "created_at", "id"),
+        # Items of a creator / of an organization, newest first
+        Index("ix_deep_research_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_deep_research_owner_org_id_visibility_created_at_id", "owner_org_id", "visibility", "created_at", "id"),
+        # model_name substring filter of the list
+        Index("ix_deep_research_model_name_trgm", "model_name", postgresql_using="gin", postgresql_ops={"model_name": "gin_trgm_ops"}),
+    )
+
+    # Engagement aggregates, maintained in the same transaction as rating and comment writes
+    rating_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    rating_sum = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    comment_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Where prompt_text and final_report live: NULL means inline in this row,
+    # otherwise the name of the content store holding them compressed (the
+    # inline columns are then left empty). See app.services.report_storage.
+    body_storage = Column(String(20))
+    # Bumped whenever child rows returned with the item change (chunks, summaries,
+    # comments, ratings) without touching updated_at; part of the item's ETag
+    content_version = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    # Average rating derived from the aggregates. ix_deep_research_avg_rating is built
+    # on this exact expression, so sort by this attribute to get an index scan.
+    avg_rating = column_property(
+        func.coalesce(
+            cast(rating_sum, Float) / func.nullif(rating_count, literal_column("0"), type_=Float),
+            literal_column("0.0"),
+            type_=Float
+        )
+    )
 
     # Added explicit relationships with back_populates
     chunks = relationship("ResearchChunk", back_populates="deep_research", cascade="all, delete-orphan")
@@ -161,6 +215,8 @@ class DeepResearch(Base):
     auto_metadata = relationship("ResearchAutoMetadata", back_populates="deep_research")
     research_job = relationship("ResearchJob", back_populates="deep_research", uselist=False)
 
+Index("ix_deep_research_avg_rating", DeepResearch.avg_rating.expression, DeepResearch.id)
+
 # 7) research_chunks
 class ResearchChunk(Base):
     __tablename__ = "research_chunks"
@@ -173,6 +229,10 @@ class ResearchChunk(Base):
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
     updated_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"), onupdate=text("(now() AT TIME ZONE 'utc')"))
 
+    __table_args__ = (
+        Index("ix_research_chunks_deep_research_id_chunk_index", "deep_research_id", "chunk_index"),
+    )
+
     deep_research = relationship("DeepResearch", back_populates="chunks")
 
 # 8) research_summaries
@@ -186,6 +246,10 @@ class ResearchSummary(Base):
     summary_text = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
 
+    __table_args__ = (
+        Index("ix_research_summaries_deep_research_id", "deep_research_id"),
+    )
+
     deep_research = relationship("DeepResearch", back_populates="summaries")
 
 # 9) research_sources
@@ -201,6 +265,10 @@ class ResearchSource(Base):
     source_type = Column(String(50))  # e.g. "website", "paper", "book"
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
 
+    __table_args__ = (
+        Index("ix_research_sources_deep_research_id", "deep_research_id"),
+    )
+
     deep_research = relationship("DeepResearch", back_populates="sources")
 
 # 10) domain_co_occurrences
@@ -272,6 +340,11 @@ class DeepResearchTag(Base):
     deep_research_id = Column(Integer, ForeignKey("deep_research.id", ondelete="CASCADE"), primary_key=True)
     tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
 
+    __table_args__ = (
+        # The primary key leads with deep_research_id; this serves lookups by tag
+        Index("ix_deep_research_tags_tag_id", "tag_id", "deep_research_id"),
+    )
+
 # 13) research_ratings
 class ResearchRating(Base):
     __tablename__ = "research_ratings"
@@ -301,6 +374,10 @@ class ResearchComment(Base):
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
     updated_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"), onupdate=text("(now() AT TIME ZONE 'utc')"))
 
+    __table_args__ = (
+        Index("ix_research_comments_deep_research_id_created_at_id", "deep_research_id", "created_at", "id"),
+    )
+
     deep_research = relationship("DeepResearch", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
@@ -315,6 +392,10 @@ class ResearchAutoMetadata(Base):
     confidence_score = Column(Integer)  # or Float
     created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
 
+    __table_args__ = (
+        Index("ix_research_auto_metadata_deep_research_id", "deep_research_id"),
+    )
+
     deep_research = relationship("DeepResearch", back_populates="auto_metadata")
 
 # 16) research_jobs
@@ -338,9 +419,18 @@ class ResearchJob(Base):
 
     __table_args__ = (
         CheckConstraint("""
-            status IN ('pending_answers', 'running', 'completed', 'failed', 'cancelled')
+            status IN ('pending_answers', 'running', 'finalizing', 'completed', 'failed', 'cancelled')
         """, name="chk_research_job_status"),
         UniqueConstraint("job_id", "service", name="uq_research_job_job_id_service"),
+        # Keyset pagination for the default list ordering
+        Index("ix_research_jobs_created_at_id", "created_at", "id"),
+        # A user's own jobs, optionally by status, newest first
+        Index("ix_research_jobs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_research_jobs_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        # Jobs of a service by status (list filters and the job poller)
+        Index("ix_research_jobs_service_status_created_at_id", "service", "status", "created_at", "id"),
+        # The job of a research item, loaded with the item
+        Index("ix_research_jobs_deep_research_id", "deep_research_id"),
     )
 
     # Relationships
@@ -443,4 +533,39 @@ class OrganizationInvite(Base):
     __table_args__ = (
         UniqueConstraint("organization_id", "invited_user_id", name="uq_org_invite_user"),
     )
-    
\ No newline at end of file
+    
+
+# 21) research_neighbors
+class ResearchNeighbor(Base):
+    """
+    Precomputed nearest neighbors of a research item by report embedding.
+    Maintained by the `research.compute_related_research` task so that
+    "related research" can be served without an ANN query per page view.
+    """
+    __tablename__ = "research_neighbors"
+
+    deep_research_id = Column(Integer, ForeignKey("deep_research.id", ondelete="CASCADE"), primary_key=True)
+    neighbor_id = Column(Integer, ForeignKey("deep_research.id", ondelete="CASCADE"), primary_key=True)
+    distance = Column(Float, nullable=False)  # cosine distance, lower is more similar
+    created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
+
+    __table_args__ = (
+        Index("ix_research_neighbors_research_distance", "deep_research_id", "distance"),
+        # Lists that include an item, to refill them when it is deleted
+        Index("ix_research_neighbors_neighbor_id", "neighbor_id"),
+    )
+
+# 22) research_contents
+class ResearchContent(Base):
+    """
+    Compressed out-of-row bodies (prompt_text, final_report) of research items
+    whose body_storage is "database".
+    """
+    __tablename__ = "research_contents"
+
+    deep_research_id = Column(Integer, ForeignKey("deep_research.id", ondelete="CASCADE"), primary_key=True)
+    field = Column(String(50), primary_key=True)  # "prompt_text" or "final_report"
+    codec = Column(String(20), nullable=False, server_default="zstd")
+    data = Column(LargeBinary, nullable=False)
+    original_size = Column(Integer, nullable=False)  # uncompressed size in bytes
+    created_at = Column(DateTime(timezone=False), nullable=False, server_default=text("(now() AT TIME ZONE 'utc')"))
@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.db.pagination import NEXT_CURSOR_HEADER
+from app.db.pool_metrics import start_metrics_server
+from app.db.replica import LAST_WRITE_HEADER, SAFE_METHODS, mark_write, replica_enabled
 from app.routers.auth import router as AuthRouter
 from app.routers.comments import router as CommentsRouter
 from app.routers.deep_research import router as DeepResearchRouter
@@ -14,11 +19,40 @@ from app.routers.tags import router as TagsRouter
 from app.routers.users import router as UsersRouter
 from app.routers.api_keys import router as ApiKeysRouter
 from app.routers.organization_invites import router as OrganizationInvitesRouter, invites_router as AcceptInvitesRouter
+from app.services.job_events import job_event_hub
+from app.services.job_poller import job_poller
+from app.services.jwks import jwks_manager
+from app.services.service_catalog import service_catalog
+from app.services.service_clients import service_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool telemetry, on its own port rather than the public API
+    start_metrics_server(settings.METRICS_PORT, settings.METRICS_PORTS)
+    # Fetch the signing keys up front and keep them fresh in the background
+    jwks_manager.start()
+    # Keep-alive clients for the research services, shared by all requests
+    service_clients.start()
+    # Drops this process's copy of the service catalog when it changes
+    service_catalog.start()
+    if settings.RESEARCH_JOB_POLLER_ENABLED:
+        job_poller.start()
+    # One pub/sub subscription feeding every research job event stream
+    job_event_hub.start()
+    yield
+    await job_event_hub.stop()
+    await job_poller.stop()
+    await service_clients.close()
+    await service_catalog.stop()
+    await jwks_manager.stop()
+
 
 app = FastAPI(
     title="DRKR API",
     description="A sample OpenAPI specification for the DRKR project, covering all endpoint stubs across authentication, users, organizations, deep research items, tags, comments, ratings, research jobs, and search. ",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -28,8 +62,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER],
 )
 
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # Successful writes pin the client's reads to the primary for a while
+    response = await call_next(request)
+    if replica_enabled() and request.method not in SAFE_METHODS and response.status_code < 400:
+        mark_write(response)
+    return response
+
 app.include_router(AuthRouter, prefix="/api")
 app.include_router(CommentsRouter, prefix="/api")
 app.include_router(DeepResearchRouter, prefix="/api")
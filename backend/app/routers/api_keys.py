@@ -11,6 +11,7 @@ from app.db import get_db
 from app.models import User, ApiKey as ApiKeyModel, ApiService, OrganizationMember
 from app.schemas.api_key_create import ApiKeyCreate
 from app.schemas.api_key import ApiKey
+from app.services.api_keys import DRKR_SERVICE_NAME, generate_api_key, hash_api_key, invalidate_api_key
 from app.services.authentication import get_current_user
 
 router = APIRouter()
@@ -30,7 +31,14 @@ async def create_api_key(
     db: AsyncSession = Depends(get_db),
     org_id: Optional[int] = Query(None, description="Organization ID for the API key")
 ) -> ApiKey:
-    """Create a new API key for the current user"""
+    """Create a new API key for the current user or, with org_id, for an organization"""
+    if org_id:
+        # Only organization admins and owners may create organization keys
+        org_member = next((m for m in current_user.organization_memberships 
+                          if m.organization_id == org_id), None)
+        if not org_member or org_member.role not in ["admin", "owner"]:
+            raise HTTPException(status_code=403, detail="Insufficient permissions to create organization API keys")
+    
     # Get the API service ID based on the provided name
     api_service = await db.execute(
         select(ApiService).where(ApiService.name == api_key_data.api_service_name)
@@ -39,29 +47,40 @@ async def create_api_key(
     if not api_service:
         raise HTTPException(status_code=404, detail="API service not found")
     
-    # Generate a secure random API key
-    api_key = api_key_data.token if (api_key_data.token and api_key_data.api_service_name != "DRKR") else secrets.token_urlsafe(64)
+    if api_service.name == DRKR_SERVICE_NAME:
+        # DRKR keys are generated here and only their prefix and hash are stored
+        api_key, token_prefix = generate_api_key()
+        stored_token, token_hash = None, hash_api_key(api_key)
+    else:
+        # Third-party keys are sent on to the service, so they're kept as given
+        api_key = api_key_data.token or secrets.token_urlsafe(64)
+        stored_token, token_prefix, token_hash = api_key, None, None
     
     # Calculate expiration date
     expires_at = datetime.utcnow() + timedelta(days=api_key_data.expires_in_days)
     
     # Create new API key record
-    db_api_key = ApiKey(
+    db_api_key = ApiKeyModel(
         api_service_id=api_service.id,
-        token=api_key,
+        token=stored_token,
+        token_prefix=token_prefix,
+        token_hash=token_hash,
         name=api_key_data.name,
         user_id=current_user.id if not org_id else None,
         organization_id=org_id,
+        created_by=current_user.id,
         expires_at=expires_at
     )
+    db_api_key.api_service = api_service
     
     db.add(db_api_key)
     await db.commit()
     await db.refresh(db_api_key)
     
-    _ = db_api_key.api_service # This will trigger the lazy loading
-    
-    return ApiKey.model_validate(db_api_key)
+    response = ApiKey.model_validate(db_api_key)
+    # The only time a DRKR key is returned in full
+    response.token = api_key
+    return response
 
 @router.get(
     "/api-keys",
@@ -119,18 +138,24 @@ async def revoke_api_key(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> dict:
-    """Revoke an API key"""
-    stmt = select(ApiKeyModel).where(
-        ApiKeyModel.id == key_id,
-        ApiKeyModel.user_id == current_user.id
-    )
+    """Revoke a user API key, or an organization key as an organization admin"""
+    stmt = select(ApiKeyModel).where(ApiKeyModel.id == key_id)
     result = await db.execute(stmt)
     api_key = result.scalars().first()
     
+    if api_key and api_key.organization_id:
+        org_member = next((m for m in current_user.organization_memberships 
+                          if m.organization_id == api_key.organization_id), None)
+        if not org_member or org_member.role not in ["admin", "owner"]:
+            api_key = None
+    elif api_key and api_key.user_id != current_user.id:
+        api_key = None
+    
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
     
     api_key.is_active = False
     await db.commit()
+    await invalidate_api_key(api_key.token_hash)
     
-    return {"message": "API key revoked successfully"} 
\ No newline at end of file
+    return {"message": "API key revoked successfully"} 
@@ -4,7 +4,6 @@ from typing import Dict, List  # noqa: F401
 import importlib
 import pkgutil
 
-from app.routers.comments_base import BaseComments
 import app.impl
 
 from fastapi import (  # noqa: F401
@@ -22,12 +21,19 @@ from fastapi import (  # noqa: F401
     status,
 )
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from app.db import get_db
+from app.models import DeepResearch as DeepResearchModel, ResearchComment
 from app.schemas.extra_models import TokenModel  # noqa: F401
 from pydantic import StrictInt
 from typing import Any, List
 from app.schemas.comment import Comment
 from app.schemas.comment_create_request import CommentCreateRequest
 from app.schemas.comment_update_request import CommentUpdateRequest
+from app.services.authentication import get_current_user
+from app.services.research_access import get_readable_research
+from app.services.research_cache import invalidate_research
 
 
 router = APIRouter()
@@ -37,6 +43,32 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     importlib.import_module(name)
 
 
+def _comment_response(comment) -> Comment:
+    return Comment(
+        id=comment.id,
+        comment_text=comment.comment_text,
+        user_id=comment.user_id,
+        deep_research_id=comment.deep_research_id,
+        parent_comment_id=comment.parent_comment_id
+    )
+
+
+def _validated_comment_text(request) -> str:
+    if request is None or not request.comment_text or not request.comment_text.strip():
+        raise HTTPException(status_code=400, detail="comment_text is required")
+    return request.comment_text
+
+
+async def _get_comment(db: AsyncSession, comment_id: int) -> ResearchComment:
+    result = await db.execute(
+        select(ResearchComment).where(ResearchComment.id == comment_id)
+    )
+    comment = result.scalar_one_or_none()
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    return comment
+
+
 @router.delete(
     "/comments/{comment_id}",
     responses={
@@ -48,10 +80,31 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
 )
 async def comments_comment_id_delete(
     comment_id: StrictInt = Path(..., description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> None:
-    if not BaseComments.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseComments.subclasses[0]().comments_comment_id_delete(comment_id)
+    comment = await _get_comment(db, comment_id)
+    
+    # Lock the parent first so the comment_count delta is applied serially
+    research = await get_readable_research(db, comment.deep_research_id, current_user, for_update=True)
+    
+    # Comment authors and the owner of the research item may delete
+    if comment.user_id != current_user.id and research.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
+    
+    await db.delete(comment)
+    await db.execute(
+        update(DeepResearchModel)
+        .where(DeepResearchModel.id == comment.deep_research_id)
+        .values(
+            comment_count=func.greatest(DeepResearchModel.comment_count - 1, 0),
+            content_version=DeepResearchModel.content_version + 1,
+            updated_at=DeepResearchModel.updated_at
+        )
+    )
+    await db.commit()
+    await invalidate_research(comment.deep_research_id)
+    return Response(status_code=204)
 
 
 @router.patch(
@@ -66,10 +119,29 @@ async def comments_comment_id_delete(
 async def comments_comment_id_patch(
     comment_id: StrictInt = Path(..., description=""),
     comment_update_request: CommentUpdateRequest = Body(None, description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> Comment:
-    if not BaseComments.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseComments.subclasses[0]().comments_comment_id_patch(comment_id, comment_update_request)
+    comment_text = _validated_comment_text(comment_update_request)
+    comment = await _get_comment(db, comment_id)
+    
+    if comment.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this comment")
+    
+    comment.comment_text = comment_text
+    await db.execute(
+        update(DeepResearchModel)
+        .where(DeepResearchModel.id == comment.deep_research_id)
+        .values(
+            content_version=DeepResearchModel.content_version + 1,
+            updated_at=DeepResearchModel.updated_at
+        )
+    )
+    await db.commit()
+    await invalidate_research(comment.deep_research_id)
+    await db.refresh(comment)
+    
+    return _comment_response(comment)
 
 
 @router.get(
@@ -83,10 +155,20 @@ async def comments_comment_id_patch(
 )
 async def research_id_comments_get(
     id: StrictInt = Path(..., description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> List[Comment]:
-    if not BaseComments.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseComments.subclasses[0]().research_id_comments_get(id)
+    await get_readable_research(db, id, current_user)
+    
+    stmt = (
+        select(ResearchComment)
+        .where(ResearchComment.deep_research_id == id)
+        .order_by(ResearchComment.created_at, ResearchComment.id)
+    )
+    result = await db.execute(stmt)
+    comments = result.scalars().all()
+    
+    return [_comment_response(comment) for comment in comments]
 
 
 @router.post(
@@ -101,7 +183,31 @@ async def research_id_comments_get(
 async def research_id_comments_post(
     id: StrictInt = Path(..., description=""),
     comment_create_request: CommentCreateRequest = Body(None, description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> Comment:
-    if not BaseComments.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseComments.subclasses[0]().research_id_comments_post(id, comment_create_request)
+    comment_text = _validated_comment_text(comment_create_request)
+    
+    # Lock the research row so concurrent comments apply their count deltas serially
+    await get_readable_research(db, id, current_user, for_update=True)
+    
+    comment = ResearchComment(
+        deep_research_id=id,
+        user_id=current_user.id,
+        comment_text=comment_text
+    )
+    db.add(comment)
+    await db.execute(
+        update(DeepResearchModel)
+        .where(DeepResearchModel.id == id)
+        .values(
+            comment_count=DeepResearchModel.comment_count + 1,
+            content_version=DeepResearchModel.content_version + 1,
+            updated_at=DeepResearchModel.updated_at
+        )
+    )
+    await db.commit()
+    await invalidate_research(id)
+    await db.refresh(comment)
+    
+    return _comment_response(comment)
@@ -22,19 +22,43 @@ from fastapi import (  # noqa: F401
 )
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, or_, and_, select, desc, asc
-from sqlalchemy.orm import selectinload
-from app.db import get_db
-from app.models import DeepResearch as DeepResearchModel, ResearchRating, User
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, undefer_group
+from app.db import get_db, get_read_db
+from app.db.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, keyset_order_by, next_cursor
+from app.db.search import contains
+from app.models import (
+    DeepResearch as DeepResearchModel,
+    ResearchNeighbor,
+    ResearchSummary as ResearchSummaryModel,
+    User
+)
 from app.schemas.extra_models import TokenModel  # noqa: F401
-from pydantic import StrictInt
-from typing import Any, List
+from pydantic import StrictInt, TypeAdapter
+from typing import Any, List, Union
 from app.schemas.deep_research import DeepResearch
 from app.schemas.deep_research_create_request import DeepResearchCreateRequest
+from app.schemas.deep_research_summary import DeepResearchSummary
 from app.schemas.deep_research_update_request import DeepResearchUpdateRequest
+from app.schemas.related_research import RelatedResearch
 from app.schemas.tag import Tag
 from app.models import Tag as TagModel, DeepResearchTag
 from app.services.authentication import get_current_user
+from app.tasks.research_processing import compute_neighbor_lists
+from app.services.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
+from app.services.report_storage import delete_bodies, hydrate_bodies, store_bodies
+from app.services.research_cache import (
+    CachedResponse,
+    acl_of,
+    cache_enabled,
+    get_or_load,
+    invalidate_research
+)
+from app.services.research_access import (
+    check_research_read_access,
+    get_readable_research,
+    research_visibility_filter
+)
 from datetime import datetime
 
 router = APIRouter()
@@ -46,10 +70,12 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
 
 def get_deep_research_options():
     """
-    Returns SQLAlchemy options to load all DeepResearch relationships.
-    Used to consistently load relationships across all endpoints.
+    Returns SQLAlchemy options to load all DeepResearch relationships and the
+    deferred text bodies a full response renders. Used to consistently load
+    relationships across all endpoints.
     """
     return [
+        undefer_group("bodies"),
         selectinload(DeepResearchModel.chunks),
         selectinload(DeepResearchModel.summaries),
         selectinload(DeepResearchModel.sources),
@@ -60,10 +86,38 @@ def get_deep_research_options():
     ]
 
 
+# Built once: validating and serializing a whole page through a TypeAdapter runs
+# in pydantic-core, and dump_json writes the JSON bytes without going through
+# FastAPI's jsonable_encoder and a second validation of the response model.
+_deep_research_list_adapter = TypeAdapter(List[DeepResearch])
+_deep_research_summary_list_adapter = TypeAdapter(List[DeepResearchSummary])
+
+
+_deep_research_adapter = TypeAdapter(DeepResearch)
+_tag_list_adapter = TypeAdapter(List[Tag])
+
+
+def _research_etag(research) -> str:
+    """
+    Strong ETag for GET /deep-research/{id}. updated_at covers edits to the item
+    itself and content_version covers the child rows returned with it.
+    """
+    return make_etag("deep-research", research.id, research.updated_at, research.content_version)
+
+
+def _list_response(adapter: TypeAdapter, items: list, cursor: Optional[str]) -> Response:
+    headers = {NEXT_CURSOR_HEADER: cursor} if cursor else None
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(items, from_attributes=True)),
+        media_type="application/json",
+        headers=headers
+    )
+
+
 @router.get(
     "/deep-research",
     responses={
-        200: {"model": List[DeepResearch], "description": "A list of deep research items"},
+        200: {"model": List[Union[DeepResearch, DeepResearchSummary]], "description": "A list of deep research items, or list rows when view=summary"},
     },
     tags=["deep-research"],
     summary="List deep research items accessible to the user",
@@ -78,38 +132,63 @@ async def research_get(
     order: Optional[str] = "desc",
     creator_username: Optional[str] = None,
     model_name: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    view: Optional[str] = Query(None, description="'summary' returns only the list columns instead of full items"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over page"),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
-) -> List[DeepResearch]:
-    # Calculate offset
-    offset = (page - 1) * limit
+) -> List[Union[DeepResearch, DeepResearchSummary]]:
+    if view not in (None, "full", "summary"):
+        raise HTTPException(status_code=400, detail="view must be 'full' or 'summary'")
     
-    # Build base query with avg_rating calculation and username
+    sort_key = order_by or 'created_at'
+    order = 'desc' if order == 'desc' else 'asc'
+    
+    if view == "summary":
+        # Only the columns a list row renders. Counts are denormalized onto the
+        # row and the very short report summary comes from a correlated subquery,
+        # so the page is a single SQL query that never touches report bodies,
+        # embeddings or child rows.
+        columns = [
+            DeepResearchModel.id,
+            DeepResearchModel.user_id,
+            DeepResearchModel.owner_user_id,
+            DeepResearchModel.owner_org_id,
+            DeepResearchModel.visibility,
+            DeepResearchModel.title,
+            DeepResearchModel.model_name,
+            DeepResearchModel.source_count,
+            DeepResearchModel.created_at,
+            DeepResearchModel.updated_at,
+            DeepResearchModel.rating_count,
+            DeepResearchModel.comment_count,
+            select(ResearchSummaryModel.summary_text)
+                .where(
+                    ResearchSummaryModel.deep_research_id == DeepResearchModel.id,
+                    ResearchSummaryModel.summary_scope == "report",
+                    ResearchSummaryModel.summary_length == "veryshort"
+                )
+                .limit(1)
+                .scalar_subquery()
+                .label('summary'),
+        ]
+    else:
+        columns = [DeepResearchModel]
+    
+    # Build base query with username; avg_rating is derived from the
+    # denormalized rating aggregates, so no join to research_ratings is needed
+    sort_col = getattr(DeepResearchModel, sort_key)
     query = (
         select(
-            DeepResearchModel,
-            func.coalesce(func.avg(ResearchRating.rating_value), 0.0).label('avg_rating'),
-            User.username.label('creator_username')
+            *columns,
+            DeepResearchModel.avg_rating.label('avg_rating'),
+            User.username.label('creator_username'),
+            sort_col.label('sort_key')
         )
         .join(User, DeepResearchModel.user_id == User.id)
-        .outerjoin(ResearchRating)
-        .group_by(DeepResearchModel.id, User.username)
     )
     
     # Add visibility filters
-    query = query.where(
-        or_(
-            DeepResearchModel.visibility == "public",
-            DeepResearchModel.user_id == current_user.id,
-            and_(
-                DeepResearchModel.visibility == "org",
-                DeepResearchModel.owner_org_id.isnot(None),
-                DeepResearchModel.owner_org_id.in_([
-                    m.organization_id for m in current_user.organization_memberships
-                ])
-            )
-        )
-    )
+    query = query.where(research_visibility_filter(current_user))
 
     # Add org filter if specified
     if org_id is not None:
@@ -117,38 +196,49 @@ async def research_get(
     elif visibility: # Add visibility filter if specified
         query = query.where(DeepResearchModel.visibility == visibility)
 
-    # Add creator_username filter if specified
+    # Add creator_username and model_name substring filters (trigram-indexed)
     if creator_username:
-        query = query.where(User.username.ilike(f"%{creator_username}%"))
-
-    # Add model_name filter if specified
+        query = query.where(contains([User.username], creator_username))
     if model_name:
-        query = query.where(DeepResearchModel.model_name.ilike(f"%{model_name}%"))
+        query = query.where(contains([DeepResearchModel.model_name], model_name))
 
-    # Add sorting
-    if order_by == 'avg_rating':
-        sort_col = func.avg(ResearchRating.rating_value)
+    # Add sorting with id as tiebreaker (avg_rating resolves to the indexed
+    # expression on the model). A cursor seeks past the last row of the previous
+    # page via the (sort column, id) index, so deep pages cost the same as the first.
+    query = keyset_order_by(query, sort_col, DeepResearchModel.id, order == 'desc')
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_key, order)
+        query = query.where(keyset_filter(sort_col, DeepResearchModel.id, order == 'desc', sort_value, last_id))
     else:
-        sort_col = getattr(DeepResearchModel, order_by or 'created_at')
+        query = query.offset((page - 1) * limit)
     
-    query = query.order_by(desc(sort_col) if order == 'desc' else asc(sort_col))
+    # Fetch one extra row to know whether there is a next page
+    query = query.limit(limit + 1)
     
-    # Apply pagination and load relationships
-    query = query.options(*get_deep_research_options()) \
-                .offset(offset) \
-                .limit(limit)
+    if view == "summary":
+        result = await db.execute(query)
+        rows = result.all()
+        cursor = next_cursor(rows, limit, sort_key, order, lambda row: row.sort_key, lambda row: row.id)
+        return _list_response(_deep_research_summary_list_adapter, rows[:limit], cursor)
+    
+    # Load relationships
+    query = query.options(*get_deep_research_options())
     
     # Execute query
     result = await db.execute(query)
+    rows = result.all()
+    cursor = next_cursor(rows, limit, sort_key, order, lambda row: row.sort_key, lambda row: row[0].id)
     items = []
-    for item, avg_rating, creator_username in result:
-        # Convert to dict to add computed fields
-        item_dict = DeepResearch.model_validate(item).model_dump()
-        item_dict['avg_rating'] = float(avg_rating) if avg_rating is not None else None
-        item_dict['creator_username'] = creator_username
-        items.append(item_dict)
+    for row in rows[:limit]:
+        # avg_rating is a column_property on the model; the joined username is
+        # attached so each item validates straight from the ORM object, once
+        item = row[0]
+        item.creator_username = row.creator_username
+        items.append(item)
+    # Bodies kept out of row are fetched for the whole page at once
+    await hydrate_bodies(db, items)
     
-    return [DeepResearch.model_validate(item) for item in items]
+    return _list_response(_deep_research_list_adapter, items, cursor)
 
 
 @router.delete(
@@ -184,8 +274,18 @@ async def research_id_delete(
         else:
             raise HTTPException(status_code=403, detail="Cannot delete another user's research item")
     
+    # Neighbor lists that include this item lose it to the cascade; refill them afterwards
+    affected = (await db.execute(
+        select(ResearchNeighbor.deep_research_id).where(ResearchNeighbor.neighbor_id == id)
+    )).scalars().all()
+    
     await db.delete(research)
     await db.commit()
+    # Only after the commit, so a rolled back delete keeps its bodies
+    await delete_bodies(db, research)
+    await invalidate_research(id)
+    if affected:
+        compute_neighbor_lists.delay(list(affected))
     return Response(status_code=204)
 
 @router.get(
@@ -199,28 +299,48 @@ async def research_id_delete(
 )
 async def research_id_get(
     id: StrictInt = Path(..., description=""),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ) -> DeepResearch:
-    # Lookup the research item with all relationships loaded
-    stmt = select(DeepResearchModel).where(DeepResearchModel.id == id).options(*get_deep_research_options())
-    result = await db.execute(stmt)
-    research = result.scalars().first()
+    async def load(session: AsyncSession) -> CachedResponse:
+        # Lookup the research item with all relationships loaded
+        stmt = select(DeepResearchModel).where(DeepResearchModel.id == id).options(*get_deep_research_options())
+        result = await session.execute(stmt)
+        research = result.scalars().first()
+        
+        if not research:
+            raise HTTPException(status_code=404, detail="Research item not found")
+        
+        # Check access permissions
+        check_research_read_access(research, current_user)
+        
+        await hydrate_bodies(session, [research])
+        content = _deep_research_adapter.dump_json(_deep_research_adapter.validate_python(research, from_attributes=True))
+        return CachedResponse(content, _research_etag(research), acl_of(research))
     
-    if not research:
-        raise HTTPException(status_code=404, detail="Research item not found")
+    if cache_enabled():
+        # Fill from the primary: a lagging replica could store the pre-update
+        # item under the generation its invalidation just started
+        entry = await get_or_load(id, "item", lambda: load(db))
+    else:
+        # Access check and version lookup on the primary key only; a client holding
+        # the current representation gets a 304 without loading the item
+        version = await get_readable_research(read_db, id, current_user)
+        etag = _research_etag(version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, version.visibility)
+        entry = await load(read_db)
     
-    # Check access permissions
-    if research.visibility != "public":
-        if research.visibility == "private" and research.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        elif research.visibility == "org":
-            org_member = next((m for m in current_user.organization_memberships 
-                             if m.organization_id == research.owner_org_id), None)
-            if not org_member:
-                raise HTTPException(status_code=403, detail="Access denied")
+    # Cached entries are shared between users, so check them against this one
+    check_research_read_access(entry.acl, current_user)
+    if etag_matches(if_none_match, entry.etag):
+        return not_modified(entry.etag, entry.acl.visibility)
     
-    return DeepResearch.model_validate(research)
+    response = Response(content=entry.content, media_type="application/json")
+    set_cache_headers(response, entry.etag, entry.acl.visibility)
+    return response
 
 @router.patch(
     "/deep-research/{id}",
@@ -260,7 +380,7 @@ async def research_id_patch(
     if deep_research_update_request.title is not None:
         research.title = deep_research_update_request.title
     if deep_research_update_request.final_report is not None:
-        research.final_report = deep_research_update_request.final_report
+        await store_bodies(db, research, {"final_report": deep_research_update_request.final_report})
     if deep_research_update_request.owner_org_id is not None:
         org_member = next((m for m in current_user.organization_memberships 
                              if m.organization_id == deep_research_update_request.owner_org_id), None)
@@ -278,10 +398,12 @@ async def research_id_patch(
     
     # Save changes
     await db.commit()
+    await invalidate_research(id)
 
     stmt = select(DeepResearchModel).where(DeepResearchModel.id == id).options(*get_deep_research_options())
     result = await db.execute(stmt)
     research = result.scalars().first()
+    await hydrate_bodies(db, [research])
     
     return DeepResearch.model_validate(research)
 
@@ -325,18 +447,23 @@ async def research_post(
         owner_user_id=current_user.id,
         owner_org_id=owner_org_id,
         title=deep_research_create_request.title,
-        prompt_text=deep_research_create_request.prompt_text,
-        final_report=deep_research_create_request.final_report,
         visibility=deep_research_create_request.visibility,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
     
-    # Save to database
+    # Save to database, with large bodies going to the configured content store
     db.add(research)
+    await store_bodies(db, research, {
+        "prompt_text": deep_research_create_request.prompt_text,
+        "final_report": deep_research_create_request.final_report
+    })
     await db.commit()
-    # Refresh the object with relationships loaded
-    await db.refresh(research, options=get_deep_research_options())
+    # Reload the object with relationships loaded
+    stmt = select(DeepResearchModel).where(DeepResearchModel.id == research.id).options(*get_deep_research_options())
+    result = await db.execute(stmt)
+    research = result.scalars().first()
+    await hydrate_bodies(db, [research])
     
     return DeepResearch.model_validate(research)
 
@@ -351,36 +478,88 @@ async def research_post(
 )
 async def research_id_tags_get(
     id: StrictInt = Path(..., description=""),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ) -> List[Tag]:
-    # Lookup the research item first
-    stmt = select(DeepResearchModel).where(DeepResearchModel.id == id)
-    result = await db.execute(stmt)
-    research = result.scalars().first()
+    async def load() -> CachedResponse:
+        # Lookup the research item first, checking access permissions
+        research = await get_readable_research(db, id, current_user)
+        
+        # Query tags associated with this research item
+        query = select(TagModel).join(
+            DeepResearchTag, 
+            TagModel.id == DeepResearchTag.tag_id
+        ).where(
+            DeepResearchTag.deep_research_id == id
+        )
+        
+        tag_result = await db.execute(query)
+        tags = tag_result.scalars().all()
+        
+        # The tag list is small, so its ETag is simply a hash of the response body
+        content = _tag_list_adapter.dump_json(_tag_list_adapter.validate_python(tags, from_attributes=True))
+        return CachedResponse(content, make_etag(content), acl_of(research))
     
-    if not research:
-        raise HTTPException(status_code=404, detail="Research item not found")
+    entry = await get_or_load(id, "tags", load)
+    check_research_read_access(entry.acl, current_user)
+    if etag_matches(if_none_match, entry.etag):
+        return not_modified(entry.etag, entry.acl.visibility)
     
-    # Check access permissions (same logic as in research_id_get)
-    if research.visibility != "public":
-        if research.visibility == "private" and research.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        elif research.visibility == "org":
-            org_member = next((m for m in current_user.organization_memberships 
-                             if m.organization_id == research.owner_org_id), None)
-            if not org_member:
-                raise HTTPException(status_code=403, detail="Access denied")
+    response = Response(content=entry.content, media_type="application/json")
+    set_cache_headers(response, entry.etag, entry.acl.visibility)
+    return response
+
+@router.get(
+    "/deep-research/{id}/related",
+    responses={
+        200: {"model": List[RelatedResearch], "description": "Research items related to the deep research item"},
+    },
+    tags=["deep-research"],
+    summary="Get related research items for a deep research item",
+    response_model_by_alias=True,
+)
+async def research_id_related_get(
+    id: StrictInt = Path(..., description=""),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of related items"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+) -> List[RelatedResearch]:
+    # Only the visibility columns are needed for the access check
+    await get_readable_research(db, id, current_user)
     
-    # Query tags associated with this research item
-    query = select(TagModel).join(
-        DeepResearchTag, 
-        TagModel.id == DeepResearchTag.tag_id
-    ).where(
-        DeepResearchTag.deep_research_id == id
+    # Neighbor lists are precomputed by the research.compute_related_research task,
+    # so this is an indexed lookup on (deep_research_id, distance). Visibility is
+    # re-checked here because neighbors are computed across all items.
+    query = (
+        select(
+            DeepResearchModel.id,
+            DeepResearchModel.user_id,
+            DeepResearchModel.owner_org_id,
+            DeepResearchModel.visibility,
+            DeepResearchModel.title,
+            DeepResearchModel.model_name,
+            DeepResearchModel.created_at,
+            ResearchNeighbor.distance
+        )
+        .join(ResearchNeighbor, ResearchNeighbor.neighbor_id == DeepResearchModel.id)
+        .where(ResearchNeighbor.deep_research_id == id)
+        .where(research_visibility_filter(current_user))
+        .order_by(ResearchNeighbor.distance)
+        .limit(limit)
     )
+    related_result = await db.execute(query)
     
-    tag_result = await db.execute(query)
-    tags = tag_result.scalars().all()
-    
-    return [Tag.model_validate(tag) for tag in tags]
+    return [
+        RelatedResearch(
+            id=row.id,
+            user_id=row.user_id,
+            owner_org_id=row.owner_org_id,
+            visibility=row.visibility,
+            title=row.title,
+            model_name=row.model_name,
+            created_at=row.created_at.isoformat() if row.created_at else None,
+            similarity=1.0 - row.distance
+        )
+        for row in related_result
+    ]
@@ -7,11 +7,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
-from app.services.authentication import get_current_user
+from app.services.authentication import get_current_user, get_current_user_record
 from app.models import Organization, OrganizationMember, OrganizationInvite, User
 from app.schemas.organization_invite_request import OrganizationInviteRequest
 from app.schemas.organization_invite_response import OrganizationInviteResponse
 from app.services.email import send_invite_email
+from app.services.principal_cache import invalidate_principals
 from app.config import settings
 
 router = APIRouter(prefix="/orgs/{id}")
@@ -46,7 +47,7 @@ async def create_invite(
     id: StrictInt = Path(..., description="Organization ID"),
     invite_request: OrganizationInviteRequest = Body(..., description="Invite details"),
     db: AsyncSession = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user_record)
 ) -> OrganizationInviteResponse:
     # Check if organization exists
     org_result = await db.execute(select(Organization).where(Organization.id == id))
@@ -304,6 +305,7 @@ async def accept_invite(
     invite.is_used = True
     
     await db.commit()
+    await invalidate_principals(db, current_user.id)
     
     # Get organization details
     org_result = await db.execute(select(Organization).where(Organization.id == invite.organization_id))
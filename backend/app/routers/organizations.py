@@ -35,6 +35,7 @@ from app.schemas.organization import Organization
 from app.schemas.organization_create_request import OrganizationCreateRequest
 from app.db import get_db
 from app.services.authentication import get_current_user
+from app.services.principal_cache import invalidate_principals
 from app.schemas.org_member_role_update import OrgMemberRoleUpdate
 
 
@@ -171,6 +172,7 @@ async def orgs_id_members_delete(
     # Remove the member
     await db.delete(member)
     await db.commit()
+    await invalidate_principals(db, user_id)
     
     return Response(status_code=204)
 
@@ -228,6 +230,7 @@ async def orgs_id_members_post(
     
     db.add(new_member)
     await db.commit()
+    await invalidate_principals(db, org_membership_request.user_id)
     
     return Response(status_code=200)
 
@@ -264,6 +267,7 @@ async def orgs_post(
     
     db.add(owner_member)
     await db.commit()
+    await invalidate_principals(db, current_user.id)
     
     # Reload the organization with members
     query = (
@@ -365,5 +369,6 @@ async def orgs_id_members_user_id_patch(
     # Update the role
     member.role = new_role
     await db.commit()
+    await invalidate_principals(db, user_id)
     
     return {"message": f"Member role updated to {new_role}"}
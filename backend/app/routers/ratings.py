@@ -4,7 +4,6 @@ from typing import Dict, List  # noqa: F401
 import importlib
 import pkgutil
 
-from app.routers.ratings_base import BaseRatings
 import app.impl
 
 from fastapi import (  # noqa: F401
@@ -22,11 +21,19 @@ from fastapi import (  # noqa: F401
     status,
 )
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db import get_db
+from app.models import DeepResearch as DeepResearchModel, ResearchRating
 from app.schemas.extra_models import TokenModel  # noqa: F401
 from pydantic import StrictInt
 from typing import List
 from app.schemas.rating import Rating
 from app.schemas.rating_create_request import RatingCreateRequest
+from app.services.authentication import get_current_user
+from app.services.research_access import get_readable_research
+from app.services.research_cache import invalidate_research
 
 
 router = APIRouter()
@@ -36,6 +43,16 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     importlib.import_module(name)
 
 
+def _rating_response(rating) -> Rating:
+    return Rating(
+        id=rating.id,
+        rating_value=rating.rating_value,
+        user_id=rating.user_id,
+        deep_research_id=rating.deep_research_id,
+        created_at=rating.created_at.isoformat() if rating.created_at else None
+    )
+
+
 @router.get(
     "/research/{id}/ratings",
     responses={
@@ -47,10 +64,20 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
 )
 async def research_id_ratings_get(
     id: StrictInt = Path(..., description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> List[Rating]:
-    if not BaseRatings.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseRatings.subclasses[0]().research_id_ratings_get(id)
+    await get_readable_research(db, id, current_user)
+    
+    stmt = (
+        select(ResearchRating)
+        .where(ResearchRating.deep_research_id == id)
+        .order_by(ResearchRating.created_at, ResearchRating.id)
+    )
+    result = await db.execute(stmt)
+    ratings = result.scalars().all()
+    
+    return [_rating_response(rating) for rating in ratings]
 
 
 @router.post(
@@ -65,7 +92,59 @@ async def research_id_ratings_get(
 async def research_id_ratings_post(
     id: StrictInt = Path(..., description=""),
     rating_create_request: RatingCreateRequest = Body(None, description=""),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
 ) -> Rating:
-    if not BaseRatings.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseRatings.subclasses[0]().research_id_ratings_post(id, rating_create_request)
+    if rating_create_request is None or rating_create_request.rating_value is None:
+        raise HTTPException(status_code=400, detail="rating_value is required")
+    rating_value = rating_create_request.rating_value
+    if not 1 <= rating_value <= 5:
+        raise HTTPException(status_code=400, detail="rating_value must be between 1 and 5")
+    
+    # Lock the research row so concurrent ratings of the same item apply their
+    # aggregate deltas one at a time
+    await get_readable_research(db, id, current_user, for_update=True)
+    
+    previous = await db.execute(
+        select(ResearchRating.rating_value).where(
+            ResearchRating.deep_research_id == id,
+            ResearchRating.user_id == current_user.id
+        )
+    )
+    previous_value = previous.scalar_one_or_none()
+    
+    # One rating per user and item: insert, or replace the user's previous rating
+    stmt = pg_insert(ResearchRating).values(
+        deep_research_id=id,
+        user_id=current_user.id,
+        rating_value=rating_value
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResearchRating.deep_research_id, ResearchRating.user_id],
+        set_={"rating_value": stmt.excluded.rating_value}
+    ).returning(
+        ResearchRating.id,
+        ResearchRating.rating_value,
+        ResearchRating.user_id,
+        ResearchRating.deep_research_id,
+        ResearchRating.created_at
+    )
+    result = await db.execute(stmt)
+    rating = result.one()
+    
+    # Keep the denormalized aggregates in step with the ratings table. updated_at
+    # is pinned so that ratings don't count as edits to the research item.
+    await db.execute(
+        update(DeepResearchModel)
+        .where(DeepResearchModel.id == id)
+        .values(
+            rating_count=DeepResearchModel.rating_count + (1 if previous_value is None else 0),
+            rating_sum=DeepResearchModel.rating_sum + rating_value - (previous_value or 0),
+            content_version=DeepResearchModel.content_version + 1,
+            updated_at=DeepResearchModel.updated_at
+        )
+    )
+    await db.commit()
+    await invalidate_research(id)
+    
+    return _rating_response(rating)
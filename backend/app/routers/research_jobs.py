@@ -17,6 +17,7 @@ from fastapi import (  # noqa: F401
     HTTPException,
     Path,
     Query,
+    Request,
     Response,
     Security,
     status,
@@ -30,13 +31,17 @@ from app.schemas.research_job_create_response import ResearchJobCreateResponse
 from app.schemas.research_job_update_request import ResearchJobUpdateRequest
 from app.schemas.research_job_get_request import ResearchJobGetRequest
 from app.schemas.research_job_answer_request import ResearchJobAnswerRequest
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, desc, asc
+from sqlalchemy import select, or_, and_
 
 from app.services.authentication import get_current_user
 from app.db import get_db
+from app.db.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, keyset_order_by, next_cursor
+from app.db.search import contains
 from app.models import User, ResearchJob as ResearchJobModel
 from app.schemas.research_job import ResearchJob as ResearchJobSchema
+from app.services.job_events import job_event_stream
 from app.services.research import ResearchService
 
 router = APIRouter()
@@ -63,6 +68,19 @@ def check_research_job_permissions(job: ResearchJobModel, current_user: User) ->
     
     return False
 
+def research_job_access_filter(current_user: User):
+    """check_research_job_permissions as a WHERE clause, for listing jobs in SQL."""
+    return or_(
+        ResearchJobModel.user_id == current_user.id,
+        ResearchJobModel.visibility == "public",
+        and_(
+            ResearchJobModel.visibility == "org",
+            ResearchJobModel.owner_org_id.in_([
+                m.organization_id for m in current_user.organization_memberships
+            ])
+        )
+    )
+
 @router.get(
     "/research-jobs",
     response_model=List[ResearchJobSchema],
@@ -74,8 +92,10 @@ def check_research_job_permissions(job: ResearchJobModel, current_user: User) ->
     summary="List all research jobs",
 )
 async def research_jobs_get(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over page"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     service: Optional[str] = None,
@@ -87,33 +107,15 @@ async def research_jobs_get(
     model_name: Optional[str] = None,
 ) -> List[ResearchJobSchema]:
     """List research jobs with optional filtering."""
-    # Calculate offset
-    offset = (page - 1) * limit
-    
-    # Build base query with username
-    query = (
-        select(ResearchJobModel)
-        .join(User, ResearchJobModel.user_id == User.id)
-    )
+    sort_key = order_by or 'created_at'
+    order = 'desc' if order == 'desc' else 'asc'
     
-    # Add visibility filters
-    query = query.where(
-        or_(
-            ResearchJobModel.visibility == "public",
-            ResearchJobModel.user_id == current_user.id,
-            and_(
-                ResearchJobModel.visibility == "org",
-                ResearchJobModel.owner_org_id.isnot(None),
-                ResearchJobModel.owner_org_id.in_([
-                    m.organization_id for m in current_user.organization_memberships
-                ])
-            )
-        )
-    )
+    # Only jobs the user may see, so every page is full
+    query = select(ResearchJobModel).where(research_job_access_filter(current_user))
 
-    # Add filters
+    # Add filters; service keys are matched exactly so the indexes apply
     if service:
-        query = query.where(ResearchJobModel.service.ilike(f"%{service}%"))
+        query = query.where(ResearchJobModel.service == service.strip().lower())
     if status:
         query = query.where(ResearchJobModel.status == status)
     if org_id is not None:
@@ -121,21 +123,29 @@ async def research_jobs_get(
     elif visibility:
         query = query.where(ResearchJobModel.visibility == visibility)
     if model_name:
-        query = query.where(ResearchJobModel.model_name.ilike(f"%{model_name}%"))
+        query = query.where(contains([ResearchJobModel.model_name], model_name))
 
-    # Add sorting
-    sort_col = getattr(ResearchJobModel, order_by or 'created_at')
-    query = query.order_by(desc(sort_col) if order == 'desc' else asc(sort_col))
+    # Add sorting with id as tiebreaker, seeking past the previous page when a cursor is given
+    sort_col = getattr(ResearchJobModel, sort_key)
+    query = keyset_order_by(query, sort_col, ResearchJobModel.id, order == 'desc')
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_key, order)
+        query = query.where(keyset_filter(sort_col, ResearchJobModel.id, order == 'desc', sort_value, last_id))
+    else:
+        query = query.offset((page - 1) * limit)
     
-    # Apply pagination
-    query = query.offset(offset).limit(limit)
+    # Apply pagination, fetching one extra row to know whether there is a next page
+    query = query.limit(limit + 1)
     
     # Execute query
     result = await db.execute(query)
     jobs = result.scalars().all()
     
-    # Filter for permissions and convert to schema
-    return [ResearchJobSchema.model_validate(job) for job in jobs if check_research_job_permissions(job, current_user)]
+    next_page = next_cursor(jobs, limit, sort_key, order, lambda job: getattr(job, sort_key), lambda job: job.id)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    
+    return [ResearchJobSchema.model_validate(job) for job in jobs[:limit]]
 
 @router.post(
     "/research-jobs/get",
@@ -179,6 +189,48 @@ async def research_jobs_get(
     
     return result["job"]
 
+@router.get(
+    "/research-jobs/{id}/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Status and ingestion-stage events of the job"},
+        401: {"description": "Not authenticated"},
+        403: {"description": "Not authorized"},
+        404: {"description": "Research job not found"},
+    },
+    tags=["research-jobs"],
+    summary="Stream a research job's progress as Server-Sent Events",
+)
+async def research_jobs_id_events(
+    raw_request: Request,
+    id: int = Path(...),
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream job events; reconnecting clients resume from Last-Event-ID."""
+    db_job = await db.get(ResearchJobModel, id)
+    
+    if not db_job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Research job not found"
+        )
+    
+    if not check_research_job_permissions(db_job, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this research job"
+        )
+    
+    # Sessions are closed before the body streams, so watchers hold no connection
+    snapshot = ResearchJobSchema.model_validate(db_job).model_dump_json()
+    return StreamingResponse(
+        job_event_stream(raw_request, db_job.id, snapshot, db_job.status, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.patch(
     "/research-jobs/{id}",
     response_model=ResearchJobSchema,
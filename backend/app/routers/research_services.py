@@ -1,11 +1,13 @@
+import json
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.schemas.research_service import ResearchService as ResearchServiceSchema
 from app.services.authentication import get_current_user
 from app.services.research import ResearchService
+from app.services.webhooks import claim_delivery, release_delivery, verify_signature
 from app.models import User
 
 research_service = ResearchService()
@@ -32,4 +34,65 @@ async def list_research_services(
         List of research services
     """
     services = await research_service.get_research_services(db, service_key=service)
-    return [ResearchServiceSchema.model_validate(svc) for svc in services] 
\ No newline at end of file
+    return [ResearchServiceSchema.model_validate(svc) for svc in services]
+
+
+@router.post(
+    "/{service_key}/webhook",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        204: {"description": "Delivery processed (or already processed)"},
+        400: {"description": "Malformed delivery"},
+        401: {"description": "Missing or invalid signature"},
+        404: {"description": "Research job not found"},
+    },
+)
+async def research_service_webhook(
+    request: Request,
+    service_key: str = Path(..., description="Key of the service sending the delivery"),
+    x_drkr_timestamp: Optional[str] = Header(None),
+    x_drkr_signature: Optional[str] = Header(None),
+    x_drkr_delivery: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Receive a job status change from a research service.
+    
+    Deliveries are authenticated by their HMAC signature rather than a user,
+    and each delivery id is processed once. A completed job's results are
+    stored and ingestion is queued as when the status is polled.
+    """
+    body = await request.body()
+    if not verify_signature(body, x_drkr_timestamp, x_drkr_signature):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature"
+        )
+    
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict) or "job_id" not in payload or "status" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Webhook payload must include job_id and status"
+        )
+    
+    delivery_id = x_drkr_delivery or f"{payload['job_id']}:{x_drkr_timestamp}"
+    if not await claim_delivery(service_key, delivery_id):
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    
+    try:
+        job = await research_service.apply_webhook(db, service_key, payload)
+    except Exception:
+        await release_delivery(service_key, delivery_id)
+        raise
+    if job is None:
+        # Let the service retry once start_job has stored the job
+        await release_delivery(service_key, delivery_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Research job not found"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
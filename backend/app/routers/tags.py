@@ -19,19 +19,21 @@ from fastapi import (  # noqa: F401
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select, or_, union_all, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer_group
 from pydantic import StrictInt
 from typing import Any, List
 
 import app.impl
-from app.db import get_db
-from app.models import Tag as TagModel, DeepResearch, DeepResearchTag
+from app.db import get_db, get_read_db
+from app.models import Tag as TagModel, DeepResearch as DeepResearchModel, DeepResearchTag
 from app.schemas.extra_models import TokenModel  # noqa: F401
 from app.schemas.deep_research import DeepResearch
 from app.schemas.tag import Tag
 from app.schemas.tag_create_request import TagCreateRequest
 from app.schemas.tag_update_request import TagUpdateRequest
 from app.services.authentication import get_current_user
+from app.services.report_storage import hydrate_bodies
+from app.services.research_cache import invalidate_research
 
 router = APIRouter()
 
@@ -40,6 +42,14 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     importlib.import_module(name)
 
 
+async def _tagged_research_ids(db: AsyncSession, tag_id: int) -> List[int]:
+    """Research items carrying the tag, whose cached tag lists it appears in"""
+    result = await db.execute(
+        select(DeepResearchTag.deep_research_id).where(DeepResearchTag.tag_id == tag_id)
+    )
+    return list(result.scalars().all())
+
+
 @router.get(
     "/tags",
     responses={
@@ -50,7 +60,7 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     response_model_by_alias=True,
 )
 async def tags_get(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ) -> List[Tag]:
     # Get global tags
@@ -113,8 +123,10 @@ async def tags_id_delete(
         if not org_member or org_member.role not in ["admin", "owner"]:
             raise HTTPException(status_code=403, detail="Insufficient permissions to delete organization tag")
     
+    tagged_ids = await _tagged_research_ids(db, id)
     await db.delete(tag)
     await db.commit()
+    await invalidate_research(*tagged_ids)
     return Response(status_code=204)
 
 @router.get(
@@ -128,7 +140,7 @@ async def tags_id_delete(
 )
 async def tags_id_get(
     id: StrictInt = Path(..., description=""),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ) -> Tag:
     # Get the tag
@@ -224,6 +236,8 @@ async def tags_id_patch(
         tag.description = tag_update_request.description
     
     await db.commit()
+    # Cached tag lists of the tagged items carry the old name and description
+    await invalidate_research(*await _tagged_research_ids(db, id))
     await db.refresh(tag)
     return Tag.model_validate(tag)
 
@@ -238,7 +252,7 @@ async def tags_id_patch(
 )
 async def tags_id_research_get(
     id: StrictInt = Path(..., description=""),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ) -> List[DeepResearch]:
     # Get the tag
@@ -261,34 +275,37 @@ async def tags_id_research_get(
     
     # Get research items with this tag that the user has access to
     research_query = (
-        select(DeepResearch)
+        select(DeepResearchModel)
         .join(DeepResearchTag)
         .where(DeepResearchTag.tag_id == id)
         .where(
             or_(
-                DeepResearch.visibility == "public",
-                DeepResearch.user_id == current_user.id,
+                DeepResearchModel.visibility == "public",
+                DeepResearchModel.user_id == current_user.id,
                 and_(
-                    DeepResearch.visibility == "org",
-                    DeepResearch.owner_org_id.in_([m.organization_id for m in current_user.organization_memberships])
+                    DeepResearchModel.visibility == "org",
+                    DeepResearchModel.owner_org_id.in_([m.organization_id for m in current_user.organization_memberships])
                 )
             )
         )
         .options(
-            selectinload(DeepResearch.research_job),
-            selectinload(DeepResearch.sources),
-            selectinload(DeepResearch.auto_metadata),
-            selectinload(DeepResearch.comments),
-            selectinload(DeepResearch.ratings),
-            selectinload(DeepResearch.chunks),
-            selectinload(DeepResearch.summaries),
+            undefer_group("bodies"),
+            selectinload(DeepResearchModel.research_job),
+            selectinload(DeepResearchModel.sources),
+            selectinload(DeepResearchModel.auto_metadata),
+            selectinload(DeepResearchModel.comments),
+            selectinload(DeepResearchModel.ratings),
+            selectinload(DeepResearchModel.chunks),
+            selectinload(DeepResearchModel.summaries),
         )
-        .order_by(DeepResearch.created_at.desc())
+        .order_by(DeepResearchModel.created_at.desc())
     )
     
     # Execute the query asynchronously
     research_result = await db.execute(research_query)
     research_items = research_result.scalars().all()
+    # Bodies kept out of row are fetched for all the items at once
+    await hydrate_bodies(db, research_items)
     
     return [DeepResearch.model_validate(item) for item in research_items]
 
@@ -5,7 +5,7 @@ import importlib
 import pkgutil
 from pydantic import StrictInt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select
 from typing import Any, Optional
 from fastapi import (  # noqa: F401
     APIRouter,
@@ -23,12 +23,15 @@ from fastapi import (  # noqa: F401
 )
 
 import app.impl
-from app.db import get_db
+from app.db import get_db, get_read_db
+from app.db.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_filter, keyset_order_by, next_cursor
+from app.db.search import contains, similarity_rank
 from app.models import OrganizationMember, User as UserModel
 from app.routers.users_base import BaseUsers
 from app.schemas.user import User
 from app.schemas.user_update_request import UserUpdateRequest
-from app.services.authentication import get_current_user, verify_jwt_token, oauth2_scheme, create_user_if_not_exists
+from app.services.authentication import get_current_user, get_current_user_record, verify_jwt_token, oauth2_scheme, create_user_if_not_exists
+from app.services.principal_cache import invalidate_principals
 from datetime import datetime
 
 
@@ -48,7 +51,7 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     response_model_by_alias=True,
 )
 async def users_me_get(
-    current_user: UserModel = Depends(get_current_user)
+    current_user: UserModel = Depends(get_current_user_record)
 ) -> User:
     return User.model_validate(current_user)
 
@@ -64,7 +67,7 @@ async def users_me_get(
 async def users_me_patch(
     user_update_request: UserUpdateRequest = Body(None, description=""),
     db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: UserModel = Depends(get_current_user_record)
 ) -> User:
     # Update fields
     if user_update_request.email is not None:
@@ -79,6 +82,7 @@ async def users_me_patch(
     
     current_user.updated_at = datetime.utcnow()
     await db.commit()
+    await invalidate_principals(db, current_user.id)
     await db.refresh(current_user)
     return User.model_validate(current_user)
 
@@ -126,15 +130,20 @@ async def users_id_delete(
     response_model_by_alias=True,
 )
 async def users_get(
+    response: Response,
     org_id: Optional[int] = Query(None, description="Filter by organization ID"),
     search: Optional[str] = Query(None, description="Search by username, display name, or email"),
+    order_by: Optional[str] = Query(None, description="'username' (default) or 'relevance', which ranks search matches by similarity"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over page"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ) -> List[User]:
-    # Calculate offset
-    offset = (page - 1) * limit
+    if order_by not in (None, "username", "relevance"):
+        raise HTTPException(status_code=400, detail="order_by must be 'username' or 'relevance'")
+    if order_by == "relevance" and not search:
+        raise HTTPException(status_code=400, detail="order_by=relevance requires search")
     
     # Start with base query using select() instead of query()
     query = select(UserModel)
@@ -148,31 +157,41 @@ async def users_get(
         # Use join and where instead of join and filter
         query = query.join(OrganizationMember).where(OrganizationMember.organization_id == org_id)
     
-    # Apply search filter if provided
+    # Apply search filter if provided; substring matches use the trigram indexes
+    search_columns = (UserModel.username, UserModel.display_name, UserModel.email)
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                UserModel.username.ilike(search_term),
-                UserModel.display_name.ilike(search_term),
-                UserModel.email.ilike(search_term)
-            )
-        )
+        query = query.where(contains(search_columns, search))
     
-    # Get total count with proper async execution
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    if order_by == "relevance":
+        # Best matches first, for pickers that only show the top of the list.
+        # The rank isn't a stable seek key, so these pages are offset-based.
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursors are not supported with order_by=relevance")
+        query = query.order_by(
+            similarity_rank(search_columns, search).desc(), UserModel.username, UserModel.id
+        ).offset((page - 1) * limit).limit(limit)
+        result = await db.execute(query)
+        return [User.model_validate(user) for user in result.scalars().all()]
     
-    # Apply ordering and pagination
-    query = query.order_by(UserModel.username) \
-                 .offset(offset) \
-                 .limit(limit)
+    # Apply ordering and pagination. A cursor seeks past the last username of the
+    # previous page via the (username, id) index instead of skipping rows.
+    query = keyset_order_by(query, UserModel.username, UserModel.id, descending=False)
+    if cursor:
+        last_username, last_id = decode_cursor(cursor, "username", "asc")
+        query = query.where(keyset_filter(UserModel.username, UserModel.id, False, last_username, last_id))
+    else:
+        query = query.offset((page - 1) * limit)
+    query = query.limit(limit + 1)
     
     # Execute the query asynchronously
     result = await db.execute(query)
     users = result.scalars().all()
     
-    return [User.model_validate(user) for user in users]
+    next_page = next_cursor(users, limit, "username", "asc", lambda user: user.username, lambda user: user.id)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    
+    return [User.model_validate(user) for user in users[:limit]]
 
 
 @router.get(
@@ -186,7 +205,7 @@ async def users_get(
 )
 async def users_id_get(
     id: StrictInt = Path(..., description="User ID"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ) -> User:
     # Create a select statement instead of using db.query
@@ -266,5 +285,6 @@ async def users_id_patch(
     
     user.updated_at = datetime.utcnow()
     await db.commit()
+    await invalidate_principals(db, id)
     await db.refresh(user)
     return User.model_validate(user)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Dict, Optional
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class AiModelBase(CustomBaseModel):
     """Base schema for AI models"""
@@ -24,7 +24,7 @@ class AiModelInResearchService(AiModelBase):
 class AiModel(AiModelBase):
     """Schema for a complete AI model"""
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -24,7 +24,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 from app.schemas.api_service import ApiService
 class ApiKey(CustomBaseModel):
     """
@@ -36,12 +36,15 @@ class ApiKey(CustomBaseModel):
     user_id: Optional[StrictInt] = None
     organization_id: Optional[StrictInt] = None
     token: Optional[StrictStr] = None
+    token_prefix: Optional[StrictStr] = None
     is_active: Optional[StrictBool] = None
-    expires_at: Optional[str] = None
+    expires_at: Optional[IsoDateTimeStr] = None
+    last_used_at: Optional[IsoDateTimeStr] = None
+    request_count: Optional[StrictInt] = None
     api_service: Optional[ApiService] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
-    __properties: ClassVar[List[str]] = ["id", "api_service_id", "name", "user_id", "organization_id", "token", "is_active", "expires_at", "api_service", "created_at", "updated_at"]
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
+    __properties: ClassVar[List[str]] = ["id", "api_service_id", "name", "user_id", "organization_id", "token", "token_prefix", "is_active", "expires_at", "last_used_at", "request_count", "api_service", "created_at", "updated_at"]
 
     model_config = {
         "populate_by_name": True,
@@ -24,7 +24,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ApiService(CustomBaseModel):
     """
@@ -32,8 +32,8 @@ class ApiService(CustomBaseModel):
     """ # noqa: E501
     id: StrictInt = None
     name: Optional[StrictStr] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "name", "created_at", "updated_at"]
 
     model_config = {
@@ -24,7 +24,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 from app.schemas.comment import Comment
 from app.schemas.rating import Rating
 from app.schemas.research_chunk import ResearchChunk
@@ -49,8 +49,8 @@ class DeepResearch(CustomBaseModel):
     model_name: Optional[StrictStr] = None
     model_params: Optional[Dict[str, Any]] = None
     source_count: Optional[StrictInt] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     chunks: Optional[List[ResearchChunk]] = None
     summaries: Optional[List[ResearchSummary]] = None
     sources: Optional[List[ResearchSource]] = None
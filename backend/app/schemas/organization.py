@@ -24,7 +24,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 from app.schemas.organization_member import OrganizationMember
 
 class Organization(CustomBaseModel):
@@ -34,8 +34,8 @@ class Organization(CustomBaseModel):
     id: int
     name: StrictStr
     description: Optional[StrictStr] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     members: Optional[List[OrganizationMember]] = None
     __properties: ClassVar[List[str]] = ["id", "name", "description", "created_at", "updated_at", "members"]
 
@@ -6,7 +6,7 @@ import pprint
 
 from pydantic import StrictInt, StrictStr, Field
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class OrganizationInviteResponse(CustomBaseModel):
     id: StrictInt = Field(..., description="Invite ID")
@@ -15,8 +15,8 @@ class OrganizationInviteResponse(CustomBaseModel):
     invited_user_name: StrictStr = Field(..., description="Name of the invited user")
     role: StrictStr = Field(..., description="Role assigned to the invited user")
     is_used: bool = Field(..., description="Whether the invite has been used")
-    expires_at: str = Field(..., description="When the invite expires")
-    created_at: str = Field(..., description="When the invite was created")
+    expires_at: IsoDateTimeStr = Field(..., description="When the invite expires")
+    created_at: IsoDateTimeStr = Field(..., description="When the invite was created")
     
     model_config = {
         "populate_by_name": True,
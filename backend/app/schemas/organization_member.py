@@ -23,7 +23,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class OrganizationMember(CustomBaseModel):
     """
@@ -33,8 +33,8 @@ class OrganizationMember(CustomBaseModel):
     organization_id: Optional[StrictInt] = None
     user_id: Optional[StrictInt] = None
     role: Optional[StrictStr] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "organization_id", "user_id", "role", "created_at", "updated_at"]
 
     model_config = {
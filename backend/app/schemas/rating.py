@@ -22,7 +22,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class Rating(CustomBaseModel):
     """
@@ -32,7 +32,7 @@ class Rating(CustomBaseModel):
     rating_value: Optional[StrictInt] = None
     user_id: Optional[StrictInt] = None
     deep_research_id: Optional[StrictInt] = None
-    created_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "rating_value", "user_id", "deep_research_id", "created_at"]
 
     model_config = {
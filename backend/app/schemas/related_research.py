@@ -0,0 +1,52 @@
+# coding: utf-8
+
+"""
+    DRKR API
+
+    A sample OpenAPI specification for the DRKR project, covering all endpoint stubs across authentication, users, organizations, deep research items, tags, comments, ratings, research jobs, and search. 
+
+    The version of the OpenAPI document: 1.0.0
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import json
+
+from pydantic import BaseModel, StrictInt, StrictStr
+from typing import Any, ClassVar, Dict, List, Optional
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
+
+class RelatedResearch(CustomBaseModel):
+    """
+    RelatedResearch
+    """ # noqa: E501
+    id: StrictInt
+    user_id: Optional[StrictInt] = None
+    owner_org_id: Optional[StrictInt] = None
+    visibility: StrictStr
+    title: StrictStr
+    model_name: Optional[StrictStr] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    similarity: Optional[float] = None # 1 - cosine distance between report embeddings
+    __properties: ClassVar[List[str]] = ["id", "user_id", "owner_org_id", "visibility", "title", "model_name", "created_at", "similarity"]
+
+    model_config = {
+        "populate_by_name": True,
+        "validate_assignment": False,
+        "protected_namespaces": (),
+        "from_attributes": True,
+    }
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
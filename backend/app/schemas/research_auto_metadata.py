@@ -9,7 +9,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchAutoMetadata(CustomBaseModel):
     """
@@ -20,7 +20,7 @@ class ResearchAutoMetadata(CustomBaseModel):
     meta_key: StrictStr
     meta_value: StrictStr
     confidence_score: Optional[StrictInt] = None
-    created_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "deep_research_id", "meta_key", "meta_value", "confidence_score", "created_at"]
 
     model_config = {
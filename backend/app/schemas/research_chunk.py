@@ -9,7 +9,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchChunk(CustomBaseModel):
     """
@@ -20,8 +20,8 @@ class ResearchChunk(CustomBaseModel):
     chunk_index: StrictInt
     chunk_type: Optional[StrictStr] = None
     chunk_text: StrictStr
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "deep_research_id", "chunk_index", "chunk_type", "chunk_text", "created_at", "updated_at"]
 
     model_config = {
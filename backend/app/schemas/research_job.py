@@ -12,19 +12,18 @@
 """  # noqa: E501
 
 from __future__ import annotations
-from datetime import datetime
 import pprint
 import re  # noqa: F401
 import json
 
-from pydantic import BaseModel, StrictStr, StrictInt, field_validator, model_validator
+from pydantic import BaseModel, StrictStr, StrictInt, field_validator
 from typing import Any, ClassVar, Dict, List, Optional
 try:
     from typing import Self
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchJob(CustomBaseModel):
     """
@@ -42,8 +41,8 @@ class ResearchJob(CustomBaseModel):
     model_name: StrictStr
     model_params: Optional[Dict[str, Any]] = None
     deep_research_id: Optional[int] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "job_id", "user_id", "owner_user_id", "owner_org_id", "visibility", "status", "service", "model_name", "model_params", "deep_research_id", "created_at", "updated_at"]
 
     @field_validator('status')
@@ -52,8 +51,8 @@ class ResearchJob(CustomBaseModel):
         if value is None:
             return value
 
-        if value not in ('pending_answers', 'running', 'completed', 'failed', 'cancelled'):
-            raise ValueError("must be one of enum values ('pending_answers', 'running', 'completed', 'failed', 'cancelled')")
+        if value not in ('pending_answers', 'running', 'finalizing', 'completed', 'failed', 'cancelled'):
+            raise ValueError("must be one of enum values ('pending_answers', 'running', 'finalizing', 'completed', 'failed', 'cancelled')")
         return value
 
     @field_validator('visibility')
@@ -65,20 +64,6 @@ class ResearchJob(CustomBaseModel):
         if value not in ('private', 'public', 'org'):
             raise ValueError("must be one of enum values ('private', 'public', 'org')")
         return value
-    
-    @model_validator(mode='before')
-    @classmethod
-    def validate_datetimes(cls, data: Dict[str, Any]) -> Dict[str, Any]:
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if isinstance(value, datetime):
-                    data[key] = value.isoformat()
-        else:
-            if hasattr(data, 'created_at') and isinstance(data.created_at, datetime):
-                data.created_at = data.created_at.isoformat()
-            if hasattr(data, 'updated_at') and isinstance(data.updated_at, datetime):
-                data.updated_at = data.updated_at.isoformat()
-        return data
 
     model_config = {
         "populate_by_name": True,
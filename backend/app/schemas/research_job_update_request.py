@@ -41,7 +41,7 @@ class ResearchJobUpdateRequest(CustomBaseModel):
 
     @field_validator("status")
     def validate_status(cls, v):
-        if v is not None and v not in ["pending_answers", "running", "completed", "failed", "cancelled"]:
+        if v is not None and v not in ["pending_answers", "running", "finalizing", "completed", "failed", "cancelled"]:
             raise ValueError("Invalid status")
         return v
     
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchServiceBase(CustomBaseModel):
     """Base schema for research services"""
@@ -17,8 +17,8 @@ class ResearchServiceCreate(ResearchServiceBase):
 class ResearchService(ResearchServiceBase):
     """Schema for a complete research service"""
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     default_model: Optional["AiModelInResearchService"] = None
     # models: Optional[List["AiModelInResearchService"]] = None
     service_models: List["ResearchServiceModel"] = []
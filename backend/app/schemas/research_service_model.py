@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchServiceModelBase(CustomBaseModel):
     """Base schema for research service model relationships"""
@@ -15,8 +15,8 @@ class ResearchServiceModelCreate(ResearchServiceModelBase):
 class ResearchServiceModel(ResearchServiceModelBase):
     """Schema for a complete research service model relationship"""
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     model: "AiModelInResearchService"
 
     model_config = ConfigDict(from_attributes=True)
@@ -9,7 +9,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchSource(CustomBaseModel):
     """
@@ -22,7 +22,7 @@ class ResearchSource(CustomBaseModel):
     source_excerpt: Optional[StrictStr] = None
     domain: Optional[StrictStr] = None
     source_type: Optional[StrictStr] = None
-    created_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "deep_research_id", "source_url", "source_title", "source_excerpt", "domain", "source_type", "created_at"]
 
     model_config = {
@@ -9,7 +9,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class ResearchSummary(CustomBaseModel):
     """
@@ -20,7 +20,7 @@ class ResearchSummary(CustomBaseModel):
     summary_scope: StrictStr
     summary_length: StrictStr
     summary_text: StrictStr
-    created_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "deep_research_id", "summary_scope", "summary_length", "summary_text", "created_at"]
 
     model_config = {
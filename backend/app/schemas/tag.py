@@ -22,7 +22,7 @@ try:
 except ImportError:
     from typing_extensions import Self
 
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class Tag(CustomBaseModel):
     """
@@ -34,7 +34,7 @@ class Tag(CustomBaseModel):
     is_global: Optional[StrictBool] = None
     organization_id: Optional[StrictInt] = None # Only set for non-global tags
     user_id: Optional[StrictInt] = None # Only set for non-global tags
-    created_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "name", "description", "is_global", "organization_id", "user_id", "created_at"]
 
     model_config = {
@@ -22,7 +22,7 @@ except ImportError:
 from datetime import datetime
 from pydantic import BaseModel, model_validator, StrictInt, StrictStr
 from app.schemas.organization_member import OrganizationMember
-from app.schemas._base_model import CustomBaseModel
+from app.schemas._base_model import CustomBaseModel, IsoDateTimeStr
 
 class User(CustomBaseModel):
     """
@@ -37,8 +37,8 @@ class User(CustomBaseModel):
     auth_provider: Optional[StrictStr] = None
     picture_url: Optional[StrictStr] = None
     organization_memberships: Optional[List[OrganizationMember]] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTimeStr] = None
+    updated_at: Optional[IsoDateTimeStr] = None
     __properties: ClassVar[List[str]] = ["id", "external_id", "username", "email", "display_name", "default_role", "auth_provider", "picture_url", "organization_memberships", "created_at", "updated_at"]
 
     model_config = {
@@ -0,0 +1,298 @@
+# backend/app/services/api_keys.py
+"""
+DRKR API keys: issuing, hashing and authenticating them.
+
+Keys look like drkr_<prefix>_<secret>. Only the prefix (unique, indexed) and
+an HMAC-SHA256 of the whole key are stored, so a leaked table doesn't leak
+usable keys; the plaintext is returned once, when the key is created. Keys
+for third-party services are stored as given, since they have to be sent on.
+Keys issued before this scheme have no prefix; hash_legacy_keys() (the
+hash_legacy_api_keys task) replaces their stored plaintext with its HMAC and
+they are then looked up by hash.
+
+Authentication results are cached in Redis by key hash: valid keys for
+API_KEY_CACHE_TTL seconds and unknown, revoked or expired keys for
+API_KEY_NEGATIVE_CACHE_TTL seconds, so clients retrying a bad key don't reach
+Postgres on every request. Revoking a key drops its cache entry; membership
+changes reach key-authenticated requests within API_KEY_CACHE_TTL.
+
+Usage is tracked write-behind: each authenticated request bumps per-key
+counters in Redis, and flush_usage() (run by the flush_api_key_usage beat
+task) moves them into api_keys.request_count/last_used_at in one UPDATE.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy import BigInteger, DateTime, Integer, column, func, select, update, values
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.models import ApiKey, ApiService, User
+from app.services.principal_cache import Membership, Principal
+
+logger = logging.getLogger(__name__)
+
+DRKR_SERVICE_NAME = "DRKR"
+KEY_SCHEME = "drkr"
+# 64 random bits fill token_prefix (VARCHAR(16), unique) and keep collisions out
+# of reach; keys issued before used 8-character prefixes and still authenticate
+PREFIX_LENGTH = 16
+LEGACY_PREFIX_LENGTH = 8
+# Keys from before the drkr_ scheme: secrets.token_urlsafe(64), no prefix
+LEGACY_TOKEN_LENGTH = 86
+URLSAFE_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+INVALID_ENTRY = b"-"
+
+# Redis hashes of key id -> requests since the last flush / last request time
+USAGE_REQUESTS_KEY = "api-key-usage:requests"
+USAGE_LAST_USED_KEY = "api-key-usage:last-used"
+
+invalid_api_key_exception = HTTPException(status_code=401, detail="Invalid or expired API key")
+
+
+def generate_api_key() -> Tuple[str, str]:
+    """Returns a new key and its lookup prefix"""
+    prefix = secrets.token_hex(PREFIX_LENGTH // 2)
+    return f"{KEY_SCHEME}_{prefix}_{secrets.token_urlsafe(48)}", prefix
+
+
+def parse_prefix(token: str) -> Optional[str]:
+    scheme, _, rest = token.partition("_")
+    prefix, _, secret = rest.partition("_")
+    if scheme != KEY_SCHEME or len(prefix) not in (PREFIX_LENGTH, LEGACY_PREFIX_LENGTH) or not secret:
+        return None
+    return prefix
+
+
+def is_legacy_token(token: str) -> bool:
+    return len(token) == LEGACY_TOKEN_LENGTH and parse_prefix(token) is None and set(token) <= URLSAFE_CHARS
+
+
+def hash_api_key(token: str) -> str:
+    secret = (settings.API_KEY_HASH_SECRET or settings.JWT_SECRET_KEY).encode()
+    return hmac.new(secret, token.encode(), hashlib.sha256).hexdigest()
+
+
+def cache_enabled() -> bool:
+    return settings.API_KEY_CACHE_TTL > 0 or settings.API_KEY_NEGATIVE_CACHE_TTL > 0
+
+
+def _cache_key(token_hash: str) -> str:
+    return f"api-key:{token_hash}"
+
+
+def _encode(key_id: int, principal: Principal) -> str:
+    return json.dumps({
+        "key_id": key_id,
+        "id": principal.id,
+        "external_id": principal.external_id,
+        "default_role": principal.default_role,
+        "memberships": [[m.organization_id, m.role] for m in principal.organization_memberships],
+    })
+
+
+def _decode(raw) -> Tuple[int, Principal]:
+    data = json.loads(raw)
+    return data["key_id"], Principal(
+        id=data["id"],
+        external_id=data["external_id"],
+        default_role=data["default_role"],
+        organization_memberships=[Membership(org_id, role) for org_id, role in data["memberships"]]
+    )
+
+
+async def _cache_get(token_hash: str):
+    if not cache_enabled():
+        return None
+    try:
+        return await get_redis().get(_cache_key(token_hash))
+    except RedisError as e:
+        logger.warning(f"API key cache unavailable: {e}")
+        return None
+
+
+async def _cache_set(token_hash: str, value, ttl: int) -> None:
+    if ttl <= 0:
+        return
+    try:
+        await get_redis().set(_cache_key(token_hash), value, ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Could not cache API key lookup: {e}")
+
+
+async def invalidate_api_key(token_hash: Optional[str]) -> None:
+    """Drops the cached lookup of a key. Call after revoking it commits."""
+    if not cache_enabled() or not token_hash:
+        return
+    try:
+        await get_redis().delete(_cache_key(token_hash))
+    except RedisError as e:
+        logger.warning(f"Could not invalidate API key cache: {e}")
+
+
+async def _load_principal(db, api_key: ApiKey) -> Optional[Principal]:
+    """
+    User keys act as their user. Organization keys act as the member who
+    created them, limited to that organization, and stop working once the
+    creator leaves it.
+    """
+    user_id = api_key.user_id or api_key.created_by
+    if user_id is None:
+        return None
+    result = await db.execute(
+        select(User).where(User.id == user_id).options(selectinload(User.organization_memberships))
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    if api_key.organization_id is not None:
+        principal.organization_memberships = [
+            m for m in principal.organization_memberships if m.organization_id == api_key.organization_id
+        ]
+        if not principal.organization_memberships:
+            return None
+    return principal
+
+
+async def authenticate_api_key(db, token: str) -> Principal:
+    """Returns the principal a DRKR API key acts as, or raises 401"""
+    prefix = parse_prefix(token)
+    if prefix is None and not is_legacy_token(token):
+        raise invalid_api_key_exception
+    token_hash = hash_api_key(token)
+
+    cached = await _cache_get(token_hash)
+    if cached == INVALID_ENTRY:
+        raise invalid_api_key_exception
+    if cached is not None:
+        key_id, principal = _decode(cached)
+        await record_usage(key_id)
+        return principal
+
+    if prefix is not None:
+        stmt = select(ApiKey).where(ApiKey.token_prefix == prefix)
+    else:
+        stmt = select(ApiKey).where(ApiKey.token_prefix.is_(None), ApiKey.token_hash == token_hash)
+    result = await db.execute(stmt)
+    api_key = result.scalar_one_or_none()
+    now = datetime.utcnow()
+    principal = None
+    if (
+        api_key is not None
+        and api_key.is_active
+        and (api_key.expires_at is None or api_key.expires_at > now)
+        and hmac.compare_digest(api_key.token_hash or "", token_hash)
+    ):
+        principal = await _load_principal(db, api_key)
+
+    if principal is None:
+        await _cache_set(token_hash, INVALID_ENTRY, settings.API_KEY_NEGATIVE_CACHE_TTL)
+        raise invalid_api_key_exception
+
+    ttl = settings.API_KEY_CACHE_TTL
+    if api_key.expires_at is not None:
+        ttl = min(ttl, int((api_key.expires_at - now).total_seconds()))
+    await _cache_set(token_hash, _encode(api_key.id, principal), ttl)
+    await record_usage(api_key.id)
+    return principal
+
+
+async def record_usage(key_id: int) -> None:
+    """Counts a request made with the key; flush_usage() persists the counters"""
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.hincrby(USAGE_REQUESTS_KEY, key_id, 1)
+            pipe.hset(USAGE_LAST_USED_KEY, key_id, time.time())
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not record usage of API key {key_id}: {e}")
+
+
+# Moves the live counters aside so requests during a flush start new ones. A
+# batch left over from a failed flush is retried before taking a new one.
+_TAKE_USAGE_BATCH = """
+if redis.call('EXISTS', KEYS[3]) == 0 and redis.call('EXISTS', KEYS[4]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 1 then redis.call('RENAME', KEYS[1], KEYS[3]) end
+    if redis.call('EXISTS', KEYS[2]) == 1 then redis.call('RENAME', KEYS[2], KEYS[4]) end
+end
+return {redis.call('HGETALL', KEYS[3]), redis.call('HGETALL', KEYS[4])}
+"""
+
+
+def _pairs(flat) -> Dict[int, str]:
+    return {int(flat[i]): flat[i + 1] for i in range(0, len(flat), 2)}
+
+
+def flush_usage(session, client) -> int:
+    """
+    Writes the usage counted in Redis to api_keys with one UPDATE ... FROM
+    (VALUES ...) and commits. Sync, for the Celery beat task. Returns the
+    number of keys updated.
+    """
+    batch_keys = [
+        USAGE_REQUESTS_KEY,
+        USAGE_LAST_USED_KEY,
+        f"{USAGE_REQUESTS_KEY}:flushing",
+        f"{USAGE_LAST_USED_KEY}:flushing",
+    ]
+    requests_flat, last_used_flat = client.eval(_TAKE_USAGE_BATCH, len(batch_keys), *batch_keys)
+    requests = _pairs(requests_flat)
+    last_used = _pairs(last_used_flat)
+    key_ids = sorted(set(requests) | set(last_used))
+    if key_ids:
+        usage = values(
+            column("id", Integer),
+            column("requests", BigInteger),
+            column("last_used_at", DateTime),
+            name="usage"
+        ).data([
+            (
+                key_id,
+                int(requests.get(key_id, 0)),
+                datetime.utcfromtimestamp(float(last_used[key_id])) if key_id in last_used else None
+            )
+            for key_id in key_ids
+        ])
+        session.execute(
+            update(ApiKey)
+            .where(ApiKey.id == usage.c.id)
+            .values(
+                request_count=ApiKey.request_count + usage.c.requests,
+                # GREATEST skips NULLs, so keys without a timestamp keep theirs
+                last_used_at=func.greatest(ApiKey.last_used_at, usage.c.last_used_at)
+            )
+        )
+        session.commit()
+    # Only once the counts are committed; a failed flush is retried next run
+    client.delete(*batch_keys[2:])
+    return len(key_ids)
+
+
+def hash_legacy_keys(session) -> int:
+    """
+    Replaces the plaintext of DRKR keys issued before hashing with their HMAC,
+    so they authenticate by hash, and commits. Sync, for the
+    hash_legacy_api_keys task. Returns the number of keys hashed.
+    """
+    api_keys = session.execute(
+        select(ApiKey)
+        .join(ApiService, ApiKey.api_service_id == ApiService.id)
+        .where(ApiService.name == DRKR_SERVICE_NAME, ApiKey.token.is_not(None), ApiKey.token_hash.is_(None))
+        .with_for_update(of=ApiKey)
+    ).scalars().all()
+    for api_key in api_keys:
+        api_key.token_hash = hash_api_key(api_key.token)
+        api_key.token = None
+    session.commit()
+    return len(api_keys)
@@ -1,24 +1,35 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import OAuth2AuthorizationCodeBearer, APIKeyHeader
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
 import json
-import httpx
-from functools import lru_cache
+import time
 from authlib.jose import JsonWebEncryption
 
 from app.db import get_db
-from app.models import User, ApiKey
+from app.models import User
 from app.config import settings
+from app.services.api_keys import authenticate_api_key
+from app.services.jwks import jwks_manager
+from app.services.principal_cache import (
+    Principal,
+    cache_enabled as principal_cache_enabled,
+    get_cached_principal,
+    store_principal
+)
 
 # OAuth2 configuration
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
     authorizationUrl=f"https://{settings.AUTH0_DOMAIN}/authorize",
-    tokenUrl=f"https://{settings.AUTH0_DOMAIN}/oath/token"
+    tokenUrl=f"https://{settings.AUTH0_DOMAIN}/oath/token",
+    # Requests without a bearer token may authenticate with X-API-Key instead
+    auto_error=False
 )
 
 # API Key header
@@ -33,13 +44,43 @@ credentials_exception = HTTPException(
 # Create an instance of the JWE handler
 jwe = JsonWebEncryption()
 
-# Fetch and cache JWKS (JSON Web Key Set) from Auth0
-@lru_cache(maxsize=1)
-def get_jwks():
-    url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-    response = httpx.get(url)
-    response.raise_for_status()
-    return response.json()
+class VerifiedTokenCache:
+    """
+    LRU of tokens that passed verification, keyed by a hash of the token and
+    audience, so repeat requests with the same bearer token skip decryption
+    and signature checks. Entries are only returned until the token's exp.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def key(token: str, audience: Optional[str]) -> str:
+        return hashlib.sha256(f"{audience}\x1f{token}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, key: str, claims: Dict[str, Any]) -> None:
+        if self.maxsize <= 0 or "exp" not in claims:
+            return
+        self._entries[key] = (float(claims["exp"]), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+verified_tokens = VerifiedTokenCache(settings.VERIFIED_TOKEN_CACHE_SIZE)
 
 async def create_jwt_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT token with claims and expiration"""
@@ -56,7 +97,12 @@ async def create_jwt_token(data: Dict[str, Any], expires_delta: Optional[timedel
 async def verify_jwt_token(token: str, audience: str = None):
     """
     Verify a JWT token using RS256. Since RS256 uses a public key, we need to fetch a public key from a JWKS endpoint.
+    Tokens that verified before are answered from verified_tokens until they expire.
     """
+    cache_key = VerifiedTokenCache.key(token, audience)
+    claims = verified_tokens.get(cache_key)
+    if claims is not None:
+        return claims
     try:
         # Get the key ID (kid) from the token header
         unverified_header = jwt.get_unverified_header(token)
@@ -79,10 +125,10 @@ async def verify_jwt_token(token: str, audience: str = None):
         if kid is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        # Fetch JWKS
-        jwks = get_jwks()
         # Find the matching key in JWKS
-        rsa_key = next(key for key in jwks["keys"] if key["kid"] == kid)
+        rsa_key = await jwks_manager.get_key(kid)
+        if rsa_key is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
         
         # Verify and decode the token
         payload = jwt.decode(
@@ -93,6 +139,7 @@ async def verify_jwt_token(token: str, audience: str = None):
             # audience=settings.AUTH0_CLIENT_ID,
             issuer=f"https://{settings.AUTH0_DOMAIN}/"
         )
+        verified_tokens.put(cache_key, payload)
         return payload
     except jwt.ExpiredSignatureError:
         import traceback
@@ -112,10 +159,19 @@ async def verify_jwt_token(token: str, audience: str = None):
     return payload
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    token: Optional[str] = Depends(oauth2_scheme),
+    api_key: Optional[str] = Security(api_key_header),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get the current user from a JWT token"""
+) -> Principal:
+    """
+    Get the current user from a JWT token, or from a DRKR API key when no token
+    is sent, as the Principal authorization checks need. Principals are cached
+    for PRINCIPAL_CACHE_TTL seconds.
+    """
+    if not token:
+        if api_key:
+            return await authenticate_api_key(db, api_key)
+        raise credentials_exception
     
     try:
         payload = await verify_jwt_token(token)
@@ -127,10 +183,29 @@ async def get_current_user(
         raise credentials_exception
     if external_id is None:
         raise credentials_exception
+    
+    generation = None
+    if principal_cache_enabled():
+        principal, generation = await get_cached_principal(external_id)
+        if principal is not None:
+            return principal
         
     query = select(User).where(User.external_id == external_id).options(selectinload(User.organization_memberships))
     user = await db.execute(query)
     user = user.scalar_one_or_none()
+    if user is None:
+        raise credentials_exception
+    principal = Principal.from_user(user)
+    if generation is not None:
+        await store_principal(principal, generation)
+    return principal
+
+async def get_current_user_record(
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get the full users row of the current user, for endpoints that read or edit the profile"""
+    user = await db.get(User, current_user.id)
     if user is None:
         raise credentials_exception
     return user
@@ -179,21 +254,8 @@ async def create_user_if_not_exists(
 async def verify_api_key(
     api_key: str = Security(api_key_header),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Verify an API key and return the associated user"""
+) -> Principal:
+    """Verify an API key and return the principal it acts as"""
     if not api_key:
         raise HTTPException(status_code=401, detail="API key is required")
-        
-    query = select(ApiKey).where(
-        ApiKey.key == api_key,
-        ApiKey.is_active == True,
-        ApiKey.expires_at > datetime.utcnow()
-    )
-    db_api_key = await db.execute(query)
-    db_api_key = db_api_key.scalar_one_or_none()
-    
-    if not db_api_key:
-        raise HTTPException(status_code=401, detail="Invalid or expired API key")
-        
-    return db_api_key.user
-
+    return await authenticate_api_key(db, api_key)
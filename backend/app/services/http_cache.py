@@ -0,0 +1,57 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+from app.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given version parts (or raw response bytes)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an If-None-Match header against our ETag. GET uses the weak
+    comparison, so a W/ prefix added by an intermediary still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cache_control_for(visibility: str) -> str:
+    """
+    Public items may be stored by shared caches. Anything else is private and
+    must be revalidated with the ETag before reuse.
+    """
+    if visibility == "public":
+        return f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}"
+    return "private, no-cache"
+
+
+def set_cache_headers(response: Response, etag: str, visibility: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control_for(visibility)
+    if visibility != "public":
+        # Whether the item can be seen at all depends on who is asking
+        response.headers["Vary"] = "Authorization, Cookie"
+
+
+def not_modified(etag: str, visibility: str) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, visibility)
+    return response
@@ -0,0 +1,270 @@
+# backend/app/services/job_events.py
+"""
+Research job progress events, streamed to clients as Server-Sent Events.
+
+Events are appended to a capped Redis stream per job, so a reconnecting
+client can resume after the id it last saw (Last-Event-ID), and announced on
+one pub/sub channel. Each API process holds a single subscription to that
+channel (JobEventHub) and fans events out to the SSE streams it serves, so
+idle watchers cost a queue each rather than a polling request.
+
+Two kinds of events are published:
+  * status: the job (ResearchJob JSON) after its status changed
+  * stage:  an ingestion task of the job's research item started, finished
+            or failed ({"research_id", "stage", "status"}), from Celery
+"""
+
+import asyncio
+import json
+import logging
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "research-job-events"
+# Events kept per job for resuming, and for how long after the last one
+STREAM_MAXLEN = 200
+STREAM_TTL = 86400
+# Events a slow client may fall behind by before it misses live ones
+QUEUE_SIZE = 256
+CLOSING_STATUSES = ("failed", "cancelled")
+
+_EVENT_ID = re.compile(r"^\d+-\d+$")
+
+# Appends to the job's stream and announces the event in one round trip
+_PUBLISH = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'event', ARGV[2], 'data', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('PUBLISH', ARGV[5], cjson.encode({job = tonumber(ARGV[6]), id = id, event = ARGV[2], data = ARGV[3]}))
+return id
+"""
+
+
+def _stream_key(job_pk: int) -> str:
+    return f"research-job-events:{job_pk}"
+
+
+def _research_key(research_id: int) -> str:
+    return f"research-job-of:{research_id}"
+
+
+def _publish_args(job_pk: int, event: str, data: str) -> list:
+    return [_PUBLISH, 1, _stream_key(job_pk), STREAM_MAXLEN, event, data, STREAM_TTL, EVENTS_CHANNEL, job_pk]
+
+
+async def publish_job_event(job_pk: int, event: str, data: str) -> None:
+    try:
+        await get_redis().eval(*_publish_args(job_pk, event, data))
+    except RedisError as e:
+        logger.warning(f"Could not publish {event} event for research job {job_pk}: {e}")
+
+
+def publish_job_event_sync(client, job_pk: int, event: str, data: str) -> None:
+    """publish_job_event for Celery tasks, with their sync Redis client"""
+    try:
+        client.eval(*_publish_args(job_pk, event, data))
+    except RedisError as e:
+        logger.warning(f"Could not publish {event} event for research job {job_pk}: {e}")
+
+
+async def link_research(job_pk: int, research_id: int) -> None:
+    """Routes ingestion-stage events of a research item to the job that produced it"""
+    try:
+        await get_redis().set(_research_key(research_id), job_pk, ex=STREAM_TTL)
+    except RedisError as e:
+        logger.warning(f"Could not link research {research_id} to job {job_pk}: {e}")
+
+
+def link_research_sync(client, job_pk: int, research_id: int) -> None:
+    """link_research for Celery tasks, with their sync Redis client"""
+    try:
+        client.set(_research_key(research_id), job_pk, ex=STREAM_TTL)
+    except RedisError as e:
+        logger.warning(f"Could not link research {research_id} to job {job_pk}: {e}")
+
+
+def job_of_research_sync(client, research_id: int) -> Optional[int]:
+    job_pk = client.get(_research_key(research_id))
+    return int(job_pk) if job_pk else None
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _entry_to_event(entry_id, fields: Dict) -> Dict:
+    fields = {_text(key): _text(value) for key, value in fields.items()}
+    return {"id": _text(entry_id), "event": fields["event"], "data": fields["data"]}
+
+
+async def read_events(job_pk: int, after: str) -> List[Dict]:
+    """Stored events of a job newer than the given event id"""
+    entries = await get_redis().xrange(_stream_key(job_pk), min=f"({after}", max="+")
+    return [_entry_to_event(entry_id, fields) for entry_id, fields in entries]
+
+
+async def latest_event_id(job_pk: int) -> Optional[str]:
+    entries = await get_redis().xrevrange(_stream_key(job_pk), count=1)
+    return _text(entries[0][0]) if entries else None
+
+
+def _newer(event_id: str, last_id: Optional[str]) -> bool:
+    if last_id is None:
+        return True
+    return tuple(map(int, event_id.split("-"))) > tuple(map(int, last_id.split("-")))
+
+
+def format_event(event: Dict) -> str:
+    lines = []
+    if event.get("id"):
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {event['data']}")
+    return "\n".join(lines) + "\n\n"
+
+
+class JobEventHub:
+    """One pub/sub subscription per process, fanned out to local SSE streams"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _dispatch(self, raw) -> None:
+        event = json.loads(raw)
+        for queue in self._subscribers.get(event["job"], ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping event {event['id']} for a slow watcher of research job {event['job']}")
+
+    def _resync(self) -> None:
+        # Events published while we weren't subscribed are only in the streams
+        for queues in self._subscribers.values():
+            for queue in queues:
+                try:
+                    queue.put_nowait({"resync": True})
+                except asyncio.QueueFull:
+                    pass
+
+    async def _listen(self) -> None:
+        reconnecting = False
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                if reconnecting:
+                    self._resync()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self._dispatch(message["data"])
+            except RedisError as e:
+                logger.warning(f"Research job event subscription lost: {e}")
+            finally:
+                await pubsub.aclose()
+            reconnecting = True
+            await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @asynccontextmanager
+    async def subscribe(self, job_pk: int) -> AsyncIterator[asyncio.Queue]:
+        self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(job_pk, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(job_pk)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[job_pk]
+
+
+job_event_hub = JobEventHub()
+
+
+def _closes_stream(event: Dict) -> bool:
+    return event["event"] == "status" and json.loads(event["data"]).get("status") in CLOSING_STATUSES
+
+
+async def job_event_stream(
+    request: Request,
+    job_pk: int,
+    snapshot: str,
+    status: str,
+    last_event_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    SSE body for one job: the events after last_event_id, or the job as it is
+    now, then live events with a comment line every SSE_HEARTBEAT_INTERVAL
+    seconds. Ends when the job fails or is cancelled, the client goes away,
+    or after SSE_MAX_DURATION seconds, when the client reconnects and resumes.
+    """
+    if last_event_id and not _EVENT_ID.match(last_event_id):
+        last_event_id = None
+
+    async with job_event_hub.subscribe(job_pk) as queue:
+        yield "retry: 3000\n\n"
+        last_id = last_event_id
+        try:
+            if last_id:
+                for event in await read_events(job_pk, last_id):
+                    last_id = event["id"]
+                    yield format_event(event)
+                    if _closes_stream(event):
+                        return
+            else:
+                last_id = await latest_event_id(job_pk)
+                yield format_event({"id": last_id, "event": "status", "data": snapshot})
+                if status in CLOSING_STATUSES:
+                    return
+        except RedisError as e:
+            logger.warning(f"Could not read events of research job {job_pk}: {e}")
+            yield format_event({"event": "status", "data": snapshot})
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SSE_MAX_DURATION
+        while loop.time() < deadline:
+            if await request.is_disconnected():
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            events = [event]
+            if event.get("resync"):
+                try:
+                    events = await read_events(job_pk, last_id or "0-0")
+                except RedisError:
+                    events = []
+            for event in events:
+                if not _newer(event["id"], last_id):
+                    continue
+                last_id = event["id"]
+                yield format_event(event)
+                if _closes_stream(event):
+                    return
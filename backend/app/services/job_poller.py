@@ -0,0 +1,190 @@
+# backend/app/services/job_poller.py
+"""
+Background poller for active research jobs.
+
+One API process at a time (whichever holds the leader lock in Redis) polls
+every research job that isn't in a final state or waiting for the user's
+answers, writes status changes to
+Postgres through ResearchService.apply_status (which queues storing the
+results of completed jobs), and records the fetched status in Redis
+(app.services.job_status). Clients reading a job then get the stored row
+instead of each triggering their own upstream request, so upstream load
+follows the number of active jobs rather than the number of viewers.
+
+Each job is polled every RESEARCH_JOB_POLL_MIN_INTERVAL seconds after its
+status changes, backing off by doubling up to RESEARCH_JOB_POLL_MAX_INTERVAL
+while it stays the same; jobs of services that send status webhooks are only
+polled every RESEARCH_JOB_POLL_MAX_INTERVAL seconds. Jobs of a service with a
+batch status endpoint are fetched in one call per tick. Keep RESEARCH_JOB_POLL_MAX_INTERVAL below
+RESEARCH_JOB_STATUS_STALE_AFTER, or clients fall back to polling themselves
+between the poller's checks.
+
+The leader lock is renewed before each service's batch, and each batch's
+fetch is cut off after half of LEADER_TIMEOUT, so a slow service can't hold up
+a tick until the lock expires and a second process starts polling too.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+from redis.exceptions import LockError, RedisError
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.db.database import AsyncSessionLocal
+from app.models import ResearchJob
+from app.services.job_status import AWAITING_ANSWERS, UNPOLLED_STATUSES, record_job_status
+from app.services.research import ResearchService
+from app.services.webhooks import webhooks_enabled
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "research-job-poller:leader"
+# Seconds the leader lock lasts without being renewed
+LEADER_TIMEOUT = 30
+TICK_SECONDS = 1.0
+# Services poll_status knows how to poll
+POLLED_SERVICES = ("open-dr",)
+
+
+class JobPoller:
+    def __init__(self, research_service: ResearchService):
+        self.research_service = research_service
+        # job id -> (monotonic time of the next poll, current interval)
+        self._schedule: Dict[int, Tuple[float, float]] = {}
+        self._leader = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _due(self, job_pk: int, now: float) -> bool:
+        next_poll_at, _ = self._schedule.get(job_pk, (0.0, 0.0))
+        return next_poll_at <= now
+
+    def _reschedule(self, job_pk: int, changed: bool, now: float, webhooks: bool = False) -> None:
+        _, interval = self._schedule.get(job_pk, (0.0, 0.0))
+        if webhooks:
+            # The service reports changes itself; polling only catches lost deliveries
+            interval = settings.RESEARCH_JOB_POLL_MAX_INTERVAL
+        elif changed or not interval:
+            interval = settings.RESEARCH_JOB_POLL_MIN_INTERVAL
+        else:
+            interval = min(interval * 2, settings.RESEARCH_JOB_POLL_MAX_INTERVAL)
+        self._schedule[job_pk] = (now + interval, interval)
+
+    async def _poll_service(self, db, service: str, jobs: List[ResearchJob]) -> int:
+        now = time.monotonic()
+        try:
+            statuses = await asyncio.wait_for(
+                self.research_service.fetch_statuses(db, service, jobs),
+                timeout=LEADER_TIMEOUT / 2
+            )
+        except (HTTPException, httpx.HTTPError, asyncio.TimeoutError) as e:
+            logger.warning(f"Polling {len(jobs)} {service} jobs failed: {e}")
+            statuses = {}
+
+        polled = 0
+        webhooks = webhooks_enabled(service)
+        for job in jobs:
+            previous_status = job.status
+            result = statuses.get(job.id)
+            if result is not None:
+                try:
+                    await self.research_service.apply_status(db, job, result)
+                except Exception as e:
+                    logger.error(f"Could not store status of research job {job.id}: {e}")
+                    await db.rollback()
+                else:
+                    await record_job_status(job.id, job.status)
+                    polled += 1
+            self._reschedule(job.id, job.status != previous_status, now, webhooks)
+        return polled
+
+    async def poll_once(self) -> int:
+        """Polls the active jobs that are due; returns how many were updated"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ResearchJob).where(
+                    ResearchJob.status.not_in(UNPOLLED_STATUSES + (AWAITING_ANSWERS,)),
+                    ResearchJob.service.in_(POLLED_SERVICES)
+                )
+            )
+            jobs = result.scalars().all()
+
+            active = {job.id for job in jobs}
+            for job_pk in list(self._schedule):
+                if job_pk not in active:
+                    del self._schedule[job_pk]
+
+            now = time.monotonic()
+            by_service: Dict[str, List[ResearchJob]] = {}
+            for job in jobs:
+                if self._due(job.id, now):
+                    by_service.setdefault(job.service, []).append(job)
+
+            polled = 0
+            for service, service_jobs in by_service.items():
+                if not await self._renew_leadership():
+                    break
+                polled += await self._poll_service(db, service, service_jobs)
+            return polled
+
+    async def _renew_leadership(self) -> bool:
+        """Extends the leader lock before more work; False if it was lost"""
+        if self._leader is None:
+            return True
+        try:
+            await self._leader.reacquire()
+            return True
+        except (LockError, RedisError) as e:
+            logger.warning(f"Research job poller lost its leader lock: {e}")
+            return False
+
+    async def _is_leader(self) -> bool:
+        try:
+            if self._leader is None:
+                self._leader = get_redis().lock(LEADER_KEY, timeout=LEADER_TIMEOUT)
+            if await self._leader.owned():
+                await self._leader.reacquire()
+                return True
+            return await self._leader.acquire(blocking=False)
+        except (LockError, RedisError) as e:
+            logger.warning(f"Research job poller lost its leader lock: {e}")
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self._is_leader():
+                    await self.poll_once()
+                else:
+                    # Another process polls; start over if we take over later
+                    self._schedule.clear()
+            except Exception as e:
+                logger.error(f"Research job poller tick failed: {e}")
+            await asyncio.sleep(TICK_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._leader is not None:
+            try:
+                if await self._leader.owned():
+                    await self._leader.release()
+            except (LockError, RedisError):
+                pass
+
+
+job_poller = JobPoller(ResearchService())
@@ -0,0 +1,57 @@
+# backend/app/services/job_status.py
+"""
+Last known upstream status of active research jobs, kept in Redis.
+
+The job poller (app.services.job_poller) records every status it fetches
+here, after writing changes to research_jobs. poll_status answers from the
+database while the job's entry is fresh and only asks the service itself when
+the poller hasn't checked the job recently, e.g. because it isn't running.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+# Set once the service reports completion, while research.finalize_job stores the results
+FINALIZING = "finalizing"
+# Statuses the service has nothing more to report on
+UNPOLLED_STATUSES = FINAL_STATUSES + (FINALIZING,)
+# Waiting for the user to answer follow-up questions, not for the service;
+# answer_questions stores the status the service moves on to
+AWAITING_ANSWERS = "pending_answers"
+
+
+def _key(job_pk: int) -> str:
+    return f"research-job-status:{job_pk}"
+
+
+async def record_job_status(job_pk: int, status: str) -> None:
+    entry = json.dumps({"status": status, "checked_at": time.time()})
+    try:
+        await get_redis().set(_key(job_pk), entry, ex=max(1, int(settings.RESEARCH_JOB_STATUS_STALE_AFTER)))
+    except RedisError as e:
+        logger.warning(f"Could not record status of research job {job_pk}: {e}")
+
+
+async def get_job_status(job_pk: int) -> Optional[Dict]:
+    """The recorded status of a job if it was checked within RESEARCH_JOB_STATUS_STALE_AFTER"""
+    try:
+        raw = await get_redis().get(_key(job_pk))
+    except RedisError as e:
+        logger.warning(f"Research job status cache unavailable: {e}")
+        return None
+    if raw is None:
+        return None
+    entry = json.loads(raw)
+    if time.time() - entry["checked_at"] > settings.RESEARCH_JOB_STATUS_STALE_AFTER:
+        return None
+    return entry
@@ -0,0 +1,81 @@
+# backend/app/services/jwks.py
+"""
+Auth0 signing keys (JWKS), fetched asynchronously and kept fresh.
+
+The key set is refreshed in the background every JWKS_REFRESH_INTERVAL
+seconds while the app runs, and again whenever a token names a kid we don't
+know, which is how a key rotation first shows up. Unknown-kid refreshes are
+throttled to one per JWKS_MIN_REFRESH_INTERVAL so that tokens with made-up
+kids can't turn into a stream of requests to Auth0.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JwksManager:
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _fetch(self) -> None:
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(self.url)
+        response.raise_for_status()
+        self._keys = {key["kid"]: key for key in response.json()["keys"]}
+        self._fetched_at = time.monotonic()
+
+    async def refresh(self, min_age: float = 0) -> None:
+        """Fetches the key set unless it was fetched less than min_age seconds ago"""
+        fetched_at = self._fetched_at
+        async with self._lock:
+            # Someone else refreshed while we waited for the lock
+            if self._fetched_at != fetched_at and self._keys:
+                return
+            if self._keys and time.monotonic() - self._fetched_at < min_age:
+                return
+            await self._fetch()
+
+    async def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        """Returns the JWK for kid, refreshing the key set once if it's unknown"""
+        key = self._keys.get(kid)
+        if key is None:
+            await self.refresh(min_age=settings.JWKS_MIN_REFRESH_INTERVAL)
+            key = self._keys.get(kid)
+        return key
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                # Keep serving the keys we have; tokens with a new kid still trigger a fetch
+                logger.warning(f"JWKS refresh from {self.url} failed: {e}")
+            await asyncio.sleep(settings.JWKS_REFRESH_INTERVAL)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+jwks_manager = JwksManager(f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json")
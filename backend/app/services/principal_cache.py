@@ -0,0 +1,138 @@
+# backend/app/services/principal_cache.py
+"""
+Redis cache of authenticated principals, so that resolving the current user
+doesn't cost a users + organization_members round trip on every request.
+
+A principal carries what authorization checks read: the user id, the
+default role and the set of organization memberships. Entries are keyed by
+the external id from the token's sub and tagged with a per-user generation
+that is read in the same round trip. Writes that change memberships or the
+user bump the generation after they commit, which makes every entry loaded
+before the write stale, even one stored by a request that raced the write.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+GENERATION_TTL = 86400
+
+
+@dataclass(frozen=True)
+class Membership:
+    organization_id: int
+    role: str
+
+
+@dataclass
+class Principal:
+    """
+    The authenticated user as seen by authorization checks. Endpoints that
+    need the full users row depend on get_current_user_record instead.
+    """
+    id: int
+    external_id: str
+    default_role: str
+    organization_memberships: List[Membership] = field(default_factory=list)
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            external_id=user.external_id,
+            default_role=user.default_role,
+            organization_memberships=[
+                Membership(m.organization_id, m.role) for m in user.organization_memberships
+            ]
+        )
+
+
+def cache_enabled() -> bool:
+    return settings.PRINCIPAL_CACHE_TTL > 0
+
+
+def _entry_key(external_id: str) -> str:
+    return f"principal:{external_id}"
+
+
+def _generation_key(external_id: str) -> str:
+    return f"principal:{external_id}:gen"
+
+
+def _encode(principal: Principal, generation: int) -> str:
+    return json.dumps({
+        "gen": generation,
+        "id": principal.id,
+        "default_role": principal.default_role,
+        "memberships": [[m.organization_id, m.role] for m in principal.organization_memberships],
+    })
+
+
+def _decode(external_id: str, raw) -> Tuple[int, Principal]:
+    data = json.loads(raw)
+    principal = Principal(
+        id=data["id"],
+        external_id=external_id,
+        default_role=data["default_role"],
+        organization_memberships=[Membership(org_id, role) for org_id, role in data["memberships"]]
+    )
+    return data["gen"], principal
+
+
+async def get_cached_principal(external_id: str) -> Tuple[Optional[Principal], Optional[int]]:
+    """
+    Returns the cached principal, or None with the current generation to pass
+    to store_principal after loading it. The generation is None when Redis is
+    unavailable, in which case nothing should be stored.
+    """
+    try:
+        raw, generation = await get_redis().mget(_entry_key(external_id), _generation_key(external_id))
+    except RedisError as e:
+        logger.warning(f"Principal cache unavailable: {e}")
+        return None, None
+    generation = int(generation or 0)
+    if raw is not None:
+        entry_generation, principal = _decode(external_id, raw)
+        if entry_generation == generation:
+            return principal, generation
+    return None, generation
+
+
+async def store_principal(principal: Principal, generation: int) -> None:
+    try:
+        await get_redis().set(
+            _entry_key(principal.external_id),
+            _encode(principal, generation),
+            ex=settings.PRINCIPAL_CACHE_TTL
+        )
+    except RedisError as e:
+        logger.warning(f"Could not cache principal {principal.id}: {e}")
+
+
+async def invalidate_principals(db, *user_ids: int) -> None:
+    """
+    Drops the cached principals of the given users. Call after the write that
+    changed their memberships or account commits.
+    """
+    if not cache_enabled() or not user_ids:
+        return
+    result = await db.execute(select(User.external_id).where(User.id.in_(user_ids)))
+    external_ids = result.scalars().all()
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for external_id in external_ids:
+                pipe.incr(_generation_key(external_id))
+                pipe.expire(_generation_key(external_id), GENERATION_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not invalidate principals for users {user_ids}: {e}")
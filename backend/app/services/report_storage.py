@@ -0,0 +1,274 @@
+# backend/app/services/report_storage.py
+"""
+Out-of-row storage for the large text bodies of research items.
+
+With REPORT_STORAGE_MODE set to "database" or "disk", prompt_text and
+final_report of items above REPORT_STORAGE_THRESHOLD are zstd-compressed into
+a ContentStore and the inline columns on deep_research are left empty, which
+keeps the rows small. body_storage on the row records which store holds the
+bodies, so changing the mode later doesn't strand existing items.
+
+Bodies are only loaded when a response or task actually needs them:
+hydrate_bodies() fetches them for a batch of items and sets them on the ORM
+objects as committed values, so hydrated objects are not marked dirty.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import zstandard
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.config import settings
+from app.models import DeepResearch, ResearchContent
+
+logger = logging.getLogger(__name__)
+
+BODY_FIELDS = ("prompt_text", "final_report")
+CODEC = "zstd"
+
+ContentKey = Tuple[int, str]
+
+
+def compress(text: str) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.REPORT_COMPRESSION_LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress(blob: bytes) -> str:
+    return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+
+
+class ContentStore:
+    """
+    Storage backend for compressed bodies keyed by (research id, field).
+    Sync methods take a Session, async ones an AsyncSession; backends that
+    don't live in the database ignore it.
+    """
+    name: str
+
+    def put(self, session, research_id: int, field: str, blob: bytes, original_size: int) -> None:
+        raise NotImplementedError
+
+    def get_many(self, session, research_ids: List[int]) -> Dict[ContentKey, bytes]:
+        raise NotImplementedError
+
+    def delete(self, session, research_id: int) -> None:
+        raise NotImplementedError
+
+    async def aput(self, db, research_id: int, field: str, blob: bytes, original_size: int) -> None:
+        raise NotImplementedError
+
+    async def aget_many(self, db, research_ids: List[int]) -> Dict[ContentKey, bytes]:
+        raise NotImplementedError
+
+    async def adelete(self, db, research_id: int) -> None:
+        raise NotImplementedError
+
+
+class DatabaseContentStore(ContentStore):
+    """Bodies in the research_contents table, written in the caller's transaction"""
+    name = "database"
+
+    def _upsert(self, research_id: int, field: str, blob: bytes, original_size: int):
+        stmt = pg_insert(ResearchContent).values(
+            deep_research_id=research_id,
+            field=field,
+            codec=CODEC,
+            data=blob,
+            original_size=original_size
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[ResearchContent.deep_research_id, ResearchContent.field],
+            set_={
+                "codec": stmt.excluded.codec,
+                "data": stmt.excluded.data,
+                "original_size": stmt.excluded.original_size
+            }
+        )
+
+    def _select(self, research_ids: List[int]):
+        return select(
+            ResearchContent.deep_research_id,
+            ResearchContent.field,
+            ResearchContent.data
+        ).where(ResearchContent.deep_research_id.in_(research_ids))
+
+    def put(self, session, research_id, field, blob, original_size):
+        session.execute(self._upsert(research_id, field, blob, original_size))
+
+    def get_many(self, session, research_ids):
+        result = session.execute(self._select(research_ids))
+        return {(row.deep_research_id, row.field): row.data for row in result}
+
+    def delete(self, session, research_id):
+        # Rows go away with the research item through ON DELETE CASCADE
+        pass
+
+    async def aput(self, db, research_id, field, blob, original_size):
+        await db.execute(self._upsert(research_id, field, blob, original_size))
+
+    async def aget_many(self, db, research_ids):
+        result = await db.execute(self._select(research_ids))
+        return {(row.deep_research_id, row.field): row.data for row in result}
+
+    async def adelete(self, db, research_id):
+        pass
+
+
+class DiskContentStore(ContentStore):
+    """Bodies as files under REPORT_STORAGE_PATH, sharded by research id"""
+    name = "disk"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _dir(self, research_id: int) -> str:
+        return os.path.join(self.root, f"{research_id % 1000:03d}", str(research_id))
+
+    def _path(self, research_id: int, field: str) -> str:
+        return os.path.join(self._dir(research_id), f"{field}.{CODEC}")
+
+    def put(self, session, research_id, field, blob, original_size):
+        path = self._path(research_id, field)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+    def get_many(self, session, research_ids):
+        blobs = {}
+        for research_id in research_ids:
+            for field in BODY_FIELDS:
+                path = self._path(research_id, field)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        blobs[(research_id, field)] = f.read()
+        return blobs
+
+    def delete(self, session, research_id):
+        for field in BODY_FIELDS:
+            try:
+                os.remove(self._path(research_id, field))
+            except FileNotFoundError:
+                pass
+
+    async def aput(self, db, research_id, field, blob, original_size):
+        await asyncio.to_thread(self.put, None, research_id, field, blob, original_size)
+
+    async def aget_many(self, db, research_ids):
+        return await asyncio.to_thread(self.get_many, None, research_ids)
+
+    async def adelete(self, db, research_id):
+        await asyncio.to_thread(self.delete, None, research_id)
+
+
+def get_content_store(name: Optional[str] = None) -> Optional[ContentStore]:
+    """
+    Returns the named store, or the one configured by REPORT_STORAGE_MODE.
+    None means bodies are stored inline.
+    """
+    name = name or settings.REPORT_STORAGE_MODE
+    if name == "inline":
+        return None
+    if name == DatabaseContentStore.name:
+        return DatabaseContentStore()
+    if name == DiskContentStore.name:
+        return DiskContentStore(settings.REPORT_STORAGE_PATH)
+    raise ValueError(f"Unknown report storage mode: {name}")
+
+
+def _prepare_bodies(research: DeepResearch, bodies: Dict[str, str]) -> Tuple[Optional[ContentStore], Dict[str, str]]:
+    """
+    Decides where the given bodies go and updates the inline columns to match.
+    Returns the store to write to (None for inline) and the bodies to write.
+    """
+    if research.body_storage is None:
+        store = get_content_store()
+        if store is not None:
+            # Only read the bodies not being set: the others may be deferred and unloaded
+            full_bodies = {field: bodies[field] if field in bodies else getattr(research, field) or "" for field in BODY_FIELDS}
+            size = sum(len(text.encode("utf-8")) for text in full_bodies.values())
+        if store is None or size < settings.REPORT_STORAGE_THRESHOLD:
+            for field, text in bodies.items():
+                setattr(research, field, text)
+            return None, {}
+        # Moving out of the row: every body has to be written to the store
+        bodies = full_bodies
+        research.body_storage = store.name
+    else:
+        store = get_content_store(research.body_storage)
+
+    for field in bodies:
+        setattr(research, field, "")
+    return store, bodies
+
+
+async def store_bodies(db, research: DeepResearch, bodies: Dict[str, str]) -> None:
+    """
+    Sets prompt_text/final_report on a new or existing research item, moving
+    them to the configured content store when they are large enough. Flushes
+    the item so new rows get their id; the caller commits.
+    """
+    state = inspect(research)
+    unloaded = [field for field in BODY_FIELDS if field not in bodies and field in state.unloaded]
+    if state.persistent and research.body_storage is None and unloaded and settings.REPORT_STORAGE_MODE != "inline":
+        # Bodies are deferred; an inline row moving out needs all of them
+        await db.refresh(research, attribute_names=unloaded)
+    store, bodies = _prepare_bodies(research, bodies)
+    await db.flush()
+    for field, text in bodies.items():
+        await store.aput(db, research.id, field, compress(text), len(text.encode("utf-8")))
+        set_committed_value(research, field, text)
+
+
+def store_bodies_sync(session, research: DeepResearch, bodies: Dict[str, str]) -> None:
+    """store_bodies for new research items, in Celery tasks"""
+    store, bodies = _prepare_bodies(research, bodies)
+    session.flush()
+    for field, text in bodies.items():
+        store.put(session, research.id, field, compress(text), len(text.encode("utf-8")))
+        set_committed_value(research, field, text)
+
+
+def _external_by_store(researches: Iterable[DeepResearch]) -> Dict[str, List[DeepResearch]]:
+    groups: Dict[str, List[DeepResearch]] = {}
+    for research in researches:
+        if research is not None and research.body_storage:
+            groups.setdefault(research.body_storage, []).append(research)
+    return groups
+
+
+def _apply_bodies(researches: List[DeepResearch], blobs: Dict[ContentKey, bytes]) -> None:
+    for research in researches:
+        for field in BODY_FIELDS:
+            blob = blobs.get((research.id, field))
+            if blob is None:
+                logger.warning(f"Missing {field} body for research {research.id} in {research.body_storage} store")
+                continue
+            set_committed_value(research, field, decompress(blob))
+
+
+async def hydrate_bodies(db, researches: Iterable[DeepResearch]) -> None:
+    """Loads out-of-row bodies for the given items with one fetch per store"""
+    for name, group in _external_by_store(researches).items():
+        blobs = await get_content_store(name).aget_many(db, [research.id for research in group])
+        _apply_bodies(group, blobs)
+
+
+def hydrate_bodies_sync(session, researches: Iterable[DeepResearch]) -> None:
+    """Sync variant of hydrate_bodies for Celery tasks"""
+    for name, group in _external_by_store(researches).items():
+        blobs = get_content_store(name).get_many(session, [research.id for research in group])
+        _apply_bodies(group, blobs)
+
+
+async def delete_bodies(db, research: DeepResearch) -> None:
+    """Removes stored bodies that don't cascade with the row (disk store)"""
+    if research.body_storage:
+        await get_content_store(research.body_storage).adelete(db, research.id)
@@ -1,49 +1,32 @@
 # backend/app/services/research.py
+import asyncio
 import os
 import json
-import re
+import logging
 import uuid
 from typing import Dict, List, Optional
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
-from cachetools import TTLCache
-from urllib.parse import urlparse
 
 
-import httpx
 from fastapi import HTTPException
-import openai
 
 from app.config import settings
 from app.models import (
     ResearchJob,
-    ResearchService as ResearchServiceDB,
-    ResearchServiceModel,
-    DeepResearch,
-    ResearchSource,
     OrganizationMember
 )
 from app.schemas.research_job import ResearchJob as ResearchJobSchema
 from app.schemas.research_job_create_request import ResearchJobCreateRequest
-from app.tasks.research_processing import process_research_data
+from app.tasks.research_processing import finalize_research_job
+from app.services.job_events import publish_job_event
+from app.services.job_status import AWAITING_ANSWERS, FINALIZING, UNPOLLED_STATUSES, get_job_status, record_job_status
+from app.services.service_catalog import service_catalog
+from app.services.service_clients import service_clients
+from app.services.webhooks import callback_url, webhooks_enabled
 
-
-cache = TTLCache(maxsize=100, ttl=300)
-openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-
-def get_deep_research_title(prompt_text: str) -> str:
-    prompt = f"Generate a title for the following research prompt using no more than 255 characters: {prompt_text}"
-    response = openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that generates a title for a research report based on a prompt."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.3,
-        max_tokens=75
-    )
-    return response.choices[0].message.content
+logger = logging.getLogger(__name__)
 
 class ResearchService:
     def __init__(self):
@@ -52,71 +35,19 @@ class ResearchService:
 
     async def _get_service_config(self, db: AsyncSession, service: str) -> Dict:
         """Get the configuration for a research service"""
-        if service in cache:
-            return cache[service]
-        
-        # Query the service and model info from the database
-        stmt = (
-            select(ResearchServiceDB)
-            .options(
-                selectinload(ResearchServiceDB.default_model),
-                selectinload(ResearchServiceDB.service_models).selectinload(ResearchServiceModel.model),
-                selectinload(ResearchServiceDB.models)
-            )
-            .where(ResearchServiceDB.service_key == service)
-        )
-        db_service = await db.execute(stmt)
-        db_service = db_service.scalar_one_or_none()
+        service_config = await service_catalog.config(service)
         
-        if not db_service:
+        if service_config is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported research service: {service}"
             )
-
-        repl_regex = re.compile(r"\{\{(.*?)\}\}")
-        # Build configuration dictionary
-        service_config = {
-            "url": repl_regex.sub(lambda match: getattr(settings, match.group(1), match.group(0)), db_service.url),
-            "default_model": None,
-            "default_params": {},
-            "models": {}
-        }
-
-        # Find the default model
-        default_model = db_service.default_model
         
-        if not default_model and db_service.models:
-            # If no explicit default, try to find one marked as default in the linking table
-            default_model = next(
-                (model for model in db_service.models 
-                 if model.is_active and any(sm.is_default for sm in model.service_models 
-                       if sm.service_id == db_service.id)),
-                db_service.models[0]  # Fallback to first model if no default specified
-            )
-
-        if default_model:
-            service_config["default_model"] = default_model.model_key
-            service_config["default_params"] = default_model.default_params
-
-        if db_service.models:
-            for model in db_service.models:
-                if model.is_active:
-                    service_config["models"][model.model_key] = {
-                        "default_params": model.default_params,
-                        "max_tokens": model.max_tokens
-                    }
-
-        cache[service] = service_config
         return service_config
 
     async def _validate_service(self, db: AsyncSession, service: str) -> None:
-        """Validate that the requested service exists in database."""
-        stmt = select(ResearchServiceDB).where(ResearchServiceDB.service_key == service)
-        result = await db.execute(stmt)
-        db_service = result.scalar_one_or_none()
-        
-        if not db_service:
+        """Validate that the requested service exists in the catalog."""
+        if await service_catalog.service(service) is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported research service: {service}"
@@ -178,49 +109,54 @@ class ResearchService:
             if model.startswith("o") and "reasoning_effort" not in params:
                 params["reasoning_effort"] = "medium"
 
+            payload = {
+                "user_id": user_id,
+                "prompt": prompt,
+                "breadth": breadth,
+                "depth": depth,
+                "model": model,
+                "model_params": params
+            }
+            # The service reports status changes to our webhook; polling is the fallback
+            if webhooks_enabled(service):
+                payload["callback_url"] = callback_url(service)
+            
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url + "/research/start", timeout=httpx.Timeout(10.0), json={
-                    "user_id": user_id,
-                    "prompt": prompt,
-                    "breadth": breadth,
-                    "depth": depth,
-                    "model": model,
-                    "model_params": params
-                })
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"OpenDR API error: {response.text}"
-                    )
-                
-                result = response.json()
-                
-                # Generate job_id if not provided by service
-                job_id = result.get("job_id", str(uuid.uuid4()))
-                
-                # Create and save research job
-                db_job = ResearchJob(
-                    job_id=job_id,
-                    user_id=int(user_id),
-                    status=result.get("status", "pending_answers"),
-                    service=service,
-                    prompt=prompt,
-                    model_name=model,
-                    model_params=params,
-                    visibility="org" if org_id else visibility,
-                    owner_org_id=org_id
+            client = service_clients.get(service)
+            response = await client.post(url + "/research/start", timeout=service_clients.timeout(service, "start"), json=payload)
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"OpenDR API error: {response.text}"
                 )
-                
-                db.add(db_job)
-                await db.commit()
-                await db.refresh(db_job)
-                
-                return {
-                    "job": ResearchJobSchema.model_validate(db_job),
-                    "questions": result.get("questions", [])
-                }
+            
+            result = response.json()
+            
+            # Generate job_id if not provided by service
+            job_id = result.get("job_id", str(uuid.uuid4()))
+            
+            # Create and save research job
+            db_job = ResearchJob(
+                job_id=job_id,
+                user_id=int(user_id),
+                status=result.get("status", "pending_answers"),
+                service=service,
+                prompt=prompt,
+                model_name=model,
+                model_params=params,
+                visibility="org" if org_id else visibility,
+                owner_org_id=org_id
+            )
+            
+            db.add(db_job)
+            await db.commit()
+            await db.refresh(db_job)
+            
+            return {
+                "job": ResearchJobSchema.model_validate(db_job),
+                "questions": result.get("questions", [])
+            }
 
     async def answer_questions(
         self,
@@ -252,27 +188,29 @@ class ResearchService:
             service_config = await self._get_service_config(db, service)
             url = service_config["url"]
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url + "/research/answer", json={
-                    "user_id": str(user_id),
-                    "job_id": job_id,
-                    "answers": answers
-                })
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"OpenDR API error: {response.text}"
-                    )
-                
-                result = response.json()
-                
-                # Update job status
-                db_job.status = result["status"]
-                await db.commit()
-                await db.refresh(db_job)
-                
-                return ResearchJobSchema.model_validate(db_job)
+            client = service_clients.get(service)
+            response = await client.post(url + "/research/answer", timeout=service_clients.timeout(service, "answer"), json={
+                "user_id": str(user_id),
+                "job_id": job_id,
+                "answers": answers
+            })
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"OpenDR API error: {response.text}"
+                )
+            
+            result = response.json()
+            
+            # Update job status
+            db_job.status = result["status"]
+            await db.commit()
+            await db.refresh(db_job)
+            
+            job = ResearchJobSchema.model_validate(db_job)
+            await publish_job_event(db_job.id, "status", job.model_dump_json())
+            return job
 
     async def poll_status(
         self,
@@ -311,114 +249,145 @@ class ResearchService:
                 detail="Research job not found"
             )
         
-        # Return immediately if job is in a final state
-        if db_job.status in ["completed", "failed", "cancelled"]:
+        # Return immediately if job is in a final state, its results are being
+        # stored, or it is waiting for the user's answers rather than the service
+        if db_job.status in UNPOLLED_STATUSES or db_job.status == AWAITING_ANSWERS:
             return {
                 "job": ResearchJobSchema.model_validate(db_job),
                 "results": None  # No need to fetch results if already complete
             }
             
-        # For active jobs, poll the service
+        # For active jobs the poller keeps the row current; ask the service
+        # ourselves only if the poller hasn't checked this job recently
         service = db_job.service
-        job_id = db_job.job_id
         await self._validate_service(db, service)
+        if settings.RESEARCH_JOB_POLLER_ENABLED and await get_job_status(db_job.id) is not None:
+            return {
+                "job": ResearchJobSchema.model_validate(db_job),
+                "results": None
+            }
         
         if service == "open-dr":
             service_config = await self._get_service_config(db, service)
-            url = service_config["url"]
+            result = await self._request_status(service, service_config["url"], db_job)
+            await self.apply_status(db, db_job, result)
+            await record_job_status(db_job.id, db_job.status)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url + "/research/status", params={
-                    "user_id": str(user_id),
-                    "job_id": job_id
-                })
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"OpenDR API error: {response.text}"
-                    )
-                
-                result = response.json()
-                if result["status"] == "complete":
-                    db_job.status = "completed"
-                else:
-                    # Update job status
-                    db_job.status = result["status"]
-                if db_job.status == "completed" and "results" in result:
-                    # Store research results in DeepResearch table
-                    research_results = result.get("results", {})
-                    prompt_text = research_results.get("prompt", "")
-                    questions_and_answers = research_results.get("questions_and_answers", "")
-                    final_report = research_results.get("report", "")
-                    sources = research_results.get("sources", [])
-                    
-                    # Create a title from prompt (truncate if needed)
-                    try:
-                        title = get_deep_research_title(prompt_text)
-                    except:
-                        title = prompt_text[:255] if len(prompt_text) <= 255 else prompt_text[:252] + "..."
-                    
-                    # Create DeepResearch record
-                    deep_research = DeepResearch(
-                        user_id=user_id,
-                        owner_user_id=user_id,  # User who created the job is the owner
-                        owner_org_id=db_job.owner_org_id,  # Copy organization ownership from job
-                        visibility=db_job.visibility,  # Use same visibility setting as job
-                        title=title,
-                        prompt_text=prompt_text,
-                        questions_and_answers=questions_and_answers,
-                        final_report=final_report,
-                        model_name=db_job.model_name,
-                        model_params=db_job.model_params,
-                        source_count=len(sources)
-                        # Vector embeddings will be added by the async processor
-                    )
-                    
-                    db.add(deep_research)
-                    await db.flush()  # Get ID without committing transaction
-                    
-                    # Add sources if available
-                    for source in sources:
-                        source_url = source.get("url", "")
-                        source_title = source.get("title", "")
-                        source_excerpt = source.get("description", "")
-                        
-                        # Extract domain from URL
-                        domain = None
-                        if source_url:
-                            try:
-                                parsed_url = urlparse(source_url)
-                                domain = parsed_url.netloc
-                            except:
-                                # If URL parsing fails, leave domain as None
-                                pass
-                        
-                        # Create source record
-                        db_source = ResearchSource(
-                            deep_research_id=deep_research.id,
-                            source_url=source_url,
-                            source_title=source_title,
-                            source_excerpt=source_excerpt,
-                            domain=domain,
-                            source_type="website"  # Default, can be refined later
-                        )
-                        db.add(db_source)
-                    
-                    # Link the job to the research
-                    db_job.deep_research_id = deep_research.id
-                    await db.commit()
-                    await db.refresh(db_job)
-                    # Trigger async processing tasks
-                    process_research_data.delay(deep_research.id)
-                else:
-                    await db.commit()
-                    await db.refresh(db_job)
-                
-                return {
-                    "job": ResearchJobSchema.model_validate(db_job),
-                    "results": result.get("results")
-                }
+            return {
+                "job": ResearchJobSchema.model_validate(db_job),
+                "results": result.get("results")
+            }
+
+    async def _request_status(self, service: str, url: str, db_job: ResearchJob) -> Dict:
+        """Fetch the status of one job from its service"""
+        client = service_clients.get(service)
+        response = await client.get(url + "/research/status", timeout=service_clients.timeout(service, "status"), params={
+            "user_id": str(db_job.user_id),
+            "job_id": db_job.job_id
+        })
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"OpenDR API error: {response.text}"
+            )
+        
+        return response.json()
+
+    async def fetch_statuses(self, db: AsyncSession, service: str, jobs: List[ResearchJob]) -> Dict[int, Dict]:
+        """
+        Fetch the status of several jobs of one service, keyed by job row id.
+        Uses the service's batch status endpoint when it has one; otherwise
+        polls the jobs concurrently. Jobs whose status couldn't be fetched are
+        left out.
+        """
+        service_config = await self._get_service_config(db, service)
+        url = service_config["url"]
+        batch_path = service_clients.config(service).status_batch_path
+        
+        if batch_path:
+            client = service_clients.get(service)
+            response = await client.post(url + batch_path, timeout=service_clients.timeout(service, "status"), json={
+                "jobs": [{"user_id": str(job.user_id), "job_id": job.job_id} for job in jobs]
+            })
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"OpenDR API error: {response.text}"
+                )
+            by_job_id = {item["job_id"]: item for item in response.json().get("jobs", [])}
+            return {job.id: by_job_id[job.job_id] for job in jobs if job.job_id in by_job_id}
+        
+        results = await asyncio.gather(
+            *(self._request_status(service, url, job) for job in jobs),
+            return_exceptions=True
+        )
+        statuses = {}
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not poll research job {job.id}: {result}")
+            else:
+                statuses[job.id] = result
+        return statuses
+
+    async def apply_status(self, db: AsyncSession, db_job: ResearchJob, result: Dict) -> None:
+        """
+        Store a status fetched from the service on the job and commit. A
+        completed job with results is left "finalizing" and research.finalize_job
+        saves the results as a DeepResearch item, so the request that happens
+        to see the completion doesn't wait on it. Status changes are published
+        to the job's event stream.
+        """
+        previous_status = db_job.status
+        if result["status"] == "complete":
+            db_job.status = "completed"
+        else:
+            # Update job status
+            db_job.status = result["status"]
+        finalize = db_job.status == "completed" and "results" in result
+        if finalize:
+            db_job.status = FINALIZING
+        await db.commit()
+        await db.refresh(db_job)
+        if finalize:
+            try:
+                finalize_research_job.delay(db_job.id, result.get("results") or {})
+            except Exception as e:
+                # maintenance.recover_stuck_finalizing_jobs hands the job back to the poller
+                logger.error(f"Could not queue finalizing research job {db_job.id}: {e}")
+        
+        if db_job.status != previous_status:
+            await publish_job_event(db_job.id, "status", ResearchJobSchema.model_validate(db_job).model_dump_json())
+
+    async def apply_webhook(self, db: AsyncSession, service: str, payload: Dict) -> Optional[ResearchJob]:
+        """
+        Store a status delivered by a service's webhook. Returns the job, or
+        None if there is no such job (yet; the service may call before
+        start_job has stored it).
+        """
+        await self._validate_service(db, service)
+        
+        stmt = select(ResearchJob).where(
+            ResearchJob.job_id == payload["job_id"],
+            ResearchJob.service == service
+        )
+        result = await db.execute(stmt)
+        db_job = result.scalar_one_or_none()
+        
+        if not db_job:
+            return None
+        
+        if db_job.status in UNPOLLED_STATUSES:
+            return db_job
+        
+        # Completions may be announced without the results; fetch them then
+        if payload["status"] in ("complete", "completed") and "results" not in payload:
+            service_config = await self._get_service_config(db, service)
+            payload = await self._request_status(service, service_config["url"], db_job)
+        
+        await self.apply_status(db, db_job, payload)
+        await record_job_status(db_job.id, db_job.status)
+        return db_job
 
     async def cancel_job(
         self,
@@ -445,32 +414,34 @@ class ResearchService:
                 detail="Research job not found"
             )
             
-        # Return immediately if job is already in a final state
-        if db_job.status in ["complete", "failed", "cancelled"]:
+        # Return immediately if job is already in a final state or its results are being stored
+        if db_job.status in UNPOLLED_STATUSES:
             return ResearchJobSchema.model_validate(db_job)
         
         if service == "open-dr":
             service_config = await self._get_service_config(db, service)
             url = service_config["url"]
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url + "/research/cancel", params={
-                    "user_id": str(user_id),
-                    "job_id": job_id
-                })
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"OpenDR API error: {response.text}"
-                    )
-                
-                # Update job status to cancelled
-                db_job.status = "cancelled"
-                await db.commit()
-                await db.refresh(db_job)
-                
-                return ResearchJobSchema.model_validate(db_job)
+            client = service_clients.get(service)
+            response = await client.get(url + "/research/cancel", timeout=service_clients.timeout(service, "cancel"), params={
+                "user_id": str(user_id),
+                "job_id": job_id
+            })
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"OpenDR API error: {response.text}"
+                )
+            
+            # Update job status to cancelled
+            db_job.status = "cancelled"
+            await db.commit()
+            await db.refresh(db_job)
+            
+            job = ResearchJobSchema.model_validate(db_job)
+            await publish_job_event(db_job.id, "status", job.model_dump_json())
+            return job
 
     async def list_jobs(
         self,
@@ -507,18 +478,9 @@ class ResearchService:
         self,
         db: AsyncSession,
         service_key: Optional[str] = None
-    ) -> List[ResearchServiceDB]:
+    ) -> List[Dict]:
         """Get all research services or a specific one by service_key."""
-        query = select(ResearchServiceDB)
-        
-        # Explicitly load all relationships needed by the Pydantic schema
-        query = query.options(
-            selectinload(ResearchServiceDB.default_model),
-            selectinload(ResearchServiceDB.service_models).selectinload(ResearchServiceModel.model)
-        )
-        
         if service_key:
-            query = query.where(ResearchServiceDB.service_key == service_key)
-        
-        result = await db.execute(query)
-        return list(result.scalars().unique())
\ No newline at end of file
+            service = await service_catalog.service(service_key)
+            return [service] if service else []
+        return await service_catalog.services()
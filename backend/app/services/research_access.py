@@ -0,0 +1,70 @@
+# backend/app/services/research_access.py
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from app.models import DeepResearch
+
+
+def research_visibility_filter(current_user):
+    """
+    Returns a SQL condition matching the research items visible to the user:
+    public items, the user's own items, and org items of the user's organizations.
+    """
+    return or_(
+        DeepResearch.visibility == "public",
+        DeepResearch.user_id == current_user.id,
+        and_(
+            DeepResearch.visibility == "org",
+            DeepResearch.owner_org_id.isnot(None),
+            DeepResearch.owner_org_id.in_([
+                m.organization_id for m in current_user.organization_memberships
+            ])
+        )
+    )
+
+
+def check_research_read_access(research, current_user) -> None:
+    """
+    Raises 403 unless the user may read the research item. Works on ORM
+    instances as well as rows that only carry the visibility columns.
+    """
+    if research.visibility != "public":
+        if research.visibility == "private" and research.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        elif research.visibility == "org":
+            org_member = next((m for m in current_user.organization_memberships 
+                             if m.organization_id == research.owner_org_id), None)
+            if not org_member:
+                raise HTTPException(status_code=403, detail="Access denied")
+
+
+async def get_readable_research(
+    db: AsyncSession,
+    research_id: int,
+    current_user,
+    for_update: bool = False
+):
+    """
+    Loads only the access-control and version columns of a research item and
+    checks that the user may read it. With for_update the row stays locked until the
+    transaction ends, which serializes writers of its denormalized aggregates.
+    """
+    stmt = select(
+        DeepResearch.id,
+        DeepResearch.visibility,
+        DeepResearch.user_id,
+        DeepResearch.owner_org_id,
+        DeepResearch.updated_at,
+        DeepResearch.content_version
+    ).where(DeepResearch.id == research_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    result = await db.execute(stmt)
+    research = result.first()
+    
+    if not research:
+        raise HTTPException(status_code=404, detail="Research item not found")
+    
+    check_research_read_access(research, current_user)
+    return research
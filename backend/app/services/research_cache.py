@@ -0,0 +1,223 @@
+# backend/app/services/research_cache.py
+"""
+Read-through Redis cache for serialized research item responses.
+
+Entries hold the response bytes together with the item's ETag and the ACL
+columns (visibility, user_id, owner_org_id), so a hit is access-checked and
+served without touching the database. Entries are keyed by research id and a
+per-item generation counter; writes bump the generation after they commit
+instead of deleting entries, so a reader that loaded the old row while the
+write was in flight stores it under a generation nobody reads anymore.
+
+Hot keys are protected against stampedes two ways: only one request (across
+all workers) loads a missing entry while the others wait for it, and entries
+are refreshed probabilistically ahead of expiry ("XFetch"), while requests
+that lose the refresh race keep serving the current entry.
+
+Redis problems never fail a request; the loader is called directly instead.
+Changes not covered by invalidation (e.g. a creator renaming their account)
+show up once the entry expires after RESEARCH_CACHE_TTL seconds.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from redis.exceptions import LockError, RedisError
+
+from app.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Generations outlive any entry stored under them
+GENERATION_TTL = 86400
+# Upper bound for one load; the lock expires on its own if a worker dies
+LOCK_TIMEOUT = 10
+# How long requests wait for another worker's load before loading themselves
+WAIT_TIMEOUT = 1.0
+WAIT_INTERVAL = 0.05
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    etag: str
+    # visibility, user_id and owner_org_id of the item, for check_research_read_access
+    acl: SimpleNamespace
+
+
+Loader = Callable[[], Awaitable[CachedResponse]]
+
+
+def cache_enabled() -> bool:
+    return settings.RESEARCH_CACHE_TTL > 0
+
+
+def acl_of(research) -> SimpleNamespace:
+    return SimpleNamespace(
+        visibility=research.visibility,
+        user_id=research.user_id,
+        owner_org_id=research.owner_org_id
+    )
+
+
+def _generation_key(research_id: int) -> str:
+    return f"research-cache:{research_id}:gen"
+
+
+def _entry_key(research_id: int, kind: str, generation: int) -> str:
+    return f"research-cache:{research_id}:{kind}:{generation}"
+
+
+def _encode(entry: CachedResponse, expiry: float, delta: float) -> bytes:
+    meta = {
+        "etag": entry.etag,
+        "visibility": entry.acl.visibility,
+        "user_id": entry.acl.user_id,
+        "owner_org_id": entry.acl.owner_org_id,
+        "expiry": expiry,
+        "delta": delta,
+    }
+    # Compact JSON never contains a raw newline, so it separates header and body
+    return json.dumps(meta).encode() + b"\n" + entry.content
+
+
+def _decode(raw: bytes):
+    header, content = raw.split(b"\n", 1)
+    meta = json.loads(header)
+    acl = SimpleNamespace(
+        visibility=meta["visibility"],
+        user_id=meta["user_id"],
+        owner_org_id=meta["owner_org_id"]
+    )
+    return CachedResponse(content, meta["etag"], acl), meta["expiry"], meta["delta"]
+
+
+def _refresh_early(expiry: float, delta: float) -> bool:
+    """
+    XFetch: recompute before expiry with a probability that grows as expiry
+    nears, scaled by how long the last load took (delta, in seconds).
+    """
+    return time.time() - delta * settings.RESEARCH_CACHE_BETA * math.log(1.0 - random.random()) >= expiry
+
+
+async def _load_and_store(client, key: str, loader: Loader) -> CachedResponse:
+    started = time.time()
+    entry = await loader()
+    delta = time.time() - started
+    ttl = settings.RESEARCH_CACHE_TTL
+    try:
+        await client.set(key, _encode(entry, time.time() + ttl, delta), ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Could not store {key}: {e}")
+    return entry
+
+
+async def _try_lock(client, key: str):
+    """Returns the held lock, None if another worker holds it, or False if Redis is unavailable"""
+    lock = client.lock(f"{key}:lock", timeout=LOCK_TIMEOUT, blocking=False)
+    try:
+        return lock if await lock.acquire() else None
+    except RedisError as e:
+        logger.warning(f"Could not lock {key}: {e}")
+        return False
+
+
+async def _release(lock) -> None:
+    try:
+        await lock.release()
+    except (LockError, RedisError):
+        # Expired while loading; the next writer already owns it or nobody does
+        pass
+
+
+async def _locked_load(client, key: str, lock, loader: Loader) -> CachedResponse:
+    if lock is False:
+        return await loader()
+    try:
+        return await _load_and_store(client, key, loader)
+    finally:
+        await _release(lock)
+
+
+async def _wait_for(client, key: str) -> Optional[CachedResponse]:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL)
+        try:
+            raw = await client.get(key)
+        except RedisError:
+            return None
+        if raw is not None:
+            return _decode(raw)[0]
+    return None
+
+
+async def get_or_load(research_id: int, kind: str, loader: Loader) -> CachedResponse:
+    """
+    Returns the cached response of the given kind for a research item, calling
+    loader() to build it on a miss. The loader does its own access check, but
+    a cached entry is shared by all users: callers must check entry.acl.
+    """
+    if not cache_enabled():
+        return await loader()
+
+    client = get_redis()
+    try:
+        generation = int(await client.get(_generation_key(research_id)) or 0)
+        key = _entry_key(research_id, kind, generation)
+        raw = await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Research cache unavailable: {e}")
+        return await loader()
+
+    if raw is not None:
+        entry, expiry, delta = _decode(raw)
+        if not _refresh_early(expiry, delta):
+            return entry
+        lock = await _try_lock(client, key)
+        if lock is None:
+            # Someone else is refreshing; the current entry is still valid
+            return entry
+        return await _locked_load(client, key, lock, loader)
+
+    lock = await _try_lock(client, key)
+    if lock is not None:
+        return await _locked_load(client, key, lock, loader)
+    entry = await _wait_for(client, key)
+    if entry is not None:
+        return entry
+    return await loader()
+
+
+async def invalidate_research(*research_ids: int) -> None:
+    """Drops the cached responses of the given items. Call after the write commits."""
+    if not cache_enabled() or not research_ids:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for research_id in research_ids:
+                pipe.incr(_generation_key(research_id))
+                pipe.expire(_generation_key(research_id), GENERATION_TTL)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not invalidate research cache for {research_ids}: {e}")
+
+
+def invalidate_research_sync(client, *research_ids: int) -> None:
+    """Sync variant of invalidate_research for Celery tasks, using their Redis client"""
+    if not cache_enabled() or not research_ids:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for research_id in research_ids:
+            pipe.incr(_generation_key(research_id))
+            pipe.expire(_generation_key(research_id), GENERATION_TTL)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not invalidate research cache for {research_ids}: {e}")
@@ -0,0 +1,205 @@
+# backend/app/services/service_catalog.py
+"""
+Catalog of research services and their models.
+
+The research_services, research_service_models and ai_models tables change
+only when an operator edits them, yet every job start, answer, poll and
+cancel used to read them. The catalog loads them once into a JSON snapshot
+kept in Redis, which every process copies into memory on first use; lookups
+are then served from the in-process copy without a query or a round trip.
+
+After changing the catalog tables, call publish_catalog_change (or run the
+maintenance.refresh_service_catalog task): it drops the Redis snapshot and
+announces the change on a pub/sub channel, and each API process drops its
+copy when it hears about it. Both copies also expire after
+SERVICE_CATALOG_TTL seconds, which bounds staleness if a notification is
+missed.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.db.database import AsyncSessionLocal
+from app.models import ResearchService, ResearchServiceModel
+from app.schemas.research_service import ResearchService as ResearchServiceSchema
+
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = "research-service-catalog"
+CATALOG_CHANNEL = "research-service-catalog:changed"
+
+_SETTING = re.compile(r"\{\{(.*?)\}\}")
+
+
+def _service_config(db_service: ResearchService) -> Dict:
+    """What ResearchService needs to call the service; the url is resolved on lookup"""
+    config = {
+        "url": db_service.url,
+        "default_model": None,
+        "default_params": {},
+        "max_tokens": None,
+        "models": {}
+    }
+
+    # Find the default model
+    default_model = db_service.default_model
+
+    if not default_model and db_service.models:
+        # If no explicit default, try to find one marked as default in the linking table
+        default_model = next(
+            (model for model in db_service.models
+             if model.is_active and any(sm.is_default for sm in model.service_models
+                   if sm.service_id == db_service.id)),
+            db_service.models[0]  # Fallback to first model if no default specified
+        )
+
+    if default_model:
+        config["default_model"] = default_model.model_key
+        config["default_params"] = default_model.default_params
+        config["max_tokens"] = default_model.max_tokens
+
+    for model in db_service.models:
+        if model.is_active:
+            config["models"][model.model_key] = {
+                "default_params": model.default_params,
+                "max_tokens": model.max_tokens
+            }
+
+    return config
+
+
+async def load_catalog(db) -> Dict[str, Dict]:
+    """The catalog as stored in Redis: service key -> {"service", "config"}"""
+    result = await db.execute(
+        select(ResearchService)
+        .options(
+            selectinload(ResearchService.default_model),
+            selectinload(ResearchService.service_models).selectinload(ResearchServiceModel.model),
+            selectinload(ResearchService.models)
+        )
+        .order_by(ResearchService.id)
+    )
+    return {
+        db_service.service_key: {
+            "service": ResearchServiceSchema.model_validate(db_service).model_dump(mode="json"),
+            "config": _service_config(db_service)
+        }
+        for db_service in result.scalars().unique()
+    }
+
+
+async def publish_catalog_change() -> None:
+    try:
+        await get_redis().delete(CATALOG_KEY)
+        await get_redis().publish(CATALOG_CHANNEL, "changed")
+    except RedisError as e:
+        logger.warning(f"Could not announce research service catalog change: {e}")
+    service_catalog.invalidate()
+
+
+def publish_catalog_change_sync(client) -> None:
+    """publish_catalog_change for Celery tasks and scripts, with a sync Redis client"""
+    try:
+        client.delete(CATALOG_KEY)
+        client.publish(CATALOG_CHANNEL, "changed")
+    except RedisError as e:
+        logger.warning(f"Could not announce research service catalog change: {e}")
+
+
+class ServiceCatalog:
+    def __init__(self):
+        self._catalog: Optional[Dict[str, Dict]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def invalidate(self) -> None:
+        self._catalog = None
+
+    def _fresh(self) -> bool:
+        return self._catalog is not None and time.monotonic() - self._loaded_at < settings.SERVICE_CATALOG_TTL
+
+    async def _fetch(self) -> Dict[str, Dict]:
+        try:
+            raw = await get_redis().get(CATALOG_KEY)
+            if raw is not None:
+                return json.loads(raw)
+        except RedisError as e:
+            logger.warning(f"Research service catalog snapshot unavailable: {e}")
+
+        async with AsyncSessionLocal() as db:
+            catalog = await load_catalog(db)
+        try:
+            await get_redis().set(CATALOG_KEY, json.dumps(catalog), ex=settings.SERVICE_CATALOG_TTL)
+        except RedisError as e:
+            logger.warning(f"Could not store research service catalog snapshot: {e}")
+        return catalog
+
+    async def catalog(self) -> Dict[str, Dict]:
+        if self._fresh():
+            return self._catalog
+        async with self._lock:
+            if not self._fresh():
+                self._catalog = await self._fetch()
+                self._loaded_at = time.monotonic()
+            return self._catalog
+
+    async def service(self, service_key: str) -> Optional[Dict]:
+        """The service as returned by GET /research-services, or None if it doesn't exist"""
+        entry = (await self.catalog()).get(service_key)
+        return entry["service"] if entry else None
+
+    async def services(self) -> List[Dict]:
+        return [entry["service"] for entry in (await self.catalog()).values()]
+
+    async def config(self, service_key: str) -> Optional[Dict]:
+        """The service's url (with {{SETTING}} placeholders filled in), default model and models"""
+        entry = (await self.catalog()).get(service_key)
+        if entry is None:
+            return None
+        config = dict(entry["config"])
+        config["url"] = _SETTING.sub(lambda match: getattr(settings, match.group(1), match.group(0)), config["url"] or "")
+        return config
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(CATALOG_CHANNEL)
+                # Changes may have been announced while we weren't listening
+                self.invalidate()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self.invalidate()
+            except RedisError as e:
+                logger.warning(f"Research service catalog subscription lost: {e}")
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+service_catalog = ServiceCatalog()
@@ -0,0 +1,129 @@
+# backend/app/services/service_clients.py
+"""
+Long-lived HTTP clients for the research services.
+
+Each service gets one httpx.AsyncClient, so calls to it reuse keep-alive
+connections instead of paying TCP/TLS setup every time. Timeouts and
+connection limits come from the service's "http" block in
+research_services.json, falling back to the RESEARCH_SERVICE_* settings:
+
+    "http": {
+        "timeout": 30,
+        "connect_timeout": 5,
+        "max_connections": 50,
+        "max_keepalive_connections": 20,
+        "http2": false,
+        "timeouts": {"status": 10},
+        "status_batch_path": "/research/status/batch",
+        "webhooks": true
+    }
+
+"timeouts" overrides the read timeout per operation (start, answer, status,
+cancel). "status_batch_path" is set for services that report the status of
+several jobs in one call (used by the job poller). "webhooks" is set for
+services that accept a callback URL for status changes (see
+app.services.webhooks). The API opens the clients at startup and closes them
+on shutdown; anything else gets them created on first use.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICES_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "research_services.json")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    timeout: float = settings.RESEARCH_SERVICE_TIMEOUT
+    connect_timeout: float = settings.RESEARCH_SERVICE_CONNECT_TIMEOUT
+    max_connections: int = settings.RESEARCH_SERVICE_MAX_CONNECTIONS
+    max_keepalive_connections: int = settings.RESEARCH_SERVICE_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = settings.RESEARCH_SERVICE_KEEPALIVE_EXPIRY
+    http2: bool = settings.RESEARCH_SERVICE_HTTP2
+    timeouts: Dict[str, float] = field(default_factory=dict)
+    status_batch_path: Optional[str] = None
+    webhooks: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HttpClientConfig":
+        known = {name for name in cls.__dataclass_fields__}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def timeout_for(self, operation: Optional[str] = None) -> httpx.Timeout:
+        return httpx.Timeout(self.timeouts.get(operation, self.timeout), connect=self.connect_timeout)
+
+
+def load_client_configs(path: str = SERVICES_CONFIG_PATH) -> Dict[str, HttpClientConfig]:
+    with open(path) as f:
+        services = json.load(f)
+    return {key: HttpClientConfig.from_dict(service.get("http", {})) for key, service in services.items()}
+
+
+class ServiceClientPool:
+    def __init__(self, configs: Optional[Dict[str, HttpClientConfig]] = None):
+        self._configs = configs
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def configs(self) -> Dict[str, HttpClientConfig]:
+        if self._configs is None:
+            self._configs = load_client_configs()
+        return self._configs
+
+    def config(self, service: str) -> HttpClientConfig:
+        return self.configs.get(service) or HttpClientConfig()
+
+    def timeout(self, service: str, operation: Optional[str] = None) -> httpx.Timeout:
+        return self.config(service).timeout_for(operation)
+
+    def _create(self, service: str) -> httpx.AsyncClient:
+        config = self.config(service)
+        http2 = config.http2
+        if http2 and not _http2_available():
+            logger.warning(f"HTTP/2 requested for {service} but the h2 package isn't installed; using HTTP/1.1")
+            http2 = False
+        return httpx.AsyncClient(
+            timeout=config.timeout_for(),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            http2=http2
+        )
+
+    def get(self, service: str) -> httpx.AsyncClient:
+        """The shared client for a service, created on first use"""
+        client = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._clients[service] = self._create(service)
+        return client
+
+    def start(self) -> None:
+        for service in self.configs:
+            self.get(service)
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+service_clients = ServiceClientPool()
@@ -0,0 +1,93 @@
+# backend/app/services/webhooks.py
+"""
+Status webhooks from the research services.
+
+Services that support it are given a callback URL when a job starts
+(webhooks: true in the service's "http" block of research_services.json)
+and POST the job's status to it whenever it changes, so completions are
+picked up as they happen rather than on the next poll. The job poller keeps
+polling these jobs at RESEARCH_JOB_POLL_MAX_INTERVAL as a fallback for lost
+deliveries.
+
+Deliveries are signed with RESEARCH_WEBHOOK_SECRET, shared with the service:
+
+    X-DRKR-Timestamp: <unix seconds>
+    X-DRKR-Signature: sha256=<hex HMAC-SHA256 of "<timestamp>.<raw body>">
+    X-DRKR-Delivery:  <unique id, reused when the delivery is retried>
+
+and carry the same JSON as the service's status endpoint plus the job_id.
+Deliveries older than RESEARCH_WEBHOOK_TOLERANCE seconds are rejected, and
+each delivery id is only processed once within RESEARCH_WEBHOOK_DEDUPE_TTL.
+"""
+
+import hashlib
+import hmac
+import logging
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.services.service_clients import service_clients
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-DRKR-Signature"
+TIMESTAMP_HEADER = "X-DRKR-Timestamp"
+DELIVERY_HEADER = "X-DRKR-Delivery"
+
+
+def _delivery_key(service: str, delivery_id: str) -> str:
+    return f"research-webhook-delivery:{service}:{delivery_id}"
+
+
+def webhooks_enabled(service: str) -> bool:
+    """Whether jobs of the service get a callback URL"""
+    return bool(settings.RESEARCH_WEBHOOK_SECRET) and service_clients.config(service).webhooks
+
+
+def callback_url(service: str) -> str:
+    base_url = settings.RESEARCH_WEBHOOK_BASE_URL or f"{settings.API_SCHEME}://{settings.API_HOST}:{settings.API_PORT}"
+    return f"{base_url.rstrip('/')}/api/research-services/{service}/webhook"
+
+
+def sign(body: bytes, timestamp: str) -> str:
+    digest = hmac.new(settings.RESEARCH_WEBHOOK_SECRET.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return "sha256=" + digest.hexdigest()
+
+
+def verify_signature(body: bytes, timestamp: Optional[str], signature: Optional[str]) -> bool:
+    if not settings.RESEARCH_WEBHOOK_SECRET or not timestamp or not signature:
+        return False
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        return False
+    if abs(time.time() - sent_at) > settings.RESEARCH_WEBHOOK_TOLERANCE:
+        return False
+    return hmac.compare_digest(sign(body, timestamp), signature)
+
+
+async def claim_delivery(service: str, delivery_id: str) -> bool:
+    """
+    Marks a delivery as being processed; False if it already was. Without
+    Redis every delivery is processed, which apply_status tolerates.
+    """
+    try:
+        claimed = await get_redis().set(
+            _delivery_key(service, delivery_id), 1, nx=True, ex=settings.RESEARCH_WEBHOOK_DEDUPE_TTL
+        )
+    except RedisError as e:
+        logger.warning(f"Could not dedupe webhook delivery {delivery_id}: {e}")
+        return True
+    return bool(claimed)
+
+
+async def release_delivery(service: str, delivery_id: str) -> None:
+    """Lets a retry of a delivery that couldn't be processed through"""
+    try:
+        await get_redis().delete(_delivery_key(service, delivery_id))
+    except RedisError as e:
+        logger.warning(f"Could not release webhook delivery {delivery_id}: {e}")
@@ -0,0 +1,124 @@
+# backend/app/tasks/maintenance.py
+"""
+Housekeeping tasks. Periodic ones are scheduled by Celery beat through the
+beat_schedule configured in app.tasks.research_processing.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import get_db_sync
+from app.models import ResearchJob
+from app.schemas.research_job import ResearchJob as ResearchJobSchema
+from app.services.api_keys import flush_usage, hash_legacy_keys
+from app.services.job_events import publish_job_event_sync
+from app.services.job_status import FINALIZING
+from app.services.service_catalog import publish_catalog_change_sync
+from app.tasks.research_processing import app, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(name="maintenance.flush_api_key_usage")
+def flush_api_key_usage():
+    """Persists the API key usage counted in Redis to the api_keys table"""
+    with get_db_sync() as session:
+        try:
+            keys_updated = flush_usage(session, redis_client)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in flush_api_key_usage: {str(e)}")
+            raise
+    
+    return {
+        "status": "success",
+        "task": "flush_api_key_usage",
+        "keys_updated": keys_updated
+    }
+
+
+@app.task(name="maintenance.hash_legacy_api_keys")
+def hash_legacy_api_keys():
+    """Hashes DRKR API keys stored in plaintext; run once after upgrading the api_keys table"""
+    with get_db_sync() as session:
+        try:
+            keys_hashed = hash_legacy_keys(session)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in hash_legacy_api_keys: {str(e)}")
+            raise
+    
+    return {
+        "status": "success",
+        "task": "hash_legacy_api_keys",
+        "keys_hashed": keys_hashed
+    }
+
+
+@app.task(name="maintenance.refresh_service_catalog")
+def refresh_service_catalog():
+    """Makes every API process reload the research service catalog; run after editing it"""
+    publish_catalog_change_sync(redis_client)
+    return {
+        "status": "success",
+        "task": "refresh_service_catalog"
+    }
+
+
+def _finalize_attempts_key(job_pk: int) -> str:
+    return f"research-job-finalize-attempts:{job_pk}"
+
+
+def _finalize_attempt(job_pk: int) -> int:
+    """Counts a hand-back of the job; 1 if Redis can't say"""
+    key = _finalize_attempts_key(job_pk)
+    try:
+        attempts = redis_client.incr(key)
+        redis_client.expire(key, settings.RESEARCH_JOB_FINALIZE_TIMEOUT * (settings.RESEARCH_JOB_FINALIZE_MAX_ATTEMPTS + 1))
+        return attempts
+    except RedisError as e:
+        logger.warning(f"Could not count finalize attempts of research job {job_pk}: {e}")
+        return 1
+
+
+@app.task(name="maintenance.recover_stuck_finalizing_jobs")
+def recover_stuck_finalizing_jobs():
+    """
+    Hands research jobs stuck in "finalizing" back to the poller. Their
+    results only travel in the research.finalize_job message, so a failed
+    enqueue or a task that gave up leaves them there for good. Set back to
+    "running", the job is polled again and the next completion queues a new
+    finalize. After RESEARCH_JOB_FINALIZE_MAX_ATTEMPTS the job is failed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.RESEARCH_JOB_FINALIZE_TIMEOUT)
+    with get_db_sync() as session:
+        try:
+            # Jobs a finalize task is working on are locked, and skipped
+            jobs = session.execute(
+                select(ResearchJob)
+                .where(ResearchJob.status == FINALIZING, ResearchJob.updated_at < cutoff)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            for job in jobs:
+                attempts = _finalize_attempt(job.id)
+                job.status = "failed" if attempts >= settings.RESEARCH_JOB_FINALIZE_MAX_ATTEMPTS else "running"
+                logger.warning(f"Research job {job.id} was stuck finalizing; now {job.status} (attempt {attempts})")
+            session.commit()
+            events = [(job.id, ResearchJobSchema.model_validate(job).model_dump_json()) for job in jobs]
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in recover_stuck_finalizing_jobs: {str(e)}")
+            raise
+    
+    for job_pk, job_json in events:
+        publish_job_event_sync(redis_client, job_pk, "status", job_json)
+    
+    return {
+        "status": "success",
+        "task": "recover_stuck_finalizing_jobs",
+        "jobs_recovered": len(events)
+    }
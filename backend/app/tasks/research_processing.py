@@ -6,7 +6,12 @@ import os
 import re
 from typing import List, Dict, Any, Optional, Tuple
 from celery import Celery, chord, group
-from sqlalchemy import select, func
+from billiard.process import current_process
+from celery.signals import task_failure, task_postrun, task_prerun, worker_process_init
+from sqlalchemy import select, func, delete, insert, or_, true, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, undefer_group
 import openai
 from pinecone import Pinecone
 import nltk
@@ -15,6 +20,7 @@ import logging
 import redis
 from redis.exceptions import LockError
 import hashlib
+from urllib.parse import urlparse
 
 from app.config import settings
 from app.models import (
@@ -22,9 +28,17 @@ from app.models import (
     ResearchChunk, 
     ResearchSummary, 
     ResearchSource, 
-    DomainCoOccurrence
+    DomainCoOccurrence,
+    ResearchJob,
+    ResearchNeighbor
 )
 from app.db import get_db_sync
+from app.db.pool_metrics import start_metrics_server
+from app.schemas.research_job import ResearchJob as ResearchJobSchema
+from app.services.report_storage import hydrate_bodies_sync, store_bodies_sync
+from app.services.research_cache import invalidate_research_sync
+from app.services.job_events import job_of_research_sync, link_research_sync, publish_job_event_sync
+from app.services.job_status import FINALIZING
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -34,7 +48,8 @@ CELERY_RESULT_BACKEND = f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOS
 # Initialize Celery
 app = Celery('research_tasks', 
              broker=CELERY_BROKER_URL,
-             backend=CELERY_RESULT_BACKEND)
+             backend=CELERY_RESULT_BACKEND,
+             include=['app.tasks.maintenance'])
 
 # Configure Celery
 app.conf.update(
@@ -46,6 +61,16 @@ app.conf.update(
     broker_connection_retry_on_startup=True,
     task_time_limit=1800,
     worker_concurrency=4,
+    beat_schedule={
+        'flush-api-key-usage': {
+            'task': 'maintenance.flush_api_key_usage',
+            'schedule': settings.API_KEY_USAGE_FLUSH_INTERVAL,
+        },
+        'recover-stuck-finalizing-jobs': {
+            'task': 'maintenance.recover_stuck_finalizing_jobs',
+            'schedule': settings.RESEARCH_JOB_FINALIZE_SWEEP_INTERVAL,
+        },
+    },
 )
 
 # Initialize OpenAI client
@@ -90,6 +115,14 @@ def set_task_status(research_id, task_name, status, metadata=None):
         data.update(metadata)
     redis_client.hset(key, mapping=data)
     redis_client.expire(key, 86400)  # Expire after 24 hours
+    # Report progress to clients watching the job that produced the research
+    job_pk = job_of_research_sync(redis_client, research_id)
+    if job_pk is not None:
+        publish_job_event_sync(redis_client, job_pk, "stage", json.dumps({
+            "research_id": research_id,
+            "stage": task_name,
+            "status": status
+        }))
 
 def cache_embedding(text_hash, embedding, ttl=86400*7):
     """Cache embeddings to avoid redundant API calls"""
@@ -106,6 +139,146 @@ def get_cached_embedding(text_hash):
         return json.loads(cached)
     return None
 
+def bump_content_version(session, research_id):
+    """
+    Marks child rows of a research item as changed so its ETag changes. Call
+    invalidate_research_sync() once the transaction commits.
+    """
+    session.execute(
+        update(DeepResearch)
+        .where(DeepResearch.id == research_id)
+        .values(
+            content_version=DeepResearch.content_version + 1,
+            updated_at=DeepResearch.updated_at
+        )
+    )
+
+# Ingestion tasks whose progress is reported through set_task_status
+INGESTION_STAGES = {
+    "research.chunk_prompt",
+    "research.chunk_report",
+    "research.generate_document_embeddings",
+    "research.create_summaries",
+    "research.process_domain_cooccurrences",
+    "research.generate_title",
+}
+
+def _report_stage(task, args, status):
+    name = getattr(task, "name", None)
+    if name not in INGESTION_STAGES or not args:
+        return
+    stage = name.split(".", 1)[1]
+    try:
+        set_task_status(args[0], stage, status)
+    except redis.RedisError as e:
+        logger.warning(f"Could not report {stage} {status} for research ID {args[0]}: {e}")
+
+@worker_process_init.connect
+def serve_worker_metrics(**kwargs):
+    # Each pool process has its own sync engine pool, so each serves its own metrics
+    start_metrics_server(settings.CELERY_METRICS_PORT + getattr(current_process(), "index", 0))
+
+@task_prerun.connect
+def report_stage_started(sender=None, args=None, **kwargs):
+    _report_stage(sender, args, "started")
+
+@task_postrun.connect
+def report_stage_finished(sender=None, args=None, state=None, **kwargs):
+    if state == "SUCCESS":
+        _report_stage(sender, args, "completed")
+
+@task_failure.connect
+def report_stage_failed(sender=None, args=None, **kwargs):
+    _report_stage(sender, args, "failed")
+
+def provisional_title(prompt_text: str) -> str:
+    """Title used until research.generate_title replaces it"""
+    return prompt_text if len(prompt_text) <= 255 else prompt_text[:252] + "..."
+
+def _source_domain(url: str) -> Optional[str]:
+    try:
+        return urlparse(url).netloc or None
+    except ValueError:
+        return None
+
+# Stores the results of a completed research job
+@app.task(name="research.finalize_job", autoretry_for=(SQLAlchemyError,), retry_backoff=True, max_retries=5)
+def finalize_research_job(job_pk: int, results: Dict[str, Any]):
+    """
+    Task to save the results of a research job as a DeepResearch item, with
+    its sources inserted in one statement, mark the job completed and start
+    processing. ResearchService.apply_status leaves the job "finalizing" and
+    queues this. Runs at most once per job: the job row is locked, and a job
+    that is no longer finalizing is skipped. If this never succeeds,
+    maintenance.recover_stuck_finalizing_jobs gets the results fetched again.
+    """
+    logger.info(f"Finalizing research job {job_pk}")
+    
+    with get_db_sync() as session:
+        try:
+            job = session.execute(
+                select(ResearchJob).where(ResearchJob.id == job_pk).with_for_update()
+            ).scalar_one_or_none()
+            if job is None or job.status != FINALIZING or job.deep_research_id is not None:
+                session.rollback()
+                return {"status": "skipped", "task": "finalize_job"}
+            
+            prompt_text = results.get("prompt", "")
+            sources = results.get("sources", [])
+            # The prompt stands in as the title; research.generate_title replaces it
+            research = DeepResearch(
+                user_id=job.user_id,
+                owner_user_id=job.user_id,  # User who created the job is the owner
+                owner_org_id=job.owner_org_id,  # Copy organization ownership from job
+                visibility=job.visibility,  # Use same visibility setting as job
+                title=provisional_title(prompt_text),
+                questions_and_answers=results.get("questions_and_answers", ""),
+                model_name=job.model_name,
+                model_params=job.model_params,
+                source_count=len(sources)
+            )
+            session.add(research)
+            # Flushes to get the ID
+            store_bodies_sync(session, research, {
+                "prompt_text": prompt_text,
+                "final_report": results.get("report", "")
+            })
+            
+            if sources:
+                session.execute(insert(ResearchSource).values([
+                    {
+                        "deep_research_id": research.id,
+                        "source_url": source.get("url", ""),
+                        "source_title": source.get("title", ""),
+                        "source_excerpt": source.get("description", ""),
+                        "domain": _source_domain(source.get("url", "")),
+                        "source_type": "website"  # Default, can be refined later
+                    }
+                    for source in sources
+                ]))
+            
+            job.deep_research_id = research.id
+            job.status = "completed"
+            session.commit()
+            research_id = research.id
+            job_json = ResearchJobSchema.model_validate(job).model_dump_json()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in finalize_job: {str(e)}")
+            raise
+    
+    # Ingestion progress of the new item is reported on the job's events
+    link_research_sync(redis_client, job_pk, research_id)
+    publish_job_event_sync(redis_client, job_pk, "status", job_json)
+    process_research_data(research_id)
+    
+    return {
+        "status": "success",
+        "task": "finalize_job",
+        "research_id": research_id,
+        "sources_created": len(sources)
+    }
+
 # Main entry point task
 @app.task(name="research.process_data")
 def process_research_data(research_id: int):
@@ -128,7 +301,8 @@ def process_research_data(research_id: int):
         chunk_report.s(research_id),
         generate_document_embeddings.s(research_id),
         create_summaries.s(research_id),
-        process_domain_cooccurrences.s(research_id)
+        process_domain_cooccurrences.s(research_id),
+        generate_title.s(research_id)
     )
     parallel_tasks.apply_async()
     
@@ -149,7 +323,13 @@ def chunk_prompt(research_id: int):
     # Get the research record and chunk the prompt
     with get_db_sync() as session:
         try:
-            research = session.query(DeepResearch).filter(DeepResearch.id == research_id).one()
+            research = (
+                session.query(DeepResearch)
+                .options(undefer_group("bodies"))
+                .filter(DeepResearch.id == research_id)
+                .one()
+            )
+            hydrate_bodies_sync(session, [research])
             prompt_text = research.prompt_text
             
             # Generate semantic chunks
@@ -182,7 +362,9 @@ def chunk_prompt(research_id: int):
                 }
                 store_in_pinecone(vector_id, embedding, metadata)
             
+            bump_content_version(session, research_id)
             session.commit()
+            invalidate_research_sync(redis_client, research_id)
             return {
                 "status": "success", 
                 "task": "chunk_prompt", 
@@ -205,7 +387,13 @@ def chunk_report(research_id: int):
     # Similar implementation to chunk_prompt but for report text
     with get_db_sync() as session:
         try:
-            research = session.query(DeepResearch).filter(DeepResearch.id == research_id).one()
+            research = (
+                session.query(DeepResearch)
+                .options(undefer_group("bodies"))
+                .filter(DeepResearch.id == research_id)
+                .one()
+            )
+            hydrate_bodies_sync(session, [research])
             report_text = research.final_report
         
             # Generate semantic chunks
@@ -238,7 +426,9 @@ def chunk_report(research_id: int):
                 }
                 store_in_pinecone(vector_id, embedding, metadata)
             
+            bump_content_version(session, research_id)
             session.commit()
+            invalidate_research_sync(redis_client, research_id)
             return {
                 "status": "success", 
                 "task": "chunk_report", 
@@ -260,7 +450,13 @@ def generate_document_embeddings(research_id: int, chunk_results=None):
     
     with get_db_sync() as session:
         try:
-            research = session.query(DeepResearch).filter(DeepResearch.id == research_id).one()
+            research = (
+                session.query(DeepResearch)
+                .options(undefer_group("bodies"))
+                .filter(DeepResearch.id == research_id)
+                .one()
+            )
+            hydrate_bodies_sync(session, [research])
             
             # Generate embeddings for full texts
             prompt_embedding = create_embedding(research.prompt_text)
@@ -275,6 +471,8 @@ def generate_document_embeddings(research_id: int, chunk_results=None):
             research.report_tsv = func.to_tsvector('english', research.final_report)
             
             session.commit()
+            # Neighbor lists depend on the report embedding, so refresh them now that it exists
+            compute_related_research.delay(research_id)
             return {
                 "status": "success", 
                 "task": "generate_document_embeddings"
@@ -304,7 +502,13 @@ def create_summaries(research_id: int, embedding_result=None):
     
     with get_db_sync() as session:
         try:
-            research = session.query(DeepResearch).filter(DeepResearch.id == research_id).one()
+            research = (
+                session.query(DeepResearch)
+                .options(undefer_group("bodies"))
+                .filter(DeepResearch.id == research_id)
+                .one()
+            )
+            hydrate_bodies_sync(session, [research])
             
             # Count words in report and prompt
             report_word_count = len(research.final_report.split())
@@ -414,7 +618,9 @@ def create_summaries(research_id: int, embedding_result=None):
                     
                     summaries_created += 1
             
+            bump_content_version(session, research_id)
             session.commit()
+            invalidate_research_sync(redis_client, research_id)
             return {
                 "status": "success", 
                 "task": "create_summaries", 
@@ -489,6 +695,227 @@ def process_domain_cooccurrences(research_id: int, summary_result=None):
             logger.error(f"Error in process_domain_cooccurrences: {str(e)}")
             raise
 
+# Task 4b: Replace the provisional title
+@app.task(name="research.generate_title")
+def generate_title(research_id: int):
+    """
+    Task to generate a title from the prompt. New research is saved with the
+    truncated prompt as its title so that finalize_job doesn't wait on OpenAI;
+    this swaps in the generated one, unless the title was changed meanwhile.
+    """
+    logger.info(f"Generating title for research ID: {research_id}")
+    
+    with get_db_sync() as session:
+        research = (
+            session.query(DeepResearch)
+            .options(undefer_group("bodies"))
+            .filter(DeepResearch.id == research_id)
+            .one()
+        )
+        hydrate_bodies_sync(session, [research])
+        provisional_title = research.title
+        prompt_text = research.prompt_text
+    
+    # No connection is held during the OpenAI call
+    title = create_title(prompt_text)
+    if not title or title == provisional_title:
+        return {"status": "skipped", "task": "generate_title"}
+    
+    with get_db_sync() as session:
+        try:
+            result = session.execute(
+                update(DeepResearch)
+                .where(DeepResearch.id == research_id, DeepResearch.title == provisional_title)
+                .values(title=title)
+            )
+            session.commit()
+            if result.rowcount:
+                invalidate_research_sync(redis_client, research_id)
+            return {
+                "status": "success" if result.rowcount else "skipped",
+                "task": "generate_title"
+            }
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in generate_title: {str(e)}")
+            raise
+
+# Task 5: Maintain precomputed related-research neighbor lists
+@app.task(name="research.compute_related_research")
+def compute_related_research(research_id: int):
+    """
+    Compute the top-N nearest neighbors of a research item by report embedding
+    and store them in research_neighbors. The new item is also folded into the
+    lists of existing items it is closer to than their current N-th neighbor,
+    so lists stay correct incrementally without a full rebuild.
+    """
+    logger.info(f"Computing related research for research ID: {research_id}")
+    limit = settings.RELATED_RESEARCH_LIMIT
+    
+    with get_db_sync() as session:
+        try:
+            target = aliased(DeepResearch)
+            distance = DeepResearch.report_embedding.cosine_distance(target.report_embedding)
+            candidates = (
+                select(DeepResearch.id, distance.label("distance"))
+                .join(target, target.id == research_id)
+                .where(
+                    DeepResearch.id != research_id,
+                    DeepResearch.report_embedding.isnot(None),
+                    target.report_embedding.isnot(None),
+                    # The zero-vector fallback embedding yields a NaN distance,
+                    # and NaN < 2 is false, so those items never become neighbors
+                    distance < 2
+                )
+            )
+            
+            # Forward list: this item's own nearest neighbors
+            neighbors = session.execute(candidates.order_by(distance).limit(limit)).all()
+            session.execute(delete(ResearchNeighbor).where(ResearchNeighbor.deep_research_id == research_id))
+            if neighbors:
+                session.execute(pg_insert(ResearchNeighbor).values([
+                    {"deep_research_id": research_id, "neighbor_id": neighbor_id, "distance": dist}
+                    for neighbor_id, dist in neighbors
+                ]))
+            
+            # Reverse lists: items whose list is short or whose farthest neighbor
+            # is farther away than this item
+            stats = (
+                select(
+                    ResearchNeighbor.deep_research_id,
+                    func.count().label("neighbor_count"),
+                    func.max(ResearchNeighbor.distance).label("max_distance")
+                )
+                .group_by(ResearchNeighbor.deep_research_id)
+                .subquery()
+            )
+            displaced = session.execute(
+                candidates
+                .outerjoin(stats, stats.c.deep_research_id == DeepResearch.id)
+                .where(or_(
+                    stats.c.neighbor_count.is_(None),
+                    stats.c.neighbor_count < limit,
+                    distance < stats.c.max_distance
+                ))
+            ).all()
+            if displaced:
+                stmt = pg_insert(ResearchNeighbor).values([
+                    {"deep_research_id": other_id, "neighbor_id": research_id, "distance": dist}
+                    for other_id, dist in displaced
+                ])
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[ResearchNeighbor.deep_research_id, ResearchNeighbor.neighbor_id],
+                    set_={"distance": stmt.excluded.distance}
+                ))
+                
+                # Trim the touched lists back to the configured size in one statement
+                ranked = (
+                    select(
+                        ResearchNeighbor.deep_research_id,
+                        ResearchNeighbor.neighbor_id,
+                        func.row_number().over(
+                            partition_by=ResearchNeighbor.deep_research_id,
+                            order_by=ResearchNeighbor.distance
+                        ).label("rank")
+                    )
+                    .where(ResearchNeighbor.deep_research_id.in_([other_id for other_id, _ in displaced]))
+                    .subquery()
+                )
+                overflow = select(ranked.c.deep_research_id, ranked.c.neighbor_id).where(ranked.c.rank > limit)
+                session.execute(
+                    delete(ResearchNeighbor).where(
+                        tuple_(ResearchNeighbor.deep_research_id, ResearchNeighbor.neighbor_id).in_(overflow)
+                    )
+                )
+            
+            session.commit()
+            return {
+                "status": "success",
+                "task": "compute_related_research",
+                "neighbors": len(neighbors),
+                "lists_updated": len(displaced)
+            }
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in compute_related_research: {str(e)}")
+            raise
+
+@app.task(name="research.compute_neighbor_lists")
+def compute_neighbor_lists(research_ids: List[int]):
+    """
+    Replace the neighbor lists of the given research items with their current
+    top-N, in one statement for the whole batch. Only the items' own lists are
+    rewritten, which is all a full rebuild or a refill after a delete needs.
+    """
+    limit = settings.RELATED_RESEARCH_LIMIT
+    
+    with get_db_sync() as session:
+        try:
+            target = aliased(DeepResearch)
+            distance = DeepResearch.report_embedding.cosine_distance(target.report_embedding)
+            nearest = (
+                select(DeepResearch.id.label("neighbor_id"), distance.label("distance"))
+                .where(
+                    DeepResearch.id != target.id,
+                    DeepResearch.report_embedding.isnot(None),
+                    distance < 2
+                )
+                .order_by(distance)
+                .limit(limit)
+                .lateral()
+            )
+            neighbors = session.execute(
+                select(target.id, nearest.c.neighbor_id, nearest.c.distance)
+                .join(nearest, true())
+                .where(target.id.in_(research_ids), target.report_embedding.isnot(None))
+            ).all()
+            
+            session.execute(delete(ResearchNeighbor).where(ResearchNeighbor.deep_research_id.in_(research_ids)))
+            if neighbors:
+                session.execute(pg_insert(ResearchNeighbor).values([
+                    {"deep_research_id": research_id, "neighbor_id": neighbor_id, "distance": dist}
+                    for research_id, neighbor_id, dist in neighbors
+                ]))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error in compute_neighbor_lists: {str(e)}")
+            raise
+    
+    return {
+        "status": "success",
+        "task": "compute_neighbor_lists",
+        "research_processed": len(research_ids),
+        "neighbors": len(neighbors)
+    }
+
+@app.task(name="research.rebuild_related_research")
+def rebuild_related_research():
+    """
+    Recompute neighbor lists for every research item with a report embedding.
+    Intended for backfills and after changing RELATED_RESEARCH_LIMIT. The items
+    are split into batches of RELATED_RESEARCH_BATCH_SIZE that run in parallel
+    as separate compute_neighbor_lists tasks.
+    """
+    with get_db_sync() as session:
+        research_ids = session.execute(
+            select(DeepResearch.id)
+            .where(DeepResearch.report_embedding.isnot(None))
+            .order_by(DeepResearch.id)
+        ).scalars().all()
+    
+    batch_size = settings.RELATED_RESEARCH_BATCH_SIZE
+    batches = [research_ids[i:i + batch_size] for i in range(0, len(research_ids), batch_size)]
+    if batches:
+        group([compute_neighbor_lists.s(batch) for batch in batches]).apply_async()
+    
+    return {
+        "status": "success",
+        "task": "rebuild_related_research",
+        "research_queued": len(research_ids),
+        "batches": len(batches)
+    }
+
 # Utility functions
 def create_semantic_chunks(text: str, max_chunk_size: int = 1000, overlap: int = 50) -> List[str]:
     """
@@ -596,6 +1023,28 @@ def store_in_pinecone(vector_id: str, embedding: List[float], metadata: Dict[str
     except Exception as e:
         logger.error(f"Error storing in Pinecone: {str(e)}")
 
+def create_title(prompt_text: str) -> Optional[str]:
+    """
+    Generate a title of at most 255 characters for a research prompt using
+    OpenAI's API. Returns None if that fails.
+    """
+    try:
+        prompt = f"Generate a title for the following research prompt using no more than 255 characters: {prompt_text}"
+        response = openai_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that generates a title for a research report based on a prompt."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=75
+        )
+        title = response.choices[0].message.content.strip().strip('"')
+        return title[:255] or None
+    except Exception as e:
+        logger.error(f"Error creating title: {str(e)}")
+        return None
+
 def create_summary(text: str, target_length: int, model: str) -> str:
     """
     Create a summary of the given text using OpenAI's API.
@@ -0,0 +1,102 @@
+# coding: utf-8
+
+"""
+Benchmark for serializing a 100-item GET /deep-research page.
+
+Compares the previous path (validate each ORM row, dump it to a dict, add the
+computed fields, validate again, then let FastAPI encode the response) with the
+single-pass TypeAdapter path used by research_get. No database is needed; rows
+are transient ORM objects with their relationships populated.
+
+Run from backend/ with the usual environment loaded:
+
+    python -m tests.bench_deep_research_serialization
+"""
+
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import (
+    DeepResearch as DeepResearchModel,
+    ResearchChunk,
+    ResearchSource,
+    ResearchSummary,
+)
+from app.routers.deep_research import _deep_research_list_adapter, _list_response
+from app.schemas.deep_research import DeepResearch
+
+PAGE_SIZE = 100
+REPEAT = 5
+NUMBER = 20
+
+
+def build_page():
+    now = datetime.now(timezone.utc)
+    page = []
+    for i in range(PAGE_SIZE):
+        item = DeepResearchModel(
+            id=i + 1,
+            user_id=1,
+            owner_user_id=1,
+            owner_org_id=None,
+            visibility="public",
+            title=f"Research item {i}",
+            prompt_text="What are the long-term effects of remote work on urban planning? " * 4,
+            final_report="## Findings\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 300,
+            model_name="gpt-4o",
+            model_params={"temperature": 0.6, "max_tokens": 2000},
+            source_count=10,
+            created_at=now,
+            updated_at=now,
+            chunks=[
+                ResearchChunk(id=i * 10 + c, deep_research_id=i + 1, chunk_index=c, chunk_type="analysis",
+                              chunk_text="Chunk body text. " * 100, created_at=now, updated_at=now)
+                for c in range(5)
+            ],
+            summaries=[
+                ResearchSummary(id=i * 10 + s, deep_research_id=i + 1, summary_scope="report",
+                                summary_length=length, summary_text="Summary text. " * 20, created_at=now)
+                for s, length in enumerate(("veryshort", "short", "medium"))
+            ],
+            sources=[
+                ResearchSource(id=i * 10 + s, deep_research_id=i + 1, source_url=f"https://example.com/{s}",
+                               source_title="Source", domain="example.com", source_type="website", created_at=now)
+                for s in range(10)
+            ],
+        )
+        item.creator_username = "Jordan Sims"
+        page.append(item)
+    return page
+
+
+def legacy_page(page):
+    items = []
+    for item in page:
+        item_dict = DeepResearch.model_validate(item).model_dump()
+        item_dict['avg_rating'] = item.avg_rating
+        item_dict['creator_username'] = item.creator_username
+        items.append(item_dict)
+    models = [DeepResearch.model_validate(item) for item in items]
+    # FastAPI's response path: validate against the response model, encode, dump
+    models = _deep_research_list_adapter.validate_python(models)
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+def single_pass_page(page):
+    return _list_response(_deep_research_list_adapter, page, None).body
+
+
+def main():
+    page = build_page()
+    assert json.loads(legacy_page(page)) == json.loads(single_pass_page(page))
+
+    for name, fn in (("legacy", legacy_page), ("single-pass", single_pass_page)):
+        best = min(timeit.repeat(lambda: fn(page), repeat=REPEAT, number=NUMBER)) / NUMBER
+        print(f"{name:>12}: {best * 1000:.2f} ms per {PAGE_SIZE}-item page")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,9 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.main import app as application
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models import User, ApiKey
-from app.services.authentication import get_current_user, verify_api_key
+from app.services.authentication import get_current_user, get_current_user_record, verify_api_key
 
 # Mock user for authentication
 @pytest.fixture
@@ -56,7 +56,9 @@ def app(mock_user, mock_db):
     
     # Override the dependencies
     application.dependency_overrides[get_db] = override_get_db
+    application.dependency_overrides[get_read_db] = override_get_db
     application.dependency_overrides[get_current_user] = override_get_current_user
+    application.dependency_overrides[get_current_user_record] = override_get_current_user
     application.dependency_overrides[verify_api_key] = override_verify_api_key
 
     yield application
@@ -68,3 +70,13 @@ def app(mock_user, mock_db):
 def client(app) -> TestClient:
     """Test client fixture"""
     return TestClient(app)
+
+# The Redis-backed caches are exercised in their own test modules; elsewhere
+# requests go straight to the mocked database
+@pytest.fixture(autouse=True)
+def disable_redis_caches():
+    with patch("app.services.research_cache.settings.RESEARCH_CACHE_TTL", 0), \
+         patch("app.services.principal_cache.settings.PRINCIPAL_CACHE_TTL", 0), \
+         patch("app.services.api_keys.settings.API_KEY_CACHE_TTL", 0), \
+         patch("app.services.api_keys.settings.API_KEY_NEGATIVE_CACHE_TTL", 0):
+        yield
@@ -0,0 +1,109 @@
+# coding: utf-8
+
+"""In-memory stand-in for the asyncio Redis client in cache tests"""
+
+
+class FakeLock:
+    def __init__(self, redis, name):
+        self.redis = redis
+        self.name = name
+
+    async def acquire(self):
+        if self.name in self.redis.locks:
+            return False
+        self.redis.locks.add(self.name)
+        return True
+
+    async def release(self):
+        self.redis.locks.discard(self.name)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.commands.append(lambda: self.redis._incr(key))
+
+    def expire(self, key, seconds):
+        pass
+
+    def hincrby(self, key, field, amount):
+        self.commands.append(lambda: self.redis._hincrby(key, field, amount))
+
+    def hset(self, key, field, value):
+        self.commands.append(lambda: self.redis._hash(key).__setitem__(str(field), value))
+
+    async def execute(self):
+        for command in self.commands:
+            command()
+
+
+class FakeRedis:
+    """The handful of asyncio Redis calls the Redis-backed caches make"""
+
+    def __init__(self):
+        self.data = {}
+        self.locks = set()
+        self.published = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    # Applied by FakePipeline.execute
+    def _incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+    def _hash(self, key):
+        return self.data.setdefault(key, {})
+
+    def _hincrby(self, key, field, amount):
+        fields = self._hash(key)
+        fields[str(field)] = fields.get(str(field), 0) + amount
+
+    # Streams: key -> list of (id, fields), ids "<n>-0" in insertion order
+    def xadd(self, key, fields):
+        entries = self.data.setdefault(key, [])
+        entry_id = f"{len(entries) + 1}-0".encode()
+        entries.append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+        return entry_id
+
+    async def xrange(self, key, min="-", max="+"):
+        entries = self.data.get(key, [])
+        if min.startswith("("):
+            after = tuple(map(int, min[1:].split("-")))
+            entries = [e for e in entries if tuple(map(int, e[0].decode().split("-"))) > after]
+        return entries
+
+    async def xrevrange(self, key, count=None):
+        return list(reversed(self.data.get(key, [])))[:count]
+
+    def lock(self, name, timeout=None, blocking=True):
+        return FakeLock(self, name)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
@@ -0,0 +1,195 @@
+# coding: utf-8
+
+import asyncio
+import pytest
+import secrets
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.models import ApiKey, OrganizationMember, User
+from app.services.api_keys import (
+    USAGE_LAST_USED_KEY,
+    USAGE_REQUESTS_KEY,
+    authenticate_api_key,
+    flush_usage,
+    generate_api_key,
+    hash_api_key,
+    hash_legacy_keys,
+    parse_prefix,
+)
+from app.services.authentication import get_current_user
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.api_keys.settings.API_KEY_CACHE_TTL", 60), \
+         patch("app.services.api_keys.settings.API_KEY_NEGATIVE_CACHE_TTL", 30), \
+         patch("app.services.api_keys.get_redis", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def issued_key():
+    token, prefix = generate_api_key()
+    return token, ApiKey(
+        id=1,
+        token_prefix=prefix,
+        token_hash=hash_api_key(token),
+        user_id=1,
+        created_by=1,
+        is_active=True,
+        expires_at=datetime.utcnow() + timedelta(days=30)
+    )
+
+
+def _db(api_key, user=None):
+    if user is None:
+        user = User(id=1, external_id="108739423626810412115", default_role="user")
+        user.organization_memberships = [
+            OrganizationMember(organization_id=5, user_id=1, role="admin"),
+            OrganizationMember(organization_id=6, user_id=1, role="member"),
+        ]
+    key_result = MagicMock()
+    key_result.scalar_one_or_none.return_value = api_key
+    user_result = MagicMock()
+    user_result.scalar_one_or_none.return_value = user
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[key_result, user_result])
+    return db
+
+
+def test_generated_keys_are_stored_hashed(issued_key):
+    token, api_key = issued_key
+    assert api_key.token is None
+    assert token.startswith(f"drkr_{api_key.token_prefix}_")
+    assert token not in api_key.token_hash
+    assert len(api_key.token_prefix) == 16
+
+
+def test_prefix_parsing_accepts_legacy_keys():
+    token, prefix = generate_api_key()
+    assert parse_prefix(token) == prefix
+    assert parse_prefix("drkr_0123abcd_secret") == "0123abcd"
+    assert parse_prefix("drkr_0123abc_secret") is None
+    assert parse_prefix("other_0123abcd_secret") is None
+
+
+def test_valid_key_is_cached(fake_redis, issued_key):
+    """A valid key resolves to its user once and is then served from the cache"""
+    token, api_key = issued_key
+    db = _db(api_key)
+
+    first = asyncio.run(authenticate_api_key(db, token))
+    second = asyncio.run(authenticate_api_key(db, token))
+
+    assert first.id == second.id == 1
+    assert len(second.organization_memberships) == 2
+    assert db.execute.call_count == 2
+
+
+def test_invalid_key_is_negatively_cached(fake_redis, issued_key):
+    """A wrong secret with a known prefix costs one lookup, then none"""
+    token, api_key = issued_key
+    db = _db(api_key)
+    wrong = token[:-4] + "xxxx"
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(authenticate_api_key(db, wrong))
+        assert exc.value.status_code == 401
+
+    db.execute.assert_called_once()
+
+
+def test_malformed_key_skips_lookup(fake_redis):
+    db = AsyncMock()
+    with pytest.raises(HTTPException):
+        asyncio.run(authenticate_api_key(db, "not-a-drkr-key"))
+    db.execute.assert_not_called()
+
+
+def test_legacy_key_is_looked_up_by_hash(fake_redis):
+    """Keys from before the drkr_ scheme authenticate once their plaintext is hashed"""
+    token = secrets.token_urlsafe(64)
+    api_key = ApiKey(id=2, token_hash=hash_api_key(token), user_id=1, is_active=True)
+    db = _db(api_key)
+
+    principal = asyncio.run(authenticate_api_key(db, token))
+
+    assert principal.id == 1
+    sql = str(db.execute.call_args_list[0][0][0].compile(dialect=postgresql.dialect()))
+    assert "api_keys.token_prefix IS NULL AND api_keys.token_hash =" in sql
+
+
+def test_hash_legacy_keys_replaces_plaintext():
+    token = secrets.token_urlsafe(64)
+    api_key = ApiKey(id=2, token=token, user_id=1)
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = [api_key]
+
+    assert hash_legacy_keys(session) == 1
+
+    assert api_key.token is None
+    assert api_key.token_hash == hash_api_key(token)
+    session.commit.assert_called_once()
+
+
+def test_org_key_is_scoped_to_its_organization(fake_redis, issued_key):
+    """An org key acts as its creator with only that organization's membership"""
+    token, api_key = issued_key
+    api_key.user_id = None
+    api_key.organization_id = 5
+
+    principal = asyncio.run(authenticate_api_key(_db(api_key), token))
+
+    assert [m.organization_id for m in principal.organization_memberships] == [5]
+
+
+def test_get_current_user_accepts_api_key(client, app, mock_db, issued_key):
+    """Requests without a bearer token authenticate with X-API-Key"""
+    token, api_key = issued_key
+    mock_db.execute = _db(api_key).execute
+    app.dependency_overrides.pop(get_current_user)
+
+    with patch("app.routers.research_services.research_service.get_research_services",
+               AsyncMock(return_value=[])):
+        response = client.get("/api/research-services", headers={"X-API-Key": token})
+        unauthenticated = client.get("/api/research-services")
+
+    assert response.status_code == 200
+    assert unauthenticated.status_code == 401
+
+
+def test_requests_are_counted_in_redis(fake_redis, issued_key):
+    """Usage is counted in Redis on cache hits and misses, not written to Postgres"""
+    token, api_key = issued_key
+    db = _db(api_key)
+
+    for _ in range(3):
+        asyncio.run(authenticate_api_key(db, token))
+
+    assert fake_redis.data[USAGE_REQUESTS_KEY] == {"1": 3}
+    assert "1" in fake_redis.data[USAGE_LAST_USED_KEY]
+    assert db.execute.call_count == 2
+
+
+def test_flush_usage_bulk_updates_api_keys():
+    """Counters are moved aside, written in one UPDATE ... FROM VALUES, then dropped"""
+    client = MagicMock()
+    client.eval.return_value = [["1", "3", "2", "5"], ["1", "1700000000.5"]]
+    session = MagicMock()
+
+    assert flush_usage(session, client) == 2
+
+    session.execute.assert_called_once()
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE api_keys SET")
+    assert "request_count=(api_keys.request_count + usage.requests)" in sql
+    assert "FROM (VALUES" in sql
+    session.commit.assert_called_once()
+    client.delete.assert_called_once_with(f"{USAGE_REQUESTS_KEY}:flushing", f"{USAGE_LAST_USED_KEY}:flushing")
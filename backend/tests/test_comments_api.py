@@ -1,91 +1,112 @@
 # coding: utf-8
 
 from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
 
 
 from pydantic import StrictInt  # noqa: F401
 from typing import Any, List  # noqa: F401
+from app.models import ResearchComment
 from app.schemas.comment import Comment  # noqa: F401
 from app.schemas.comment_create_request import CommentCreateRequest  # noqa: F401
 from app.schemas.comment_update_request import CommentUpdateRequest  # noqa: F401
 
 
-def test_comments_comment_id_delete(client: TestClient):
+def _access_result(visibility="public", user_id=2):
+    result = MagicMock()
+    result.first.return_value = MagicMock(id=1, visibility=visibility, user_id=user_id, owner_org_id=None)
+    return result
+
+
+def _comment_result(user_id):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = ResearchComment(
+        id=7, deep_research_id=1, user_id=user_id, comment_text="Nice work"
+    )
+    return result
+
+
+def test_comments_comment_id_delete(client: TestClient, mock_db, mock_user):
     """Test case for comments_comment_id_delete
 
     Delete a comment
     """
+    mock_db.delete = AsyncMock()
+    mock_db.execute = AsyncMock(side_effect=[_comment_result(user_id=1), _access_result(), MagicMock()])
+
+    response = client.delete("/api/comments/7")
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "DELETE",
-    #    "/comments/{comment_id}".format(comment_id=56),
-    #    headers=headers,
-    #)
+    assert response.status_code == 204
+    mock_db.delete.assert_called_once()
+    assert "comment_count" in str(mock_db.execute.call_args_list[2][0][0])
+    mock_db.commit.assert_called_once()
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
 
+def test_comments_comment_id_delete_forbidden(client: TestClient, mock_db, mock_user):
+    """Only the author or the research owner may delete a comment"""
+    mock_db.delete = AsyncMock()
+    mock_db.execute = AsyncMock(side_effect=[_comment_result(user_id=3), _access_result(user_id=2)])
 
-def test_comments_comment_id_patch(client: TestClient):
+    response = client.delete("/api/comments/7")
+
+    assert response.status_code == 403
+    mock_db.delete.assert_not_called()
+
+
+def test_comments_comment_id_patch(client: TestClient, mock_db, mock_user):
     """Test case for comments_comment_id_patch
 
     Update a comment
     """
-    comment_update_request = {"comment_text":"comment_text"}
+    mock_db.execute = AsyncMock(return_value=_comment_result(user_id=1))
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "PATCH",
-    #    "/comments/{comment_id}".format(comment_id=56),
-    #    headers=headers,
-    #    json=comment_update_request,
-    #)
+    response = client.patch("/api/comments/7", json={"comment_text": "Edited"})
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
+    assert response.status_code == 200
+    assert response.json()["comment_text"] == "Edited"
+    mock_db.commit.assert_called_once()
 
 
-def test_research_id_comments_get(client: TestClient):
+def test_research_id_comments_get(client: TestClient, mock_db, mock_user):
     """Test case for research_id_comments_get
 
     Get comments for a research item
     """
+    comments_result = MagicMock()
+    comments_result.scalars.return_value.all.return_value = [
+        ResearchComment(id=7, deep_research_id=1, user_id=2, comment_text="Nice work"),
+    ]
+    mock_db.execute = AsyncMock(side_effect=[_access_result(), comments_result])
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "GET",
-    #    "/research/{id}/comments".format(id=56),
-    #    headers=headers,
-    #)
+    response = client.get("/api/research/1/comments")
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
+    assert response.status_code == 200
+    comments = response.json()
+    assert len(comments) == 1
+    assert comments[0]["comment_text"] == "Nice work"
 
 
-def test_research_id_comments_post(client: TestClient):
+def test_research_id_comments_post(client: TestClient, mock_db, mock_user):
     """Test case for research_id_comments_post
 
     Add a comment to a research item
     """
-    comment_create_request = {"comment_text":"comment_text"}
+    mock_db.add = MagicMock()
+    mock_db.execute = AsyncMock(side_effect=[_access_result(), MagicMock()])
+
+    response = client.post("/api/research/1/comments", json={"comment_text": "Great report"})
+
+    assert response.status_code == 200
+    assert response.json()["comment_text"] == "Great report"
+    statements = [str(call[0][0]) for call in mock_db.execute.call_args_list]
+    assert "FOR UPDATE" in statements[0]
+    assert "comment_count" in statements[1]
+    mock_db.commit.assert_called_once()
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "POST",
-    #    "/research/{id}/comments".format(id=56),
-    #    headers=headers,
-    #    json=comment_create_request,
-    #)
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
+def test_research_id_comments_post_empty(client: TestClient, mock_db, mock_user):
+    """Blank comments are rejected"""
+    response = client.post("/api/research/1/comments", json={"comment_text": "  "})
 
+    assert response.status_code == 400
+    mock_db.execute.assert_not_called()
@@ -5,6 +5,8 @@ from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
 import json
 from datetime import datetime, timezone
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.models import DeepResearch as DeepResearchModel
 from app.schemas.deep_research import DeepResearch
@@ -77,56 +79,42 @@ def mock_deep_research_list():
 
 def test_deep_research_get(client, mock_db, mock_user, mock_deep_research_list):
     """Test listing deep research endpoints"""
-    # Setup mock DB response for listing
-    # Create a real AsyncMock that returns a non-coroutine object
-    mock_db.execute = AsyncMock()
-    mock_db.execute.return_value = MagicMock()
-    mock_db.execute.return_value.scalars = MagicMock()
-    mock_db.execute.return_value.scalars.return_value = MagicMock()
-    mock_db.execute.return_value.scalars.return_value.all = MagicMock(return_value=mock_deep_research_list)
-    
-    # Mock response objects for validation - keeping final_report as a string
-    mock_responses = []
+    # Each row is (item, avg_rating, creator_username, sort_key)
+    rows = []
     for research in mock_deep_research_list:
-        mock_responses.append({
-            "id": research.id,
-            "user_id": research.user_id,
-            "owner_user_id": research.owner_user_id,
-            "owner_org_id": research.owner_org_id,
-            "visibility": research.visibility,
-            "title": research.title,
-            "prompt_text": research.prompt_text,
-            "final_report": research.final_report,  # Keep as string
-            "model_name": research.model_name,
-            "model_params": research.model_params,
-            "source_count": research.source_count,
-            "created_at": research.created_at.isoformat() if hasattr(research.created_at, 'isoformat') else research.created_at,
-            "updated_at": research.updated_at.isoformat() if hasattr(research.updated_at, 'isoformat') else research.updated_at
-        })
+        row = MagicMock(avg_rating=0.0, creator_username="Jordan Sims", sort_key=research.created_at)
+        row.__getitem__.return_value = research
+        rows.append(row)
+    mock_result = MagicMock()
+    mock_result.all.return_value = rows
+    mock_db.execute = AsyncMock(return_value=mock_result)
     
-    # Patch DeepResearch model_validate
-    with patch("app.routers.deep_research.DeepResearch.model_validate", side_effect=mock_responses):
+    # Rows are validated once each, straight from the ORM objects
+    with patch("app.routers.deep_research.DeepResearch.model_validate") as model_validate:
         # Execute request
         response = client.get("/api/deep-research")
-        
-        # Assert response
-        assert response.status_code == 200
-        researches = response.json()
-        assert len(researches) == 2
-        assert researches[0]["title"] == mock_deep_research_list[0].title
-        assert researches[1]["title"] == mock_deep_research_list[1].title
-        
-        # Verify DB interactions
-        mock_db.execute.assert_called_once()
+        model_validate.assert_not_called()
+    
+    # Assert response
+    assert response.status_code == 200
+    researches = response.json()
+    assert len(researches) == 2
+    assert researches[0]["title"] == mock_deep_research_list[0].title
+    assert researches[1]["title"] == mock_deep_research_list[1].title
+    assert researches[0]["creator_username"] == "Jordan Sims"
+    assert researches[0]["created_at"] == mock_deep_research_list[0].created_at.isoformat()
+    
+    # Verify DB interactions
+    mock_db.execute.assert_called_once()
 
 def test_deep_research_id_get(client, mock_db, mock_user, mock_deep_research):
     """Test getting a specific deep research by ID"""
-    # Setup mock DB response
-    mock_db.execute = AsyncMock()
-    mock_db.execute.return_value = MagicMock()
-    mock_db.execute.return_value.scalars = MagicMock()
-    mock_db.execute.return_value.scalars.return_value = MagicMock()
-    mock_db.execute.return_value.scalars.return_value.first = MagicMock(return_value=mock_deep_research)
+    # Setup mock DB responses: the version check, then the full item
+    version_result = MagicMock()
+    version_result.first.return_value = mock_deep_research
+    item_result = MagicMock()
+    item_result.scalars.return_value.first.return_value = mock_deep_research
+    mock_db.execute = AsyncMock(side_effect=[version_result, item_result])
     
     # Mock response object for validation - with model_params as a dict
     mock_response = {
@@ -156,18 +144,18 @@ def test_deep_research_id_get(client, mock_db, mock_user, mock_deep_research):
         assert research["id"] == mock_deep_research.id
         assert research["title"] == mock_deep_research.title
         assert research["visibility"] == mock_deep_research.visibility
+        assert response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
         
         # Verify DB interactions
-        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_count == 2
 
 def test_deep_research_id_get_not_found(client, mock_db, mock_user):
     """Test getting a deep research that doesn't exist"""
     # Setup mock DB response for not found
     mock_db.execute = AsyncMock()
     mock_db.execute.return_value = MagicMock()
-    mock_db.execute.return_value.scalars = MagicMock()
-    mock_db.execute.return_value.scalars.return_value = MagicMock()
-    mock_db.execute.return_value.scalars.return_value.first = MagicMock(return_value=None)
+    mock_db.execute.return_value.first = MagicMock(return_value=None)
     
     # Execute request with non-existent ID
     response = client.get("/api/deep-research/999")
@@ -264,24 +252,49 @@ def test_deep_research_post(client, mock_db, mock_user):
 def test_deep_research_id_delete(client, mock_db, mock_user, mock_deep_research):
     """Test deleting a deep research"""
     # Setup mock DB response
-    mock_db.execute = AsyncMock()
-    mock_db.execute.return_value = MagicMock()
-    mock_db.execute.return_value.scalars = MagicMock()
-    mock_db.execute.return_value.scalars.return_value = MagicMock()
-    mock_db.execute.return_value.scalars.return_value.first = MagicMock(return_value=mock_deep_research)
+    research_result = MagicMock()
+    research_result.scalars.return_value.first.return_value = mock_deep_research
+    # Items whose neighbor lists include the deleted one
+    neighbors_result = MagicMock()
+    neighbors_result.scalars.return_value.all.return_value = [4, 9]
+    mock_db.execute = AsyncMock(side_effect=[research_result, neighbors_result])
     mock_db.delete = AsyncMock()
     mock_db.commit = AsyncMock()
     
     # Execute request
-    response = client.delete(f"/api/deep-research/{mock_deep_research.id}")
+    with patch("app.routers.deep_research.compute_neighbor_lists") as compute_neighbor_lists:
+        response = client.delete(f"/api/deep-research/{mock_deep_research.id}")
     
     # Assert response
     assert response.status_code == 204  # No content
     
     # Verify DB interactions
-    mock_db.execute.assert_called_once()
+    assert mock_db.execute.call_count == 2
     mock_db.delete.assert_called_once_with(mock_deep_research)
     mock_db.commit.assert_called_once()
+    # The lists that lost the item are refilled
+    compute_neighbor_lists.delay.assert_called_once_with([4, 9])
+
+def test_deep_research_id_patch_final_report_inline(client, mock_db, mock_user, mock_deep_research):
+    """A report update with inline storage doesn't read the deferred bodies of the loaded row"""
+    # As loaded by the PATCH: prompt_text and final_report are deferred, and reading
+    # them would lazy load (which fails on an AsyncSession; here it raises as detached)
+    loaded = DeepResearchModel(id=1, user_id=1, owner_org_id=None, visibility="private", title="Test Research",
+                               body_storage=None)
+    make_transient_to_detached(loaded)
+    loaded_result = MagicMock()
+    loaded_result.scalars.return_value.first.return_value = loaded
+    updated_result = MagicMock()
+    updated_result.scalars.return_value.first.return_value = mock_deep_research
+    mock_db.execute = AsyncMock(side_effect=[loaded_result, updated_result])
+    
+    with patch("app.services.report_storage.settings.REPORT_STORAGE_MODE", "inline"):
+        response = client.patch("/api/deep-research/1", json={"final_report": "Rewritten report"})
+    
+    assert response.status_code == 200
+    assert loaded.final_report == "Rewritten report"
+    assert "prompt_text" in inspect(loaded).unloaded
+    mock_db.commit.assert_called_once()
 
 def test_deep_research_id_patch(client, mock_db, mock_user, mock_deep_research):
     """Test updating a deep research"""
@@ -345,3 +358,164 @@ def test_deep_research_id_patch(client, mock_db, mock_user, mock_deep_research):
         mock_db.commit.assert_called_once()
         mock_db.refresh.assert_called_once_with(mock_deep_research)
 
+
+def test_deep_research_id_related_get(client, mock_db, mock_user):
+    """Test reading precomputed related research for a visible item"""
+    now = datetime.now(timezone.utc)
+    access_result = MagicMock()
+    access_result.first.return_value = MagicMock(id=1, visibility="public", user_id=2, owner_org_id=None)
+    related_result = MagicMock()
+    related_result.__iter__.return_value = iter([
+        MagicMock(id=5, user_id=2, owner_org_id=None, visibility="public", title="Neighbor",
+                  model_name="gpt-4", created_at=now, distance=0.25),
+    ])
+    mock_db.execute = AsyncMock(side_effect=[access_result, related_result])
+    
+    response = client.get("/api/deep-research/1/related")
+    
+    assert response.status_code == 200
+    related = response.json()
+    assert len(related) == 1
+    assert related[0]["id"] == 5
+    assert related[0]["similarity"] == 0.75
+    # One query for the access check and one indexed lookup for the neighbors
+    assert mock_db.execute.call_count == 2
+
+def test_deep_research_id_related_get_forbidden(client, mock_db, mock_user):
+    """Test that related research is not exposed for items the user cannot see"""
+    access_result = MagicMock()
+    access_result.first.return_value = MagicMock(id=1, visibility="private", user_id=2, owner_org_id=None)
+    mock_db.execute = AsyncMock(return_value=access_result)
+    
+    response = client.get("/api/deep-research/1/related")
+    
+    assert response.status_code == 403
+    mock_db.execute.assert_called_once()
+
+def test_deep_research_get_summary_view(client, mock_db, mock_user):
+    """Test that the summary list view is a single query over list columns only"""
+    now = datetime.now(timezone.utc)
+    row = MagicMock(
+        id=1, user_id=1, owner_user_id=1, owner_org_id=None, visibility="public",
+        title="Test Research 1", model_name="gpt-4", source_count=3,
+        created_at=now, updated_at=now, rating_count=2, comment_count=4,
+        avg_rating=4.5, creator_username="Jordan Sims", summary="Short summary", sort_key=now
+    )
+    mock_result = MagicMock()
+    mock_result.all.return_value = [row]
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    
+    response = client.get("/api/deep-research?view=summary")
+    
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == 1
+    assert items[0]["title"] == "Test Research 1"
+    assert items[0]["summary"] == "Short summary"
+    assert items[0]["comment_count"] == 4
+    assert "final_report" not in items[0]
+    
+    mock_db.execute.assert_called_once()
+    sql = str(mock_db.execute.call_args[0][0])
+    assert "final_report" not in sql
+    assert "report_embedding" not in sql
+
+def test_deep_research_get_invalid_view(client, mock_db, mock_user):
+    """Test that unknown list views are rejected"""
+    response = client.get("/api/deep-research?view=everything")
+    
+    assert response.status_code == 400
+
+def _summary_row(id, created_at):
+    return MagicMock(
+        id=id, user_id=1, owner_user_id=1, owner_org_id=None, visibility="public",
+        title=f"Research {id}", model_name="gpt-4", source_count=0,
+        created_at=created_at, updated_at=created_at, rating_count=0, comment_count=0,
+        avg_rating=0.0, creator_username="Jordan Sims", summary=None, sort_key=created_at
+    )
+
+def test_deep_research_get_cursor(client, mock_db, mock_user):
+    """Test that a full page returns a cursor that seeks past its last row"""
+    now = datetime.now(timezone.utc)
+    mock_result = MagicMock()
+    mock_result.all.return_value = [_summary_row(3, now), _summary_row(2, now)]
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    
+    response = client.get("/api/deep-research?view=summary&limit=1")
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    cursor = response.headers["X-Next-Cursor"]
+    
+    mock_result.all.return_value = [_summary_row(2, now)]
+    response = client.get(f"/api/deep-research?view=summary&limit=1&cursor={cursor}")
+    
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+    sql = str(mock_db.execute.call_args[0][0])
+    assert "(deep_research.created_at, deep_research.id) <" in sql
+    assert "OFFSET" not in sql
+
+def test_deep_research_get_cursor_wrong_ordering(client, mock_db, mock_user):
+    """Test that a cursor can't be reused with a different sort order"""
+    now = datetime.now(timezone.utc)
+    mock_result = MagicMock()
+    mock_result.all.return_value = [_summary_row(3, now), _summary_row(2, now)]
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    
+    response = client.get("/api/deep-research?view=summary&limit=1")
+    cursor = response.headers["X-Next-Cursor"]
+    
+    response = client.get(f"/api/deep-research?view=summary&limit=1&order=asc&cursor={cursor}")
+    assert response.status_code == 400
+    
+    response = client.get("/api/deep-research?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+def test_deep_research_id_get_not_modified(client, mock_db, mock_user, mock_deep_research):
+    """Test that a matching If-None-Match is answered from the version check alone"""
+    mock_deep_research.visibility = "public"
+    mock_deep_research.content_version = 3
+    version_result = MagicMock()
+    version_result.first.return_value = mock_deep_research
+    item_result = MagicMock()
+    item_result.scalars.return_value.first.return_value = mock_deep_research
+    mock_db.execute = AsyncMock(side_effect=[version_result, item_result])
+    
+    response = client.get("/api/deep-research/1")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    
+    mock_db.execute = AsyncMock(return_value=version_result)
+    response = client.get("/api/deep-research/1", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    mock_db.execute.assert_called_once()
+    
+    # A new comment or rating bumps content_version and invalidates the ETag
+    mock_deep_research.content_version = 4
+    mock_db.execute = AsyncMock(side_effect=[version_result, item_result])
+    response = client.get("/api/deep-research/1", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_deep_research_id_tags_get_not_modified(client, mock_db, mock_user, mock_deep_research):
+    """Test ETag revalidation of the tag list"""
+    version_result = MagicMock()
+    version_result.first.return_value = mock_deep_research
+    tags_result = MagicMock()
+    tags_result.scalars.return_value.all.return_value = []
+    mock_db.execute = AsyncMock(side_effect=[version_result, tags_result])
+    
+    response = client.get("/api/deep-research/1/tags")
+    assert response.status_code == 200
+    assert response.json() == []
+    etag = response.headers["ETag"]
+    
+    mock_db.execute = AsyncMock(side_effect=[version_result, tags_result])
+    response = client.get("/api/deep-research/1/tags", headers={"If-None-Match": f'W/{etag}'})
+    
+    assert response.status_code == 304
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import ResearchJob
+from app.services.research import ResearchService
+from app.tasks import maintenance, research_processing
+
+RESULTS = {
+    "prompt": "What is the best way to",
+    "questions_and_answers": "",
+    "report": "report",
+    "sources": [
+        {"url": f"https://example{i}.com/page", "title": f"Source {i}", "description": "..."}
+        for i in range(300)
+    ],
+}
+
+
+def _job(status):
+    return ResearchJob(id=7, job_id="job-7", user_id=1, service="open-dr", status=status, visibility="private",
+                       prompt="prompt", model_name="o3-mini", created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+
+
+def test_completion_is_handed_to_finalize_task():
+    """The request that sees the completion only marks the job and queues the results"""
+    job = _job("running")
+    db = AsyncMock()
+
+    with patch("app.services.research.finalize_research_job") as finalize, \
+         patch("app.services.research.publish_job_event", AsyncMock()) as publish:
+        asyncio.run(ResearchService().apply_status(db, job, {"status": "complete", "results": RESULTS}))
+
+    assert job.status == "finalizing"
+    db.add.assert_not_called()
+    finalize.delay.assert_called_once_with(7, RESULTS)
+    assert '"status":"finalizing"' in publish.call_args[0][2]
+
+
+def _session(job):
+    session = MagicMock()
+    session.execute.return_value.scalar_one_or_none.return_value = job
+
+    @contextmanager
+    def get_db_sync():
+        yield session
+
+    def store_bodies(session, research, bodies):
+        research.id = 42
+
+    return session, get_db_sync, store_bodies
+
+
+def test_finalize_inserts_sources_in_one_statement():
+    job = _job("finalizing")
+    session, get_db_sync, store_bodies = _session(job)
+
+    with patch.object(research_processing, "get_db_sync", get_db_sync), \
+         patch.object(research_processing, "store_bodies_sync", side_effect=store_bodies), \
+         patch.object(research_processing, "link_research_sync") as link, \
+         patch.object(research_processing, "publish_job_event_sync") as publish, \
+         patch.object(research_processing, "process_research_data") as process:
+        result = research_processing.finalize_research_job(7, RESULTS)
+
+    assert result["sources_created"] == 300
+    # The locking select, then a single multi-row insert
+    assert session.execute.call_count == 2
+    lock_sql = str(session.execute.call_args_list[0][0][0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE" in lock_sql
+    insert = session.execute.call_args_list[1][0][0].compile(dialect=postgresql.dialect())
+    assert str(insert).startswith("INSERT INTO research_sources")
+    assert insert.params["domain_m299"] == "example299.com"
+    assert (job.status, job.deep_research_id) == ("completed", 42)
+    session.commit.assert_called_once()
+    link.assert_called_once_with(research_processing.redis_client, 7, 42)
+    assert '"status":"completed"' in publish.call_args[0][3]
+    process.assert_called_once_with(42)
+
+
+def test_finalize_runs_once():
+    job = _job("completed")
+    job.deep_research_id = 42
+    session, get_db_sync, store_bodies = _session(job)
+
+    with patch.object(research_processing, "get_db_sync", get_db_sync), \
+         patch.object(research_processing, "process_research_data") as process:
+        result = research_processing.finalize_research_job(7, RESULTS)
+
+    assert result["status"] == "skipped"
+    session.add.assert_not_called()
+    process.assert_not_called()
+
+
+def test_failed_enqueue_leaves_job_for_the_sweep():
+    job = _job("running")
+    db = AsyncMock()
+
+    with patch("app.services.research.finalize_research_job") as finalize, \
+         patch("app.services.research.publish_job_event", AsyncMock()):
+        finalize.delay.side_effect = ConnectionError("broker unavailable")
+        asyncio.run(ResearchService().apply_status(db, job, {"status": "complete", "results": RESULTS}))
+
+    assert job.status == "finalizing"
+
+
+def test_finalizing_job_is_not_cancelled():
+    job = _job("finalizing")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    with patch.object(ResearchService, "_validate_service", AsyncMock()), \
+         patch("app.services.research.service_clients") as service_clients, \
+         patch("app.services.research.ResearchJobSchema.model_validate", side_effect=lambda job: job):
+        response = asyncio.run(ResearchService().cancel_job(db, "open-dr", 1, "job-7"))
+
+    assert response.status == "finalizing"
+    service_clients.get.assert_not_called()
+    db.commit.assert_not_called()
+
+
+def test_sweep_hands_stuck_jobs_back_to_the_poller():
+    stuck, given_up = _job("finalizing"), _job("finalizing")
+    given_up.id = 8
+    session, get_db_sync, _ = _session(None)
+    session.execute.return_value.scalars.return_value.all.return_value = [stuck, given_up]
+    redis_client = MagicMock()
+    redis_client.incr.side_effect = [1, 3]
+
+    with patch.object(maintenance, "get_db_sync", get_db_sync), \
+         patch.object(maintenance, "redis_client", redis_client), \
+         patch.object(maintenance.settings, "RESEARCH_JOB_FINALIZE_MAX_ATTEMPTS", 3), \
+         patch.object(maintenance, "publish_job_event_sync") as publish:
+        result = maintenance.recover_stuck_finalizing_jobs()
+
+    assert result["jobs_recovered"] == 2
+    assert (stuck.status, given_up.status) == ("running", "failed")
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    session.commit.assert_called_once()
+    assert [call[0][1] for call in publish.call_args_list] == [7, 8]
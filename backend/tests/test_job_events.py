@@ -0,0 +1,107 @@
+# coding: utf-8
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models import ResearchJob
+from app.services import job_events
+from app.services.job_events import job_event_hub, job_event_stream
+from tests.fake_redis import FakeRedis
+
+STREAM_KEY = "research-job-events:7"
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.job_events.get_redis", return_value=redis), \
+         patch.object(job_event_hub, "start"):
+        yield redis
+
+
+def _status(status):
+    return json.dumps({"id": 7, "status": status})
+
+
+def _request():
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+    return request
+
+
+async def _collect(stream, count):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if len(chunks) == count:
+            break
+    await stream.aclose()
+    return chunks
+
+
+def test_resume_replays_events_after_last_event_id(fake_redis):
+    fake_redis.xadd(STREAM_KEY, {"event": "status", "data": _status("running")})
+    fake_redis.xadd(STREAM_KEY, {"event": "stage", "data": '{"stage": "chunk_report"}'})
+    fake_redis.xadd(STREAM_KEY, {"event": "status", "data": _status("failed")})
+
+    stream = job_event_stream(_request(), 7, _status("running"), "running", last_event_id="1-0")
+    chunks = asyncio.run(_collect(stream, 10))
+
+    assert chunks[0] == "retry: 3000\n\n"
+    assert chunks[1] == 'id: 2-0\nevent: stage\ndata: {"stage": "chunk_report"}\n\n'
+    assert chunks[2].startswith("id: 3-0\nevent: status\n")
+    # A failed job ends the stream
+    assert len(chunks) == 3
+
+
+def test_live_events_and_heartbeats(fake_redis):
+    """Watchers get a snapshot, then pub/sub events fanned out by the hub, with heartbeats in between"""
+    fake_redis.xadd(STREAM_KEY, {"event": "status", "data": _status("running")})
+
+    async def run():
+        stream = job_event_stream(_request(), 7, _status("running"), "running")
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        # Subscribed now; nothing published yet
+        chunks.append(await stream.__anext__())
+        job_event_hub._dispatch(json.dumps({"job": 7, "id": "2-0", "event": "status", "data": _status("completed")}))
+        job_event_hub._dispatch(json.dumps({"job": 8, "id": "3-0", "event": "status", "data": _status("failed")}))
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    with patch("app.services.job_events.settings.SSE_HEARTBEAT_INTERVAL", 0.01):
+        chunks = asyncio.run(run())
+
+    assert chunks[1] == f"id: 1-0\nevent: status\ndata: {_status('running')}\n\n"
+    assert chunks[2] == ": heartbeat\n\n"
+    assert chunks[3] == f"id: 2-0\nevent: status\ndata: {_status('completed')}\n\n"
+    assert job_event_hub._subscribers == {}
+
+
+def test_events_endpoint(client, mock_db, fake_redis):
+    job = ResearchJob(id=7, job_id="job-7", user_id=1, service="open-dr", status="failed", visibility="private",
+                      prompt="prompt", model_name="o3-mini", created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+    mock_db.get = AsyncMock(return_value=job)
+
+    response = client.get("/api/research-jobs/7/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert '"status":"failed"' in response.text
+
+    mock_db.get = AsyncMock(return_value=None)
+    assert client.get("/api/research-jobs/7/events").status_code == 404
+
+
+def test_publish_appends_and_announces():
+    client = MagicMock()
+    job_events.publish_job_event_sync(client, 7, "stage", '{"stage": "chunk_prompt"}')
+
+    script, numkeys, key, *args = client.eval.call_args[0]
+    assert "XADD" in script and "PUBLISH" in script
+    assert (numkeys, key) == (1, STREAM_KEY)
+    assert job_events.EVENTS_CHANNEL in args
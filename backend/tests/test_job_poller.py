@@ -0,0 +1,189 @@
+# coding: utf-8
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from redis.exceptions import LockNotOwnedError
+from sqlalchemy.dialects import postgresql
+
+from app.models import ResearchJob
+from app.services import job_poller as job_poller_module
+from app.services.job_poller import JobPoller
+from app.services.job_status import record_job_status
+from app.services.research import ResearchService
+from app.services.service_clients import HttpClientConfig, ServiceClientPool
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.job_status.get_redis", return_value=redis):
+        yield redis
+
+
+def _job(pk, status="running"):
+    return ResearchJob(id=pk, job_id=f"job-{pk}", user_id=1, service="open-dr", status=status)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _poller(jobs, upstream_statuses):
+    """A poller over the given jobs whose service reports the statuses in turn"""
+    statuses = iter(upstream_statuses)
+    service = MagicMock()
+
+    async def fetch_statuses(db, service_key, due_jobs):
+        status = next(statuses)
+        return {job.id: {"status": status} for job in due_jobs}
+
+    async def apply_status(db, job, result):
+        job.status = result["status"]
+
+    service.fetch_statuses = AsyncMock(side_effect=fetch_statuses)
+    service.apply_status = AsyncMock(side_effect=apply_status)
+
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = jobs
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock(return_value=db)
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return JobPoller(service), session_factory
+
+
+def test_jobs_are_polled_once_per_batch_and_back_off(fake_redis):
+    """All due jobs of a service go in one fetch; unchanged jobs are polled less often"""
+    jobs = [_job(1), _job(2)]
+    poller, session_factory = _poller(jobs, ["running", "running", "running", "completed"])
+    clock = _Clock()
+
+    async def tick(at):
+        clock.now = at
+        return await poller.poll_once()
+
+    with patch.object(job_poller_module, "AsyncSessionLocal", session_factory), \
+         patch("app.services.job_poller.time.monotonic", clock), \
+         patch("app.services.job_poller.settings.RESEARCH_JOB_POLL_MIN_INTERVAL", 5), \
+         patch("app.services.job_poller.settings.RESEARCH_JOB_POLL_MAX_INTERVAL", 60):
+        assert asyncio.run(tick(1000)) == 2
+        assert asyncio.run(tick(1001)) == 0    # not due yet
+        assert asyncio.run(tick(1005)) == 2    # unchanged, next interval is 10s
+        assert asyncio.run(tick(1010)) == 0
+        assert asyncio.run(tick(1015)) == 2
+        assert asyncio.run(tick(1035)) == 2    # status changed
+
+    assert poller.research_service.fetch_statuses.call_count == 4
+    assert [job.status for job in jobs] == ["completed", "completed"]
+    assert '"completed"' in fake_redis.data["research-job-status:1"]
+
+
+def test_fresh_status_is_served_without_upstream_call(fake_redis):
+    job = _job(1)
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    service = ResearchService()
+
+    async def run():
+        await record_job_status(1, "running")
+        return await service.poll_status(db, user_id=1, id=1)
+
+    with patch.object(ResearchService, "_validate_service", AsyncMock()), \
+         patch.object(ResearchService, "_request_status", AsyncMock()) as request_status, \
+         patch("app.services.research.ResearchJobSchema.model_validate", side_effect=lambda job: job):
+        response = asyncio.run(run())
+
+    assert response["job"] is job
+    request_status.assert_not_called()
+
+
+def test_job_awaiting_answers_is_served_without_upstream_call(fake_redis):
+    job = _job(1, status="pending_answers")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    with patch.object(ResearchService, "_request_status", AsyncMock()) as request_status, \
+         patch("app.services.research.ResearchJobSchema.model_validate", side_effect=lambda job: job):
+        response = asyncio.run(ResearchService().poll_status(db, user_id=1, id=1))
+
+    assert response["job"] is job
+    request_status.assert_not_called()
+
+
+def test_batch_status_endpoint_is_used_when_configured():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"jobs": [
+            {"job_id": "job-1", "status": "running"},
+            {"job_id": "job-2", "status": "complete"},
+        ]})
+
+    pool = ServiceClientPool({"open-dr": HttpClientConfig(status_batch_path="/research/status/batch")})
+    service = ResearchService()
+
+    async def run():
+        pool._clients["open-dr"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("app.services.research.service_clients", pool), \
+             patch.object(ResearchService, "_get_service_config", AsyncMock(return_value={"url": "http://opendr.test"})):
+            statuses = await service.fetch_statuses(AsyncMock(), "open-dr", [_job(1), _job(2)])
+        await pool.close()
+        return statuses
+
+    statuses = asyncio.run(run())
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/research/status/batch"
+    assert statuses == {1: {"job_id": "job-1", "status": "running"}, 2: {"job_id": "job-2", "status": "complete"}}
+
+
+def test_jobs_awaiting_answers_are_not_polled(fake_redis):
+    poller, session_factory = _poller([], [])
+
+    with patch.object(job_poller_module, "AsyncSessionLocal", session_factory):
+        asyncio.run(poller.poll_once())
+
+    db = session_factory.return_value.__aenter__.return_value
+    sql = db.execute.call_args[0][0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    assert "'pending_answers'" in str(sql)
+
+
+def test_leader_lock_is_renewed_before_each_batch(fake_redis):
+    poller, session_factory = _poller([_job(1)], ["running"])
+    poller._leader = MagicMock()
+    poller._leader.reacquire = AsyncMock(side_effect=LockNotOwnedError("expired"))
+
+    with patch.object(job_poller_module, "AsyncSessionLocal", session_factory):
+        assert asyncio.run(poller.poll_once()) == 0
+
+    poller._leader.reacquire.assert_awaited_once()
+    poller.research_service.fetch_statuses.assert_not_called()
+
+
+def test_slow_batch_is_cut_off_before_the_lock_expires(fake_redis):
+    poller, session_factory = _poller([_job(1)], [])
+
+    async def hang(db, service_key, due_jobs):
+        await asyncio.sleep(10)
+
+    poller.research_service.fetch_statuses = AsyncMock(side_effect=hang)
+
+    with patch.object(job_poller_module, "AsyncSessionLocal", session_factory), \
+         patch.object(job_poller_module, "LEADER_TIMEOUT", 0.05):
+        assert asyncio.run(poller.poll_once()) == 0
+
+    poller.research_service.apply_status.assert_not_called()
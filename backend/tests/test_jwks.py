@@ -0,0 +1,76 @@
+# coding: utf-8
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+from app.services import authentication
+from app.services.authentication import VerifiedTokenCache, verify_jwt_token
+from app.services.jwks import JwksManager
+
+
+def _manager_with_keys(*rounds):
+    """A manager whose successive fetches return the given kid lists"""
+    manager = JwksManager("https://example.test/.well-known/jwks.json")
+    rounds = iter(rounds)
+
+    async def fetch():
+        manager._keys = {kid: {"kid": kid} for kid in next(rounds)}
+        manager._fetched_at = time.monotonic()
+
+    manager._fetch = AsyncMock(side_effect=fetch)
+    return manager
+
+
+def test_unknown_kid_triggers_refresh():
+    """A key rotation is picked up by the first token signed with the new key"""
+    manager = _manager_with_keys(["old"], ["old", "new"])
+
+    async def run():
+        assert await manager.get_key("old") == {"kid": "old"}
+        with patch("app.services.jwks.settings.JWKS_MIN_REFRESH_INTERVAL", 0):
+            return await manager.get_key("new")
+
+    assert asyncio.run(run()) == {"kid": "new"}
+    assert manager._fetch.call_count == 2
+
+
+def test_unknown_kid_refreshes_are_throttled():
+    """Made-up kids don't refetch the key set more than once per interval"""
+    manager = _manager_with_keys(["old"], ["old"])
+
+    async def run():
+        await manager.get_key("old")
+        with patch("app.services.jwks.settings.JWKS_MIN_REFRESH_INTERVAL", 30):
+            return [await manager.get_key("bogus") for _ in range(5)]
+
+    assert asyncio.run(run()) == [None] * 5
+    manager._fetch.assert_called_once()
+
+
+def test_verified_token_skips_verification():
+    """A token that verified once is answered from the cache until exp"""
+    claims = {"sub": "google-oauth2|1", "exp": time.time() + 60}
+    cache = VerifiedTokenCache(10)
+    jwks = _manager_with_keys(["kid-1"])
+
+    with patch.object(authentication, "verified_tokens", cache), \
+         patch.object(authentication, "jwks_manager", jwks), \
+         patch("app.services.authentication.jwt.get_unverified_header", return_value={"alg": "RS256", "kid": "kid-1"}), \
+         patch("app.services.authentication.jwt.decode", return_value=claims) as decode:
+        assert asyncio.run(verify_jwt_token("token")) == claims
+        assert asyncio.run(verify_jwt_token("token")) == claims
+
+    decode.assert_called_once()
+
+
+def test_verified_token_cache_expiry_and_eviction():
+    cache = VerifiedTokenCache(2)
+    cache.put("expired", {"exp": time.time() - 1})
+    cache.put("a", {"exp": time.time() + 60})
+    cache.put("b", {"exp": time.time() + 60})
+    cache.put("c", {"exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
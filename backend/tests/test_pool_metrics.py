@@ -0,0 +1,99 @@
+# coding: utf-8
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc
+
+from app.db.database import async_engine, engine
+from app.db import pool_metrics
+from app.db.pool_metrics import instrumented_pool_class, start_metrics_server
+from app.tasks import research_processing
+
+
+def _sample(name, label):
+    return REGISTRY.get_sample_value(name, {"engine": label}) or 0
+
+
+def _pool(label, pool_size=1, max_overflow=1):
+    pool_class = instrumented_pool_class(label, is_async=False)
+    return pool_class(MagicMock, pool_size=pool_size, max_overflow=max_overflow, timeout=0.01)
+
+
+def test_engines_use_instrumented_pools():
+    assert engine.pool.metrics_label == "sync"
+    assert async_engine.pool.metrics_label == "async"
+
+
+def test_checkouts_are_timed_and_in_use_tracked():
+    pool = _pool("test-in-use")
+
+    connection = pool.connect()
+    assert _sample("db_pool_checkout_seconds_count", "test-in-use") == 1
+    assert _sample("db_pool_connections_in_use", "test-in-use") == 1
+
+    connection.close()
+    assert _sample("db_pool_connections_in_use", "test-in-use") == 0
+
+
+def test_overflow_and_timeouts_are_counted():
+    pool = _pool("test-overflow")
+
+    held = [pool.connect(), pool.connect()]
+    assert _sample("db_pool_overflow_total", "test-overflow") == 1
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    assert _sample("db_pool_timeouts_total", "test-overflow") == 1
+    assert _sample("db_pool_checkout_seconds_count", "test-overflow") == 3
+
+    for connection in held:
+        connection.close()
+
+
+def test_reused_overflow_connections_are_not_counted_again():
+    pool = _pool("test-overflow-reuse")
+    held = pool.connect()
+
+    # The overflow connection opened first goes back to the idle queue and is reused
+    for _ in range(3):
+        pool.connect().close()
+    assert _sample("db_pool_overflow_total", "test-overflow-reuse") == 1
+
+    held.close()
+
+
+def test_metrics_are_not_served_by_the_api(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_server_runs_on_its_own_port():
+    with patch.object(pool_metrics, "start_http_server") as start_http_server, \
+         patch.object(pool_metrics.settings, "METRICS_HOST", "10.0.0.5"):
+        start_metrics_server(0)
+        start_http_server.assert_not_called()
+
+        assert start_metrics_server(9100) == 9100
+        start_http_server.assert_called_once_with(9100, addr="10.0.0.5")
+
+        # All ports taken by other workers is logged, not raised
+        start_http_server.side_effect = OSError("Address already in use")
+        assert start_metrics_server(9100) is None
+
+
+def test_api_workers_take_the_next_free_metrics_port():
+    with patch.object(pool_metrics, "start_http_server",
+                      side_effect=[OSError("Address already in use"), OSError("Address already in use"), None]) as start:
+        assert start_metrics_server(9100, 4) == 9102
+
+    assert [call.args[0] for call in start.call_args_list] == [9100, 9101, 9102]
+
+
+def test_celery_pool_processes_serve_their_metrics():
+    with patch.object(research_processing, "current_process", return_value=MagicMock(index=2)), \
+         patch.object(research_processing.settings, "CELERY_METRICS_PORT", 9110), \
+         patch.object(research_processing, "start_metrics_server") as start:
+        research_processing.serve_worker_metrics()
+
+    start.assert_called_once_with(9112)
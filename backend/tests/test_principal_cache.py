@@ -0,0 +1,75 @@
+# coding: utf-8
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models import OrganizationMember, User
+from app.services.authentication import get_current_user, get_current_user_record
+from app.services.principal_cache import Principal, invalidate_principals
+from tests.fake_redis import FakeRedis
+
+TOKEN_CLAIMS = {"sub": "google-oauth2|108739423626810412115"}
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.principal_cache.settings.PRINCIPAL_CACHE_TTL", 60), \
+         patch("app.services.principal_cache.get_redis", return_value=redis), \
+         patch("app.services.authentication.verify_jwt_token", AsyncMock(return_value=TOKEN_CLAIMS)):
+        yield redis
+
+
+@pytest.fixture
+def user_db():
+    user = User(id=1, external_id="108739423626810412115", default_role="user")
+    user.organization_memberships = [OrganizationMember(organization_id=5, user_id=1, role="admin")]
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    result.scalars.return_value.all.return_value = [user.external_id]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def test_principal_served_from_cache(fake_redis, user_db):
+    """The second request with the same sub resolves the user without a query"""
+    first = asyncio.run(get_current_user(token="token", db=user_db))
+    second = asyncio.run(get_current_user(token="token", db=user_db))
+
+    assert isinstance(first, Principal)
+    assert second == first
+    assert second.organization_memberships[0].organization_id == 5
+    assert second.organization_memberships[0].role == "admin"
+    user_db.execute.assert_called_once()
+
+
+def test_membership_change_invalidates_principal(fake_redis, user_db):
+    """After invalidation the next request reloads the user and memberships"""
+    asyncio.run(get_current_user(token="token", db=user_db))
+    asyncio.run(invalidate_principals(user_db, 1))
+    user_db.execute.reset_mock()
+
+    asyncio.run(get_current_user(token="token", db=user_db))
+
+    user_db.execute.assert_called_once()
+
+
+def test_principal_cache_disabled(user_db):
+    """With PRINCIPAL_CACHE_TTL=0 every request loads the user"""
+    with patch("app.services.authentication.verify_jwt_token", AsyncMock(return_value=TOKEN_CLAIMS)):
+        asyncio.run(get_current_user(token="token", db=user_db))
+        asyncio.run(get_current_user(token="token", db=user_db))
+
+    assert user_db.execute.call_count == 2
+
+
+def test_profile_endpoints_load_the_users_row(fake_redis, user_db):
+    """get_current_user_record turns the (possibly cached) principal into the full row"""
+    principal = asyncio.run(get_current_user(token="token", db=user_db))
+    row = User(id=1, external_id="108739423626810412115", username="jordan")
+    user_db.get = AsyncMock(return_value=row)
+
+    assert asyncio.run(get_current_user_record(current_user=principal, db=user_db)) is row
+    user_db.get.assert_awaited_once_with(User, 1)
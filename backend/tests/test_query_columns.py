@@ -0,0 +1,64 @@
+# coding: utf-8
+
+"""
+Audit of the DeepResearch columns each query loads. Bodies, tsvectors and
+embeddings are deferred, so only endpoints that render them may select them.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models import DeepResearch as DeepResearchModel
+from app.routers.deep_research import get_deep_research_options
+
+BODY_COLUMNS = ("prompt_text", "questions_and_answers", "final_report")
+SEARCH_COLUMNS = ("prompt_tsv", "report_tsv", "prompt_embedding", "report_embedding")
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _selected_columns(sql: str) -> str:
+    # Only the column list, so WHERE/ORDER BY references don't count as loads
+    return sql.split(" FROM ", 1)[0]
+
+
+def test_plain_select_skips_heavy_columns():
+    """A bare select(DeepResearchModel) loads neither bodies nor search columns"""
+    columns = _selected_columns(_sql(select(DeepResearchModel)))
+
+    assert "deep_research.visibility" in columns
+    for column in BODY_COLUMNS + SEARCH_COLUMNS:
+        assert column not in columns
+
+
+def test_full_item_options_load_bodies_only():
+    """Full responses undefer the bodies but never the embeddings"""
+    columns = _selected_columns(_sql(select(DeepResearchModel).options(*get_deep_research_options())))
+
+    for column in BODY_COLUMNS:
+        assert f"deep_research.{column}" in columns
+    for column in SEARCH_COLUMNS:
+        assert column not in columns
+
+
+def test_permission_checks_skip_heavy_columns(client, mock_db, mock_user):
+    """The queries behind delete, patch and tags only read small columns"""
+    research = DeepResearchModel(id=1, user_id=2, owner_org_id=None, visibility="private")
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = research
+    result.first.return_value = research
+    mock_db.execute = AsyncMock(return_value=result)
+
+    client.delete("/api/deep-research/1")
+    client.patch("/api/deep-research/1", json={"title": "New title"})
+    client.get("/api/deep-research/1/tags")
+
+    assert mock_db.execute.call_count == 3
+    for call in mock_db.execute.call_args_list:
+        columns = _selected_columns(_sql(call[0][0]))
+        for column in BODY_COLUMNS + SEARCH_COLUMNS:
+            assert column not in columns
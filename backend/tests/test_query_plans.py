@@ -0,0 +1,190 @@
+# coding: utf-8
+
+"""
+Query-plan regression tests for the hot read paths.
+
+Seeds a synthetic dataset into a throwaway schema of the Postgres database at
+QUERY_PLAN_DATABASE_URL (a sync SQLAlchemy URL; the vector and pg_trgm
+extensions must be installable), runs EXPLAIN on each query and fails if its
+plan sequentially scans a table with more than SEQ_SCAN_ROW_LIMIT rows.
+Skipped when the variable isn't set; the index definitions themselves are
+checked regardless.
+"""
+
+import json
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.db.database import Base
+from app.db.search import contains
+from app.models import (
+    DeepResearch,
+    DeepResearchTag,
+    ResearchAutoMetadata,
+    ResearchChunk,
+    ResearchComment,
+    ResearchJob,
+    ResearchSource,
+    ResearchSummary,
+    User,
+)
+
+DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+requires_database = pytest.mark.skipif(not DATABASE_URL, reason="QUERY_PLAN_DATABASE_URL is not set")
+
+# Tables at least this large must be reached through an index
+SEQ_SCAN_ROW_LIMIT = 1000
+ITEMS = 20000
+USERS = 20000
+ORGANIZATIONS = 50
+
+SEED = f"""
+INSERT INTO organizations (name)
+  SELECT 'org ' || g FROM generate_series(1, {ORGANIZATIONS}) g;
+
+INSERT INTO users (external_id, username, email, display_name)
+  SELECT 'ext-' || g, 'user' || g, 'user' || g || '@example.com', 'User ' || g FROM generate_series(1, {USERS}) g;
+
+INSERT INTO tags (name, is_global)
+  SELECT 'tag ' || g, TRUE FROM generate_series(1, 200) g;
+
+INSERT INTO deep_research (user_id, owner_user_id, owner_org_id, visibility, title, prompt_text, final_report, model_name, created_at)
+  SELECT 1 + g % {USERS}, 1 + g % {USERS},
+         CASE WHEN g % 3 = 0 THEN 1 + g % {ORGANIZATIONS} END,
+         (ARRAY['public', 'private', 'org'])[1 + g % 3]::visibility,
+         'Research ' || g, 'prompt ' || g, 'report ' || g, 'model-' || g % 500,
+         now() - g * interval '1 minute'
+  FROM generate_series(1, {ITEMS}) g;
+
+INSERT INTO research_chunks (deep_research_id, chunk_index, chunk_type, chunk_text)
+  SELECT r, i, 'report', 'chunk ' || i FROM generate_series(1, {ITEMS}) r, generate_series(0, 4) i;
+
+INSERT INTO research_sources (deep_research_id, source_url, domain)
+  SELECT r, 'https://example' || i || '.com/' || r, 'example' || i || '.com'
+  FROM generate_series(1, {ITEMS}) r, generate_series(1, 5) i;
+
+INSERT INTO research_summaries (deep_research_id, summary_scope, summary_length, summary_text)
+  SELECT r, 'report', length, 'summary' FROM generate_series(1, {ITEMS}) r, unnest(ARRAY['short', 'long']) length;
+
+INSERT INTO research_comments (deep_research_id, user_id, comment_text)
+  SELECT r, 1 + r % {USERS}, 'comment' FROM generate_series(1, {ITEMS}) r;
+
+INSERT INTO research_auto_metadata (deep_research_id, meta_key, meta_value)
+  SELECT r, 'keyword', 'keyword ' || r FROM generate_series(1, {ITEMS}) r;
+
+INSERT INTO deep_research_tags (deep_research_id, tag_id)
+  SELECT r, t FROM generate_series(1, {ITEMS}) r, LATERAL (VALUES (1 + r % 100), (101 + r % 100)) tags(t);
+
+INSERT INTO research_jobs (job_id, user_id, status, service, model_name, visibility, deep_research_id, created_at)
+  SELECT 'job-' || g, 1 + g % {USERS},
+         (ARRAY['running', 'completed', 'failed', 'cancelled'])[1 + g % 4],
+         'open-dr', 'o3-mini', 'private'::visibility,
+         CASE WHEN g % 4 = 1 THEN g END,
+         now() - g * interval '1 minute'
+  FROM generate_series(1, {ITEMS}) g;
+"""
+
+ITEM_IDS = list(range(1, 21))
+
+
+def _newest_first(query, model):
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(21)
+
+
+# The queries behind the list endpoints and the selectin loads of an item page
+HOT_QUERIES = {
+    "research by creator": lambda: _newest_first(
+        select(DeepResearch).where(DeepResearch.user_id == 7), DeepResearch
+    ),
+    "research of an organization": lambda: _newest_first(
+        select(DeepResearch).where(DeepResearch.owner_org_id == 3, DeepResearch.visibility == "org"), DeepResearch
+    ),
+    "research by tag": lambda: select(DeepResearchTag.deep_research_id).where(DeepResearchTag.tag_id == 7),
+    "chunks of items": lambda: select(ResearchChunk).where(ResearchChunk.deep_research_id.in_(ITEM_IDS)),
+    "sources of items": lambda: select(ResearchSource).where(ResearchSource.deep_research_id.in_(ITEM_IDS)),
+    "summaries of items": lambda: select(ResearchSummary).where(ResearchSummary.deep_research_id.in_(ITEM_IDS)),
+    "metadata of items": lambda: select(ResearchAutoMetadata).where(ResearchAutoMetadata.deep_research_id.in_(ITEM_IDS)),
+    "comments of items": lambda: select(ResearchComment).where(ResearchComment.deep_research_id.in_(ITEM_IDS)),
+    "comments of an item": lambda: (
+        select(ResearchComment)
+        .where(ResearchComment.deep_research_id == 5)
+        .order_by(ResearchComment.created_at, ResearchComment.id)
+    ),
+    "jobs of items": lambda: select(ResearchJob).where(ResearchJob.deep_research_id.in_(ITEM_IDS)),
+    "users by substring": lambda: select(User).where(
+        contains((User.username, User.display_name, User.email), "er1234")
+    ),
+    "research by model name": lambda: select(DeepResearch).where(contains([DeepResearch.model_name], "del-123")),
+    "jobs of a user": lambda: _newest_first(select(ResearchJob).where(ResearchJob.user_id == 7), ResearchJob),
+    "jobs of a user by status": lambda: _newest_first(
+        select(ResearchJob).where(ResearchJob.user_id == 7, ResearchJob.status == "running"), ResearchJob
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    schema = f"query_plans_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema},public"})
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text("CREATE TYPE visibility AS ENUM ('private', 'public', 'org')"))
+        Base.metadata.create_all(conn)
+        conn.execute(text(SEED))
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+        row_counts = dict(conn.execute(text(
+            "SELECT relname, reltuples FROM pg_class "
+            "WHERE relnamespace = CAST(:schema AS regnamespace) AND relkind = 'r'"
+        ), {"schema": schema}).all())
+    try:
+        yield engine, row_counts
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+def _seq_scans(plan):
+    if plan["Node Type"] == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def test_hot_columns_lead_an_index():
+    """Each filtered column is the leading column of an index on its table"""
+    leading = {
+        (table.name, index.expressions[0].name)
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if hasattr(index.expressions[0], "name")
+    }
+    for column in (
+        DeepResearch.user_id, DeepResearch.owner_org_id, DeepResearchTag.tag_id, ResearchChunk.deep_research_id,
+        ResearchSource.deep_research_id, ResearchSummary.deep_research_id, ResearchComment.deep_research_id,
+        ResearchAutoMetadata.deep_research_id, ResearchJob.user_id, ResearchJob.deep_research_id,
+    ):
+        assert (column.table.name, column.name) in leading
+
+
+@requires_database
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(seeded_db, name):
+    engine, row_counts = seeded_db
+    # The connected dialect renders string literals (LIKE patterns, escapes) the way this server reads them
+    sql = HOT_QUERIES[name]().compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scanned = [table for table in _seq_scans(plan[0]["Plan"]) if row_counts.get(table, 0) > SEQ_SCAN_ROW_LIMIT]
+    assert not scanned, f"{name} sequentially scans {', '.join(scanned)}:\n{json.dumps(plan, indent=2)}"
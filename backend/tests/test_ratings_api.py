@@ -1,6 +1,8 @@
 # coding: utf-8
 
 from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timezone
 
 
 from pydantic import StrictInt  # noqa: F401
@@ -9,42 +11,85 @@ from app.schemas.rating import Rating  # noqa: F401
 from app.schemas.rating_create_request import RatingCreateRequest  # noqa: F401
 
 
-def test_research_id_ratings_get(client: TestClient):
+def _access_result(visibility="public", user_id=2):
+    result = MagicMock()
+    result.first.return_value = MagicMock(id=1, visibility=visibility, user_id=user_id, owner_org_id=None)
+    return result
+
+
+def test_research_id_ratings_get(client: TestClient, mock_db, mock_user):
     """Test case for research_id_ratings_get
 
     Get ratings for a research item
     """
+    now = datetime.now(timezone.utc)
+    ratings_result = MagicMock()
+    ratings_result.scalars.return_value.all.return_value = [
+        MagicMock(id=3, rating_value=4, user_id=2, deep_research_id=1, created_at=now),
+    ]
+    mock_db.execute = AsyncMock(side_effect=[_access_result(), ratings_result])
+
+    response = client.get("/api/research/1/ratings")
+
+    assert response.status_code == 200
+    ratings = response.json()
+    assert len(ratings) == 1
+    assert ratings[0]["rating_value"] == 4
+
+
+def test_research_id_ratings_get_forbidden(client: TestClient, mock_db, mock_user):
+    """Ratings of private research owned by someone else are hidden"""
+    mock_db.execute = AsyncMock(return_value=_access_result(visibility="private"))
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "GET",
-    #    "/research/{id}/ratings".format(id=56),
-    #    headers=headers,
-    #)
+    response = client.get("/api/research/1/ratings")
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
+    assert response.status_code == 403
 
 
-def test_research_id_ratings_post(client: TestClient):
+def test_research_id_ratings_post(client: TestClient, mock_db, mock_user):
     """Test case for research_id_ratings_post
 
     Add or update a rating for a research item
     """
-    rating_create_request = {"rating_value":0}
+    now = datetime.now(timezone.utc)
+    previous_result = MagicMock()
+    previous_result.scalar_one_or_none.return_value = None
+    upsert_result = MagicMock()
+    upsert_result.one.return_value = MagicMock(id=3, rating_value=5, user_id=1, deep_research_id=1, created_at=now)
+    mock_db.execute = AsyncMock(side_effect=[_access_result(), previous_result, upsert_result, MagicMock()])
+
+    response = client.post("/api/research/1/ratings", json={"rating_value": 5})
+
+    assert response.status_code == 200
+    assert response.json()["rating_value"] == 5
+    # The parent row is locked, the rating upserted and the aggregates bumped in one transaction
+    statements = [str(call[0][0]) for call in mock_db.execute.call_args_list]
+    assert "FOR UPDATE" in statements[0]
+    assert "ON CONFLICT" in statements[2]
+    assert "rating_sum" in statements[3]
+    mock_db.commit.assert_called_once()
+
+
+def test_research_id_ratings_post_replaces_previous(client: TestClient, mock_db, mock_user):
+    """Re-rating adjusts rating_sum by the difference without counting a new rating"""
+    now = datetime.now(timezone.utc)
+    previous_result = MagicMock()
+    previous_result.scalar_one_or_none.return_value = 2
+    upsert_result = MagicMock()
+    upsert_result.one.return_value = MagicMock(id=3, rating_value=5, user_id=1, deep_research_id=1, created_at=now)
+    mock_db.execute = AsyncMock(side_effect=[_access_result(), previous_result, upsert_result, MagicMock()])
+
+    response = client.post("/api/research/1/ratings", json={"rating_value": 5})
+
+    assert response.status_code == 200
+    params = mock_db.execute.call_args_list[3][0][0].compile().params
+    assert params["rating_count_1"] == 0
+    assert params["rating_sum_1"] - params["param_1"] == 3
 
-    headers = {
-    }
-    # uncomment below to make a request
-    #response = client.request(
-    #    "POST",
-    #    "/research/{id}/ratings".format(id=56),
-    #    headers=headers,
-    #    json=rating_create_request,
-    #)
 
-    # uncomment below to assert the status code of the HTTP response
-    #assert response.status_code == 200
+def test_research_id_ratings_post_invalid_value(client: TestClient, mock_db, mock_user):
+    """Ratings outside 1-5 are rejected before touching the database"""
+    response = client.post("/api/research/1/ratings", json={"rating_value": 0})
 
+    assert response.status_code == 400
+    mock_db.execute.assert_not_called()
@@ -0,0 +1,81 @@
+# coding: utf-8
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import Response
+from sqlalchemy.exc import OperationalError
+
+from app.db import replica
+from app.db.replica import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, ReplicaLagMonitor, mark_write, use_replica
+
+
+def _request(headers=None, cookies=None):
+    request = MagicMock()
+    request.headers = headers or {}
+    request.cookies = cookies or {}
+    return request
+
+
+def _monitor(*lags):
+    """A monitor whose successive lag checks return the given values (or raise them)"""
+    session = AsyncMock()
+    session.scalar = AsyncMock(side_effect=lags)
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return ReplicaLagMonitor(factory), session
+
+
+def test_caught_up_replica_is_used():
+    monitor, _ = _monitor(0.2)
+    with patch.object(replica, "replica_monitor", monitor):
+        assert asyncio.run(use_replica(_request())) is True
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary():
+    with patch("app.db.replica.settings.REPLICA_MAX_LAG_SECONDS", 5), \
+         patch("app.db.replica.settings.REPLICA_LAG_CHECK_INTERVAL", 0):
+        monitor, _ = _monitor(30.0, None, OperationalError("SELECT", {}, Exception("down")), 1.0)
+        with patch.object(replica, "replica_monitor", monitor):
+            results = [asyncio.run(use_replica(_request())) for _ in range(4)]
+
+    assert results == [False, False, False, True]
+
+
+def test_lag_is_checked_once_per_interval():
+    monitor, session = _monitor(0.0, 0.0)
+    with patch("app.db.replica.settings.REPLICA_LAG_CHECK_INTERVAL", 60), \
+         patch.object(replica, "replica_monitor", monitor):
+        for _ in range(5):
+            asyncio.run(use_replica(_request()))
+
+    session.scalar.assert_called_once()
+
+
+def test_recent_writes_read_from_primary():
+    """Clients echoing a recent write time, by header or cookie, skip the replica"""
+    monitor, session = _monitor(0.0)
+    recent = str(time.time() - 1)
+    stale = str(time.time() - 3600)
+
+    with patch.object(replica, "replica_monitor", monitor):
+        assert asyncio.run(use_replica(_request(headers={LAST_WRITE_HEADER: recent}))) is False
+        assert asyncio.run(use_replica(_request(cookies={LAST_WRITE_COOKIE: recent}))) is False
+        assert asyncio.run(use_replica(_request(headers={LAST_WRITE_HEADER: "garbage"}))) is True
+        assert asyncio.run(use_replica(_request(headers={LAST_WRITE_HEADER: stale}))) is True
+
+
+def test_no_replica_configured():
+    with patch.object(replica, "replica_monitor", None):
+        assert asyncio.run(use_replica(_request())) is False
+
+
+def test_mark_write_sets_header_and_cookie():
+    response = Response()
+    mark_write(response)
+
+    written_at = float(response.headers[LAST_WRITE_HEADER])
+    assert abs(written_at - time.time()) < 5
+    assert f"{LAST_WRITE_COOKIE}=" in response.headers["set-cookie"]
@@ -0,0 +1,48 @@
+# coding: utf-8
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.tasks import research_processing
+
+
+def _get_db_sync(session):
+    @contextmanager
+    def get_db_sync():
+        yield session
+    return get_db_sync
+
+
+def test_rebuild_fans_out_in_batches():
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = list(range(1, 251))
+
+    with patch.object(research_processing, "get_db_sync", _get_db_sync(session)), \
+         patch.object(research_processing.settings, "RELATED_RESEARCH_BATCH_SIZE", 100), \
+         patch.object(research_processing, "group") as group, \
+         patch.object(research_processing, "compute_neighbor_lists") as compute_neighbor_lists:
+        result = research_processing.rebuild_related_research()
+
+    assert (result["research_queued"], result["batches"]) == (250, 3)
+    batches = [call[0][0] for call in compute_neighbor_lists.s.call_args_list]
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    group.return_value.apply_async.assert_called_once()
+
+
+def test_neighbor_lists_are_computed_in_one_query():
+    session = MagicMock()
+    session.execute.return_value.all.return_value = [(1, 2, 0.1), (1, 3, 0.2), (4, 1, 0.3)]
+
+    with patch.object(research_processing, "get_db_sync", _get_db_sync(session)):
+        result = research_processing.compute_neighbor_lists([1, 4])
+
+    assert result["neighbors"] == 3
+    select_sql, delete_sql, insert_sql = (
+        str(call[0][0].compile(dialect=postgresql.dialect())) for call in session.execute.call_args_list
+    )
+    assert "JOIN LATERAL" in select_sql
+    assert delete_sql.startswith("DELETE FROM research_neighbors")
+    assert insert_sql.startswith("INSERT INTO research_neighbors")
+    session.commit.assert_called_once()
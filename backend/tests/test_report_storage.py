@@ -0,0 +1,73 @@
+# coding: utf-8
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import inspect
+
+from app.models import DeepResearch as DeepResearchModel
+from app.services.report_storage import (
+    DiskContentStore,
+    compress,
+    hydrate_bodies,
+    store_bodies,
+)
+
+LARGE_REPORT = "Findings. " * 5000
+
+
+@pytest.fixture
+def disk_storage(tmp_path):
+    with patch("app.services.report_storage.settings") as settings:
+        settings.REPORT_STORAGE_MODE = "disk"
+        settings.REPORT_STORAGE_PATH = str(tmp_path)
+        settings.REPORT_STORAGE_THRESHOLD = 1024
+        settings.REPORT_COMPRESSION_LEVEL = 3
+        yield settings
+
+
+def test_store_bodies_moves_large_bodies_out_of_row(disk_storage):
+    """Large bodies are compressed into the store and the inline columns emptied"""
+    db = AsyncMock()
+    research = DeepResearchModel(id=7, title="Report")
+
+    asyncio.run(store_bodies(db, research, {"prompt_text": "Prompt", "final_report": LARGE_REPORT}))
+
+    db.flush.assert_called_once()
+    assert research.body_storage == "disk"
+    # The flush writes '' to the row; the object then gets the real text back unmodified
+    assert research.final_report == LARGE_REPORT
+    assert inspect(research).attrs.final_report.history.added == ()
+    blobs = DiskContentStore(disk_storage.REPORT_STORAGE_PATH).get_many(None, [7])
+    assert len(blobs[(7, "final_report")]) < len(LARGE_REPORT) // 10
+
+
+def test_store_bodies_keeps_small_bodies_inline(disk_storage):
+    """Bodies under the threshold stay in the row"""
+    db = AsyncMock()
+    research = DeepResearchModel(id=8, title="Report")
+
+    asyncio.run(store_bodies(db, research, {"prompt_text": "Prompt", "final_report": "Short report"}))
+
+    assert research.body_storage is None
+    assert research.final_report == "Short report"
+
+
+def test_hydrate_bodies_from_database_store():
+    """Out-of-row bodies of a page are fetched in one query and set as committed values"""
+    db = AsyncMock()
+    result = MagicMock()
+    result.__iter__.return_value = iter([
+        MagicMock(deep_research_id=1, field="prompt_text", data=compress("Prompt")),
+        MagicMock(deep_research_id=1, field="final_report", data=compress(LARGE_REPORT)),
+    ])
+    db.execute = AsyncMock(return_value=result)
+    stored = DeepResearchModel(id=1, prompt_text="", final_report="", body_storage="database")
+    inline = DeepResearchModel(id=2, prompt_text="Inline", final_report="Inline report")
+
+    asyncio.run(hydrate_bodies(db, [stored, inline]))
+
+    db.execute.assert_called_once()
+    assert stored.final_report == LARGE_REPORT
+    assert stored.prompt_text == "Prompt"
+    assert inline.final_report == "Inline report"
@@ -0,0 +1,145 @@
+# coding: utf-8
+
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.models import DeepResearch as DeepResearchModel
+from app.services import research_cache
+from app.services.research_cache import CachedResponse, get_or_load, invalidate_research
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.research_cache.settings.RESEARCH_CACHE_TTL", 300), \
+         patch("app.services.research_cache.get_redis", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def research():
+    now = datetime.now(timezone.utc)
+    return DeepResearchModel(
+        id=1,
+        user_id=1,
+        owner_user_id=1,
+        owner_org_id=None,
+        visibility="private",
+        title="Cached Research",
+        prompt_text="Prompt",
+        final_report="Report",
+        model_name="gpt-4",
+        model_params={},
+        source_count=0,
+        content_version=0,
+        created_at=now,
+        updated_at=now
+    )
+
+
+def _entry(content=b"{}"):
+    acl = research_cache.acl_of(MagicMock(visibility="public", user_id=1, owner_org_id=None))
+    return CachedResponse(content, '"etag"', acl)
+
+
+def test_item_served_from_cache(client, mock_db, mock_user, research, fake_redis):
+    """A cached item is access-checked and returned without any database query"""
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = research
+    mock_db.execute = AsyncMock(return_value=result)
+
+    first = client.get("/api/deep-research/1")
+    assert first.status_code == 200
+    assert mock_db.execute.call_count == 1
+
+    mock_db.execute.reset_mock()
+    second = client.get("/api/deep-research/1")
+    assert second.status_code == 200
+    assert second.json()["title"] == "Cached Research"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    mock_db.execute.assert_not_called()
+
+    response = client.get("/api/deep-research/1", headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    mock_db.execute.assert_not_called()
+
+
+def test_cached_item_checks_access(client, mock_db, mock_user, research, fake_redis):
+    """A private item cached for its owner is not served to other users"""
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = research
+    mock_db.execute = AsyncMock(return_value=result)
+    assert client.get("/api/deep-research/1").status_code == 200
+
+    mock_user.id = 2
+    mock_db.execute.reset_mock()
+    response = client.get("/api/deep-research/1")
+
+    assert response.status_code == 403
+    mock_db.execute.assert_not_called()
+
+
+def test_writes_invalidate_cached_item(client, mock_db, mock_user, research, fake_redis):
+    """Invalidation bumps the item's cache generation so the next read reloads it"""
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = research
+    mock_db.execute = AsyncMock(return_value=result)
+    client.get("/api/deep-research/1")
+
+    asyncio.run(invalidate_research(1))
+    research.title = "Renamed"
+    mock_db.execute.reset_mock()
+    response = client.get("/api/deep-research/1")
+
+    assert response.json()["title"] == "Renamed"
+    mock_db.execute.assert_called_once()
+
+
+def test_concurrent_misses_load_once(fake_redis):
+    """Only one of many concurrent requests for a missing entry runs the loader"""
+    loader = AsyncMock()
+
+    async def slow_load():
+        await loader()
+        await asyncio.sleep(0.1)
+        return _entry(b'{"id": 1}')
+
+    async def run():
+        return await asyncio.gather(*[get_or_load(1, "item", slow_load) for _ in range(5)])
+
+    entries = asyncio.run(run())
+
+    loader.assert_called_once()
+    assert all(entry.content == b'{"id": 1}' for entry in entries)
+
+
+def test_early_refresh_near_expiry(fake_redis):
+    """Entries close to expiry are recomputed by one request while others keep the old one"""
+    asyncio.run(get_or_load(1, "item", AsyncMock(return_value=_entry(b"old"))))
+    loader = AsyncMock(return_value=_entry(b"new"))
+
+    with patch("app.services.research_cache.time.time", return_value=10 ** 12):
+        # Another worker is already refreshing
+        fake_redis.locks.add("research-cache:1:item:0:lock")
+        assert asyncio.run(get_or_load(1, "item", loader)).content == b"old"
+        loader.assert_not_called()
+
+        fake_redis.locks.clear()
+        assert asyncio.run(get_or_load(1, "item", loader)).content == b"new"
+        loader.assert_called_once()
+
+
+def test_redis_errors_fall_back_to_loader():
+    """An unreachable Redis never fails the request"""
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=RedisConnectionError("down"))
+    loader = AsyncMock(return_value=_entry())
+
+    with patch("app.services.research_cache.settings.RESEARCH_CACHE_TTL", 300), \
+         patch("app.services.research_cache.get_redis", return_value=redis):
+        assert asyncio.run(get_or_load(1, "item", loader)) == loader.return_value
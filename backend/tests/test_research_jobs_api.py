@@ -174,3 +174,57 @@ def test_research_jobs_job_id_get_pending(client, mock_db, mock_user, mock_pendi
             assert response_json["service"] == "open-dr"
             assert response_json["model_name"] == "gpt-4o-mini"
 
+
+def test_research_jobs_list_cursor(client, mock_db, mock_user):
+    """Test that listing jobs pages by keyset cursor instead of offset"""
+    now = datetime.now(timezone.utc)
+    jobs = [
+        ResearchJobModel(id=i, job_id=f"job-{i}", user_id=1, status="completed", service="open-dr", prompt="Prompt",
+                         model_name="gpt-4o-mini", visibility="private", created_at=now, updated_at=now)
+        for i in (3, 2)
+    ]
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = jobs
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    
+    response = client.get("/api/research-jobs?limit=1")
+    
+    assert response.status_code == 200
+    assert [job["id"] for job in response.json()] == [3]
+    cursor = response.headers["X-Next-Cursor"]
+    
+    mock_result.scalars.return_value.all.return_value = jobs[1:]
+    response = client.get(f"/api/research-jobs?limit=1&cursor={cursor}")
+    
+    assert response.status_code == 200
+    assert [job["id"] for job in response.json()] == [2]
+    assert "X-Next-Cursor" not in response.headers
+    sql = str(mock_db.execute.call_args[0][0])
+    assert "(research_jobs.created_at, research_jobs.id) <" in sql
+    assert "OFFSET" not in sql
+
+
+def test_research_jobs_list_pages_are_full(client, mock_db, mock_user):
+    """Access is checked in SQL, so the rows the database returns fill the page"""
+    now = datetime.now(timezone.utc)
+    # Other users' jobs; nothing may be dropped after the LIMIT
+    jobs = [
+        ResearchJobModel(id=i, job_id=f"job-{i}", user_id=2, status="running", service="open-dr", prompt="Prompt",
+                         model_name="gpt-4o-mini", visibility="public", created_at=now, updated_at=now)
+        for i in range(21, 0, -1)
+    ]
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = jobs
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    
+    response = client.get("/api/research-jobs?limit=20&service=Open-DR&status=running")
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+    assert "X-Next-Cursor" in response.headers
+    query = mock_db.execute.call_args[0][0]
+    sql = str(query)
+    assert "JOIN" not in sql
+    assert "research_jobs.user_id = :user_id_1 OR research_jobs.visibility = :visibility_1" in sql
+    assert "research_jobs.service = :service_1" in sql
+    assert query.compile().params["service_1"] == "open-dr"
@@ -0,0 +1,105 @@
+# coding: utf-8
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import AiModel, ResearchService as ResearchServiceDB, ResearchServiceModel
+from app.services import service_catalog as catalog_module
+from app.services.research import ResearchService
+from app.services.service_catalog import CATALOG_CHANNEL, CATALOG_KEY, ServiceCatalog, load_catalog
+from tests.fake_redis import FakeRedis
+
+
+def _db_service():
+    model = AiModel(id=3, model_key="o3-mini", default_params={"temperature": 0.3}, max_tokens=200000, is_active=True)
+    db_service = ResearchServiceDB(id=1, service_key="open-dr", name="Open Deep Research", url="{{OPENDR_URL}}",
+                                   default_model_id=3, default_model=model, models=[model])
+    db_service.service_models = [ResearchServiceModel(id=1, service_id=1, model_id=3, is_default=True, model=model)]
+    return db_service
+
+
+def _catalog_db():
+    result = MagicMock()
+    result.scalars.return_value.unique.return_value = [_db_service()]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    db = _catalog_db()
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock(return_value=db)
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch("app.services.service_catalog.get_redis", return_value=redis), \
+         patch.object(catalog_module, "AsyncSessionLocal", session_factory):
+        redis.db = db
+        yield redis
+
+
+def test_catalog_is_loaded_once_and_shared(fake_redis):
+    catalog = ServiceCatalog()
+
+    async def run():
+        first = await catalog.config("open-dr")
+        await catalog.service("open-dr")
+        assert await catalog.config("missing") is None
+        # Another process reads the Redis snapshot instead of the tables
+        other = await ServiceCatalog().service("open-dr")
+        return first, other
+
+    with patch("app.services.service_catalog.settings.OPENDR_URL", "http://opendr.test"):
+        config, other = asyncio.run(run())
+
+    assert fake_redis.db.execute.await_count == 1
+    assert config["url"] == "http://opendr.test"
+    assert (config["default_model"], config["max_tokens"]) == ("o3-mini", 200000)
+    assert other["service_models"][0]["model"]["model_key"] == "o3-mini"
+    assert json.loads(fake_redis.data[CATALOG_KEY])["open-dr"]["config"]["url"] == "{{OPENDR_URL}}"
+
+
+def test_change_notification_reloads_catalog(fake_redis):
+    catalog = ServiceCatalog()
+
+    async def run():
+        await catalog.catalog()
+        with patch.object(catalog_module, "service_catalog", catalog):
+            await catalog_module.publish_catalog_change()
+        await catalog.catalog()
+
+    asyncio.run(run())
+
+    assert fake_redis.published == [(CATALOG_CHANNEL, "changed")]
+    assert fake_redis.db.execute.await_count == 2
+
+
+def test_load_catalog_serializes_services():
+    catalog = asyncio.run(load_catalog(_catalog_db()))
+
+    entry = catalog["open-dr"]
+    assert entry["service"]["name"] == "Open Deep Research"
+    assert entry["config"]["models"] == {"o3-mini": {"default_params": {"temperature": 0.3}, "max_tokens": 200000}}
+    json.dumps(catalog)
+
+
+def test_service_lookups_do_not_query_the_database():
+    db = AsyncMock()
+    catalog = MagicMock()
+    catalog.service = AsyncMock(side_effect=lambda key: {"service_key": key} if key == "open-dr" else None)
+    service = ResearchService()
+
+    async def run():
+        await service._validate_service(db, "open-dr")
+        with pytest.raises(HTTPException):
+            await service._validate_service(db, "unknown")
+
+    with patch("app.services.research.service_catalog", catalog):
+        asyncio.run(run())
+
+    db.execute.assert_not_called()
@@ -0,0 +1,74 @@
+# coding: utf-8
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from app.models import ResearchJob
+from app.services.research import ResearchService
+from app.services.service_clients import HttpClientConfig, ServiceClientPool, load_client_configs
+
+
+def test_service_configs_are_loaded_from_research_services_json():
+    configs = load_client_configs()
+
+    assert configs["open-dr"].timeout_for("status").read == 10
+    assert configs["open-dr"].timeout_for("answer").read == 30
+    assert configs["open-dr"].timeout_for().connect == 5
+
+
+def test_clients_are_shared_until_closed():
+    pool = ServiceClientPool({"open-dr": HttpClientConfig(max_connections=7)})
+
+    async def run():
+        first = pool.get("open-dr")
+        assert pool.get("open-dr") is first
+        await pool.close()
+        assert first.is_closed
+        return pool.get("open-dr") is not first
+
+    assert asyncio.run(run())
+
+
+def test_http2_falls_back_without_h2():
+    pool = ServiceClientPool({"open-dr": HttpClientConfig(http2=True)})
+
+    with patch("app.services.service_clients._http2_available", return_value=False), \
+         patch("app.services.service_clients.httpx.AsyncClient") as client_class:
+        pool.get("open-dr")
+
+    assert client_class.call_args.kwargs["http2"] is False
+
+
+def test_service_calls_reuse_the_pooled_client():
+    """Calls go through the service's shared client with the per-operation timeout"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"status": "running"})
+
+    pool = ServiceClientPool({"open-dr": HttpClientConfig(timeouts={"answer": 12})})
+    job = ResearchJob(id=1, job_id="job-1", user_id=1, service="open-dr", status="pending_answers")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    service = ResearchService()
+
+    async def run():
+        pool._clients["open-dr"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("app.services.research.service_clients", pool), \
+             patch.object(ResearchService, "_validate_service", AsyncMock()), \
+             patch.object(ResearchService, "_get_service_config", AsyncMock(return_value={"url": "http://opendr.test"})), \
+             patch("app.services.research.ResearchJobSchema.model_validate", side_effect=lambda job: MagicMock()), \
+             patch("app.services.research.publish_job_event", AsyncMock()):
+            for _ in range(2):
+                await service.answer_questions(db, "open-dr", 1, "job-1", ["yes"])
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert len(requests) == 2
+    assert requests[0].extensions["timeout"]["read"] == 12
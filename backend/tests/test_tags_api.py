@@ -1,7 +1,11 @@
 # coding: utf-8
 
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.models import DeepResearch as DeepResearchModel, Tag as TagModel
+from app.services.report_storage import compress
 
 from pydantic import StrictInt  # noqa: F401
 from typing import Any, List  # noqa: F401
@@ -108,6 +112,31 @@ def test_tags_id_research_get(client: TestClient):
     #assert response.status_code == 200
 
 
+def test_tags_id_research_get_hydrates_out_of_row_bodies(client: TestClient, mock_db):
+    """Items whose bodies are kept out of row are returned with their full text"""
+    now = datetime.now(timezone.utc)
+    tag_result = MagicMock()
+    tag_result.scalars.return_value.first.return_value = TagModel(id=56, name="ai", is_global=True)
+    stored = DeepResearchModel(id=3, user_id=1, visibility="public", title="Stored Research",
+                               prompt_text="", final_report="", body_storage="database",
+                               created_at=now, updated_at=now)
+    research_result = MagicMock()
+    research_result.scalars.return_value.all.return_value = [stored]
+    contents_result = MagicMock()
+    contents_result.__iter__.return_value = iter([
+        MagicMock(deep_research_id=3, field="prompt_text", data=compress("Stored prompt")),
+        MagicMock(deep_research_id=3, field="final_report", data=compress("Stored report")),
+    ])
+    mock_db.execute = AsyncMock(side_effect=[tag_result, research_result, contents_result])
+
+    with patch("app.services.report_storage.settings.REPORT_STORAGE_MODE", "database"):
+        response = client.get("/api/tags/56/research")
+
+    assert response.status_code == 200
+    assert response.json()[0]["prompt_text"] == "Stored prompt"
+    assert response.json()[0]["final_report"] == "Stored report"
+
+
 def test_tags_post(client: TestClient):
     """Test case for tags_post
 
@@ -0,0 +1,60 @@
+# coding: utf-8
+
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import DeepResearch
+from app.tasks.research_processing import provisional_title
+from app.tasks import research_processing
+
+
+def test_provisional_title_is_truncated_prompt():
+    assert provisional_title("short prompt") == "short prompt"
+    assert len(provisional_title("x" * 400)) == 255
+
+
+def _sessions(research, rowcount=1):
+    session = MagicMock()
+    session.query.return_value.options.return_value.filter.return_value.one.return_value = research
+    session.execute.return_value.rowcount = rowcount
+
+    @contextmanager
+    def get_db_sync():
+        yield session
+
+    return session, get_db_sync
+
+
+def test_generated_title_replaces_provisional_one():
+    research = DeepResearch(id=7, title="What is the best way to", prompt_text="What is the best way to")
+    session, get_db_sync = _sessions(research)
+
+    with patch.object(research_processing, "get_db_sync", get_db_sync), \
+         patch.object(research_processing, "hydrate_bodies_sync"), \
+         patch.object(research_processing, "create_title", return_value="Best Ways") as create_title, \
+         patch.object(research_processing, "invalidate_research_sync") as invalidate:
+        result = research_processing.generate_title(7)
+
+    assert result["status"] == "success"
+    create_title.assert_called_once_with("What is the best way to")
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    # Only if nobody renamed the item while the title was being generated
+    assert "deep_research.title = %(title_1)s" in sql
+    invalidate.assert_called_once_with(research_processing.redis_client, 7)
+
+
+def test_failed_generation_keeps_provisional_title():
+    research = DeepResearch(id=7, title="prompt", prompt_text="prompt")
+    session, get_db_sync = _sessions(research)
+
+    with patch.object(research_processing, "get_db_sync", get_db_sync), \
+         patch.object(research_processing, "hydrate_bodies_sync"), \
+         patch.object(research_processing, "create_title", return_value=None), \
+         patch.object(research_processing, "invalidate_research_sync") as invalidate:
+        result = research_processing.generate_title(7)
+
+    assert result["status"] == "skipped"
+    session.execute.assert_not_called()
+    invalidate.assert_not_called()
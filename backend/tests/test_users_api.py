@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 from typing import List
 
 from pydantic import StrictInt  # noqa: F401
@@ -239,3 +240,41 @@ def test_users_me_create(mock_create_user, mock_verify, client, mock_db, mock_us
     # Verify token verification was called
     mock_verify.assert_called_once()
 
+
+def _users_result(users):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = users
+    return result
+
+def test_users_search_uses_escaped_substring_match(client: TestClient, mock_db, mock_user, mock_users_list):
+    """Search is a single query; LIKE wildcards in the term match literally"""
+    mock_db.execute = AsyncMock(return_value=_users_result(mock_users_list[:1]))
+    mock_db.scalar = AsyncMock()
+
+    response = client.get("/api/users", params={"search": "100%_off"})
+
+    assert response.status_code == 200
+    mock_db.execute.assert_called_once()
+    mock_db.scalar.assert_not_called()
+    compiled = mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+    assert "ILIKE" in str(compiled)
+    assert set(value for key, value in compiled.params.items() if key.startswith("username")) == {"%100\\%\\_off%"}
+
+def test_users_search_ranked_by_relevance(client: TestClient, mock_db, mock_user, mock_users_list):
+    """order_by=relevance puts the closest matches first"""
+    mock_db.execute = AsyncMock(return_value=_users_result(mock_users_list))
+
+    response = client.get("/api/users?search=jordan&order_by=relevance&limit=2")
+
+    assert response.status_code == 200
+    assert [user["username"] for user in response.json()] == ["Jordan Sims", "Alice Johnson"]
+    assert "X-Next-Cursor" not in response.headers
+    sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "ORDER BY greatest(similarity(users.username" in sql
+
+@pytest.mark.parametrize("query", ["order_by=relevance", "search=jordan&order_by=email", "search=jordan&order_by=relevance&cursor=abc"])
+def test_users_search_rejects_bad_ordering(client: TestClient, mock_db, mock_user, query):
+    response = client.get(f"/api/users?{query}")
+
+    assert response.status_code == 400
+    mock_db.execute.assert_not_called()
@@ -0,0 +1,130 @@
+# coding: utf-8
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.models import ResearchJob
+from app.routers import research_services as research_services_router
+from app.services.research import ResearchService
+from app.services.service_clients import HttpClientConfig, ServiceClientPool
+from app.services.webhooks import sign
+from tests.fake_redis import FakeRedis
+
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def webhook_secret():
+    with patch("app.services.webhooks.settings.RESEARCH_WEBHOOK_SECRET", SECRET):
+        yield
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch("app.services.webhooks.get_redis", return_value=redis):
+        yield redis
+
+
+def _deliver(client, payload, delivery="d-1", timestamp=None, signature=None):
+    body = json.dumps(payload).encode()
+    timestamp = timestamp or str(int(time.time()))
+    return client.post(
+        "/api/research-services/open-dr/webhook",
+        content=body,
+        headers={
+            "X-DRKR-Timestamp": timestamp,
+            "X-DRKR-Signature": signature or sign(body, timestamp),
+            "X-DRKR-Delivery": delivery,
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def test_signed_delivery_is_processed_once(client, webhook_secret, fake_redis):
+    payload = {"job_id": "job-1", "status": "running"}
+    with patch.object(research_services_router.research_service, "apply_webhook",
+                      AsyncMock(return_value=MagicMock())) as apply_webhook:
+        assert _deliver(client, payload).status_code == 204
+        # Retried delivery
+        assert _deliver(client, payload).status_code == 204
+
+    apply_webhook.assert_awaited_once()
+    assert apply_webhook.call_args[0][1:] == ("open-dr", payload)
+
+
+def test_bad_signatures_are_rejected(client, webhook_secret, fake_redis):
+    payload = {"job_id": "job-1", "status": "running"}
+    stale = str(int(time.time()) - 3600)
+    with patch.object(research_services_router.research_service, "apply_webhook", AsyncMock()) as apply_webhook:
+        assert _deliver(client, payload, signature="sha256=00").status_code == 401
+        assert _deliver(client, payload, timestamp=stale).status_code == 401
+        with patch("app.services.webhooks.settings.RESEARCH_WEBHOOK_SECRET", None):
+            assert _deliver(client, payload, signature="sha256=00").status_code == 401
+
+    apply_webhook.assert_not_called()
+
+
+def test_unknown_job_can_be_retried(client, webhook_secret, fake_redis):
+    payload = {"job_id": "job-1", "status": "running"}
+    with patch.object(research_services_router.research_service, "apply_webhook",
+                      AsyncMock(side_effect=[None, MagicMock()])) as apply_webhook:
+        assert _deliver(client, payload).status_code == 404
+        assert _deliver(client, payload).status_code == 204
+
+    assert apply_webhook.await_count == 2
+
+
+def test_completion_without_results_fetches_them():
+    job = ResearchJob(id=1, job_id="job-1", user_id=1, service="open-dr", status="running")
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = job
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    service = ResearchService()
+    full = {"status": "complete", "results": {"report": "..."}}
+
+    with patch.object(ResearchService, "_validate_service", AsyncMock()), \
+         patch.object(ResearchService, "_get_service_config", AsyncMock(return_value={"url": "http://opendr.test"})), \
+         patch.object(ResearchService, "_request_status", AsyncMock(return_value=full)), \
+         patch.object(ResearchService, "apply_status", AsyncMock()) as apply_status, \
+         patch("app.services.research.record_job_status", AsyncMock()):
+        asyncio.run(service.apply_webhook(db, "open-dr", {"job_id": "job-1", "status": "complete"}))
+
+    apply_status.assert_awaited_once_with(db, job, full)
+
+
+def test_start_job_registers_callback_url(webhook_secret):
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"job_id": "job-1", "status": "pending_answers", "questions": []})
+
+    pool = ServiceClientPool({"open-dr": HttpClientConfig(webhooks=True)})
+    config = {"url": "http://opendr.test", "default_model": "o3-mini", "models": {
+        "o3-mini": {"default_params": {}, "max_tokens": 1000}
+    }}
+    db = AsyncMock()
+    db.add = MagicMock()
+    service = ResearchService()
+
+    async def run():
+        pool._clients["open-dr"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("app.services.research.service_clients", pool), \
+             patch("app.services.webhooks.service_clients", pool), \
+             patch("app.services.webhooks.settings.RESEARCH_WEBHOOK_BASE_URL", "https://api.drkr.test"), \
+             patch.object(ResearchService, "_validate_service", AsyncMock()), \
+             patch.object(ResearchService, "_get_service_config", AsyncMock(return_value=config)), \
+             patch("app.services.research.ResearchJobSchema.model_validate", side_effect=lambda job: job):
+            await service.start_job(db, "open-dr", "1", "prompt", model="o3-mini")
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert requests[0]["callback_url"] == "https://api.drkr.test/api/research-services/open-dr/webhook"
@@ -25,12 +25,19 @@ import {
 
 import { useAuth } from './useAuth';
 
+// Time of our last write, echoed back so reads right after it skip the read replica
+const LAST_WRITE_HEADER = 'X-DRKR-Last-Write';
+let lastWrite: string | null = null;
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const CLOSING_JOB_STATUSES = ['failed', 'cancelled'];
+
 export const useApi = () => {
     const { getAccessTokenSilently } = useAuth();
 
     const api = useMemo(() => {
         const instance = axios.create({
-            baseURL: import.meta.env.VITE_API_URL || 'http://localhost:8000',
+            baseURL: API_URL,
             headers: {
                 'Content-Type': 'application/json',
             },
@@ -42,11 +49,25 @@ export const useApi = () => {
                 if (token) {
                     config.headers.Authorization = `Bearer ${token}`;
                 }
+                if (lastWrite) {
+                    config.headers[LAST_WRITE_HEADER] = lastWrite;
+                }
                 return config;
             },
             (error) => Promise.reject(error)
         );
 
+        instance.interceptors.response.use(
+            (response) => {
+                const written = response.headers[LAST_WRITE_HEADER.toLowerCase()];
+                if (written) {
+                    lastWrite = written;
+                }
+                return response;
+            },
+            (error) => Promise.reject(error)
+        );
+
         // instance.interceptors.response.use(
         //     (response) => response,
         //     async (error) => {
@@ -133,6 +154,7 @@ export const useApi = () => {
         getUsers: async (params?: { 
             org_id?: number;
             search?: string;
+            order_by?: 'username' | 'relevance';
             page?: number; 
             limit?: number;
         }) => {
@@ -179,6 +201,62 @@ export const useApi = () => {
             const response = await api.post<ResearchJob>('/api/research-jobs/answer', data);
             return response.data;
         },
+
+        // Follows a job's Server-Sent Events until it fails, is cancelled or the
+        // signal aborts, reconnecting from the last event when the server closes
+        // the stream. EventSource can't send our bearer token, hence fetch.
+        watchResearchJob: async (id: number, onJob: (job: ResearchJob) => void, signal: AbortSignal) => {
+            let lastEventId: string | null = null;
+            while (!signal.aborted) {
+                const headers: Record<string, string> = { Accept: 'text/event-stream' };
+                const token = await getAccessTokenSilently();
+                if (token) {
+                    headers.Authorization = `Bearer ${token}`;
+                }
+                if (lastEventId) {
+                    headers['Last-Event-ID'] = lastEventId;
+                }
+                const response = await fetch(`${API_URL}/api/research-jobs/${id}/events`, { headers, signal });
+                if (!response.ok || !response.body) {
+                    throw new Error(`Research job event stream failed with status ${response.status}`);
+                }
+
+                const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+                let buffer = '';
+                for (;;) {
+                    const { value, done } = await reader.read();
+                    if (done) {
+                        break;
+                    }
+                    buffer += value;
+                    let boundary = buffer.indexOf('\n\n');
+                    while (boundary !== -1) {
+                        const block = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        boundary = buffer.indexOf('\n\n');
+
+                        let event = 'message';
+                        let data = '';
+                        for (const line of block.split('\n')) {
+                            if (line.startsWith('id: ')) {
+                                lastEventId = line.slice(4);
+                            } else if (line.startsWith('event: ')) {
+                                event = line.slice(7);
+                            } else if (line.startsWith('data: ')) {
+                                data += line.slice(6);
+                            }
+                        }
+                        if (event === 'status' && data) {
+                            const job = JSON.parse(data) as ResearchJob;
+                            onJob(job);
+                            if (CLOSING_JOB_STATUSES.includes(job.status)) {
+                                return;
+                            }
+                        }
+                    }
+                }
+            }
+        },
     }
 
     const researchServicesApi = {
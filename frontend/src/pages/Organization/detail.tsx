@@ -556,7 +556,7 @@ const OrganizationDetailPage: React.FC = () => {
                                                         whiteSpace: 'nowrap'
                                                     }}
                                                 >
-                                                    {key.token}
+                                                    {key.token ?? `drkr_${key.token_prefix}_…`}
                                                 </Typography>
                                             </TableCell>
                                             <TableCell>{createdDate}</TableCell>
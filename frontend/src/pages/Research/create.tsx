@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import {
   Alert,
@@ -72,6 +72,7 @@ const CreateResearchJobPage: React.FC = () => {
   const [isAnswering, setIsAnswering] = useState<boolean>(false);
   const [isPollActive, setIsPollActive] = useState<boolean>(false);
   const [pollInterval, setPollInterval] = useState<NodeJS.Timeout | null>(null);
+  const jobEvents = useRef<AbortController | null>(null);
 
   // Keep track of which models are supported by tiktoken
   const [tiktokenSupportedModels, setTiktokenSupportedModels] = useState<Record<string, boolean>>({});
@@ -239,6 +240,11 @@ const CreateResearchJobPage: React.FC = () => {
     };
   }, [pollInterval]);
 
+  // Close the job event stream when component unmounts
+  useEffect(() => {
+    return () => jobEvents.current?.abort();
+  }, []);
+
   // Handle error snackbar close
   const handleCloseError = () => {
     setShowError(false);
@@ -288,17 +294,39 @@ const CreateResearchJobPage: React.FC = () => {
     }
   };
 
-  // Start polling for job status
+  // Follow job status over the event stream, polling if it isn't available
   const startPolling = (job: ResearchJob) => {
     // Prevent creating multiple polling intervals
     if (isPollActive && pollInterval) {
       console.log('Polling already active, stopping previous polling before starting a new one');
       stopPolling();
     }
+    jobEvents.current?.abort();
     
-    console.log('Starting polling for job status');
+    console.log('Watching job status');
     setIsPollActive(true);
     
+    const controller = new AbortController();
+    jobEvents.current = controller;
+    researchJobsApi.watchResearchJob(job.id, (updatedJob) => {
+      setCreatedJob(updatedJob);
+      if (['completed', 'failed', 'cancelled'].includes(updatedJob.status)) {
+        console.log(`Job status is ${updatedJob.status}, closing event stream`);
+        controller.abort();
+        setIsPollActive(false);
+        setLoading(false);
+      }
+    }, controller.signal).catch((error) => {
+      if (controller.signal.aborted) {
+        return;
+      }
+      console.error('Job event stream failed, polling instead:', error);
+      startIntervalPolling(job);
+    });
+  };
+
+  // Poll for job status
+  const startIntervalPolling = (job: ResearchJob) => {
     const interval = setInterval(async () => {
       try {
         console.log('Polling job status...');
@@ -333,6 +361,7 @@ const CreateResearchJobPage: React.FC = () => {
   // Stop polling for job status
   const stopPolling = () => {
     console.log('Stopping polling');
+    jobEvents.current?.abort();
     if (pollInterval) {
       clearInterval(pollInterval);
       console.log('Polling interval cleared');
@@ -354,6 +383,7 @@ const CreateResearchJobPage: React.FC = () => {
       case 'cancelled':
         return 'error';
       case 'running':
+      case 'finalizing':
         return 'primary';
       case 'pending_answers':
         return 'warning';
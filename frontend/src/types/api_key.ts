@@ -12,9 +12,13 @@ export interface ApiKey {
     name: string;
     user_id?: number;
     organization_id?: number;
-    token: string;
+    // Only third-party keys, and DRKR keys in the create response
+    token?: string;
+    token_prefix?: string;
     is_active: boolean;
     expires_at: string;
+    last_used_at?: string;
+    request_count?: number;
     api_service?: ApiService;
     created_at: string;
     updated_at: string;
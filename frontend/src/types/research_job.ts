@@ -1,4 +1,4 @@
-export type ResearchJobStatus = 'pending_answers' | 'running' | 'completed' | 'failed' | 'cancelled';
+export type ResearchJobStatus = 'pending_answers' | 'running' | 'finalizing' | 'completed' | 'failed' | 'cancelled';
 export type Visibility = 'private' | 'public' | 'org';
 
 export interface ResearchJob {